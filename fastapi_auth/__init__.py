@@ -5,7 +5,7 @@ from .dependencies import (
     role_required,
 )
 from .main import FastAPIAuth, FastAPIAuthApp
-from .models.user import User, UserDB, UserUpdate
+from .models.user import User, UserDB, UserPrincipal, UserUpdate
 
 __all__ = [
     "FastAPIAuth",
@@ -16,5 +16,6 @@ __all__ = [
     "role_required",
     "User",
     "UserDB",
+    "UserPrincipal",
     "UserUpdate",
 ]
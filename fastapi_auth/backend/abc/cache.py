@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Optional, Union
+
+
+@dataclass
+class RateLimit:
+    reached: bool
+    remaining: int
+    retry_after: int
 
 
 class AbstractCacheClient(ABC):
@@ -7,6 +15,10 @@ class AbstractCacheClient(ABC):
     async def get(self, key: str) -> Optional[str]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        raise NotImplementedError
+
     @abstractmethod
     async def delete(self, key: str) -> None:
         raise NotImplementedError
@@ -26,3 +38,29 @@ class AbstractCacheClient(ABC):
     @abstractmethod
     async def expire(self, key: str, ex: int) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    async def rate_limit(
+        self,
+        key: str,
+        timeout_key: str,
+        rate: int,
+        interval: int,
+        timeout: int,
+        sliding: bool = False,
+    ) -> RateLimit:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe(
+        self,
+        channel: str,
+        on_subscribe: Optional[Callable[[], None]] = None,
+    ) -> AsyncIterator[str]:
+        # on_subscribe is called once the server has confirmed the
+        # subscription, messages published before that are not delivered
+        raise NotImplementedError
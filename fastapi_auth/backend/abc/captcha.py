@@ -6,3 +6,9 @@ class AbstractCaptchaClient(ABC):
     @abstractmethod
     async def validate(self, captcha: Optional[str]) -> bool:
         raise NotImplementedError
+
+    async def startup(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
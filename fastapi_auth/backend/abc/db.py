@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi_auth.models.user import OAuthDB, RoleDB, UserCreate, UserDB
+from fastapi_auth.models.user import OAuthDB, RoleDB, UserCreate, UserDB, UserFilter
 
 
 class AbstractDatabaseOAuthExtension(ABC):
@@ -64,6 +65,10 @@ class AbstractDatabaseClient(ABC):
     async def get(self, id: int) -> Optional[UserDB]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_password(self, id: int) -> Optional[str]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[UserDB]:
         raise NotImplementedError
@@ -72,6 +77,29 @@ class AbstractDatabaseClient(ABC):
     async def get_by_username(self, username: str) -> Optional[UserDB]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_many(self, ids: List[int]) -> List[UserDB]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many_by_username(self, usernames: List[str]) -> List[UserDB]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many_by_email(self, emails: List[str]) -> List[UserDB]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_users(
+        self,
+        filters: UserFilter,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50,
+    ) -> List[UserDB]:
+        """Return users newest first, after (created_at, id) of the last one
+        on the previous page."""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_provider_and_sid(
         self,
@@ -80,14 +108,36 @@ class AbstractDatabaseClient(ABC):
     ) -> Optional[UserDB]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_usernames_by_prefix(self, prefix: str) -> List[str]:
+        """Return the prefix itself and the prefix followed by digits."""
+        raise NotImplementedError
+
     @abstractmethod
     async def create(self, obj: UserCreate) -> int:
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_returning(self, obj: UserCreate) -> Optional[UserDB]:
+        """Return None if the email or username is taken."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def email_and_username_exist(
+        self,
+        email: str,
+        username: str,
+    ) -> Tuple[bool, bool]:
+        raise NotImplementedError
+
     @abstractmethod
     async def update(self, id: int, obj: dict) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    async def update_last_login(self, items: List[Tuple[int, datetime]]) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def delete(self, id: int) -> bool:
         raise NotImplementedError
@@ -21,3 +21,9 @@ class AbstractEmailClient(ABC):
     @abstractmethod
     async def request_oauth_account_removal(self, email: str, token: str) -> None:
         raise NotImplementedError
+
+    async def startup(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
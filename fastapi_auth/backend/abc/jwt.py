@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, List, Tuple
 
 
 class AbstractJWTBackend(ABC):
@@ -9,3 +10,35 @@ class AbstractJWTBackend(ABC):
     @abstractmethod
     def decode_token(self, token: str) -> dict:
         raise NotImplementedError
+
+    def create_token_pair(
+        self,
+        payload: dict,
+        access_expiration: int,
+        refresh_expiration: int,
+        access_type: str = "access",
+        refresh_type: str = "refresh",
+    ) -> Tuple[str, str]:
+        return (
+            self.create_token(access_type, payload, access_expiration),
+            self.create_token(refresh_type, payload, refresh_expiration),
+        )
+
+    def create_tokens_bulk(
+        self,
+        payloads: Iterable[dict],
+        access_expiration: int,
+        refresh_expiration: int,
+        access_type: str = "access",
+        refresh_type: str = "refresh",
+    ) -> List[Tuple[str, str]]:
+        return [
+            self.create_token_pair(
+                payload,
+                access_expiration,
+                refresh_expiration,
+                access_type,
+                refresh_type,
+            )
+            for payload in payloads
+        ]
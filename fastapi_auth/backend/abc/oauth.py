@@ -17,3 +17,9 @@ class AbstractOAuthProvider(ABC):
     @abstractmethod
     def is_login_only(self) -> bool:
         raise NotImplementedError
+
+    async def startup(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
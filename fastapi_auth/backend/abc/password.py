@@ -3,9 +3,12 @@ from abc import ABC, abstractmethod
 
 class AbstractPasswordBackend(ABC):
     @abstractmethod
-    def verify(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
         raise NotImplementedError
 
     @abstractmethod
-    def hash(self, password: str) -> str:
+    async def hash(self, password: str) -> str:
         raise NotImplementedError
+
+    async def shutdown(self) -> None:
+        pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from fastapi import Request, Response
 
@@ -12,7 +13,8 @@ class AbstractTransport(ABC):
         refresh_token: str,
         access_token_expiration: int,
         refresh_token_expiration: int,
-    ) -> None:
+    ) -> Optional[dict]:
+        """Return the response body, if any."""
         raise NotImplementedError
 
     @abstractmethod
@@ -35,12 +37,12 @@ class AbstractTransport(ABC):
     def get_access_token(
         self,
         request: Request,
-    ) -> str:
+    ) -> Optional[str]:
         raise NotImplementedError
 
     @abstractmethod
     def get_refresh_token(
         self,
         request: Request,
-    ) -> str:
+    ) -> Optional[str]:
         raise NotImplementedError
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi_auth.backend.abc.cache import AbstractCacheClient
+from fastapi_auth.logging import logger
+from fastapi_auth.repo import AuthorizationState, Repo
+
+
+class AuthorizationStateCache:
+    """Worker-local cache of ban, kick and mass logout state.
+
+    Entries live for at most `ttl` seconds and are dropped as soon as
+    AdminRepo publishes a change on the authorization channel.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 30,
+        maxsize: int = 100_000,
+        channel: str = Repo.authorization_channel,
+        reconnect_interval: float = 1.0,
+    ) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._channel = channel
+        self._reconnect_interval = reconnect_interval
+
+        self._states: "OrderedDict[int, Tuple[float, AuthorizationState]]" = (
+            OrderedDict()
+        )
+        self._listener: Optional[asyncio.Task] = None
+        # bumped on every invalidation, a fetch that overlaps one is not
+        # cached because it may have read the state before the change
+        self._generation = 0
+
+    def _get(self, id: int) -> Optional[AuthorizationState]:
+        item = self._states.get(id)
+        if item is None:
+            return None
+
+        expires_at, state = item
+        if expires_at <= time.monotonic():
+            del self._states[id]
+            return None
+
+        self._states.move_to_end(id)
+        return state
+
+    def _set(self, id: int, state: AuthorizationState) -> None:
+        self._states[id] = (time.monotonic() + self._ttl, state)
+        self._states.move_to_end(id)
+        if len(self._states) > self._maxsize:
+            self._states.popitem(last=False)
+
+    async def get_state(self, repo: Repo, id: int) -> AuthorizationState:
+        self._ensure_listener(repo.cache)
+
+        state = self._get(id)
+        if state is None:
+            generation = self._generation
+            state = await repo.get_authorization_state(id)
+            if generation == self._generation:
+                self._set(id, state)
+
+        return state
+
+    def invalidate(self, message: str) -> None:
+        self._generation += 1
+        if message == "mass_logout":
+            self.clear()
+        elif message.startswith("user:"):
+            self._states.pop(int(message[5:]), None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._states.clear()
+
+    def _ensure_listener(self, cache: AbstractCacheClient) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(cache))
+
+    async def _listen(self, cache: AbstractCacheClient) -> None:
+        while True:
+            # anything published before the subscription is confirmed is
+            # lost, so whatever was cached until then is dropped on confirm
+            try:
+                async for message in cache.subscribe(
+                    self._channel, on_subscribe=self.clear
+                ):
+                    self.invalidate(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("authorization state subscription failed")
+
+            await asyncio.sleep(self._reconnect_interval)
+
+    async def shutdown(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+
+            self._listener = None
@@ -1,22 +1,32 @@
-import asyncio
+from typing import Optional
 
 from fastapi_auth.backend.abc.authorization import AbstractAuthorization
+from fastapi_auth.backend.authorization.cache import AuthorizationStateCache
 from fastapi_auth.errors import AuthorizationError, WrongTokenTypeError
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 from fastapi_auth.repo import Repo
 
 
 class DefaultAuthorization(AbstractAuthorization):
-    async def authorize(self, repo: Repo, user: User, token_type: str) -> None:
+    def __init__(
+        self,
+        state_cache: Optional[AuthorizationStateCache] = None,
+    ) -> None:
+        self._state_cache = state_cache
+
+    async def authorize(self, repo: Repo, user: UserPrincipal, token_type: str) -> None:
 
         if user.type != token_type:
             raise WrongTokenTypeError
 
-        kick, ban, mass_logout = await asyncio.gather(
-            repo.user_was_kicked(user.id, user.iat),
-            repo.user_was_recently_banned(user.id),
-            repo.user_in_mass_logout(user.iat),
-        )
+        if self._state_cache is not None:
+            state = await self._state_cache.get_state(repo, user.id)
+        else:
+            state = await repo.get_authorization_state(user.id)
 
-        if kick or ban or mass_logout:
+        if state.is_revoked(user.iat):
             raise AuthorizationError
+
+    async def shutdown(self) -> None:
+        if self._state_cache is not None:
+            await self._state_cache.shutdown()
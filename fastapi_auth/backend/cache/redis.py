@@ -1,17 +1,94 @@
-from typing import Optional, Union
+import os
+from typing import AsyncIterator, Callable, List, Optional, Union
 
 from aioredis import Redis
 
-from fastapi_auth.backend.abc.cache import AbstractCacheClient
+from fastapi_auth.backend.abc.cache import AbstractCacheClient, RateLimit
+
+# KEYS: counter, timeout; ARGV: rate, interval, timeout
+# returns {reached, remaining, retry_after}
+FIXED_WINDOW_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local timeout = tonumber(ARGV[3])
+
+local blocked = redis.call("TTL", KEYS[2])
+if blocked > 0 then
+  return {1, 0, blocked}
+end
+
+local cur = redis.call("INCR", KEYS[1])
+local ttl = redis.call("TTL", KEYS[1])
+if ttl < 0 then
+  ttl = tonumber(ARGV[2])
+  redis.call("EXPIRE", KEYS[1], ttl)
+end
+
+if cur >= rate then
+  if timeout > 0 then
+    redis.call("DEL", KEYS[1])
+    redis.call("SET", KEYS[2], 1, "EX", timeout)
+    return {1, 0, timeout}
+  end
+  return {1, 0, ttl}
+end
+
+return {0, rate - cur - 1, 0}
+"""
+
+# KEYS: log, timeout; ARGV: rate, interval, timeout, member
+# returns {reached, remaining, retry_after}
+# scores come from the server clock so skew between app servers does not
+# stretch or shrink the window
+SLIDING_WINDOW_SCRIPT = """
+if redis.replicate_commands then
+  redis.replicate_commands()
+end
+
+local rate = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2]) * 1000
+local timeout = tonumber(ARGV[3])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local blocked = redis.call("TTL", KEYS[2])
+if blocked > 0 then
+  return {1, 0, blocked}
+end
+
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - interval)
+local cur = redis.call("ZCARD", KEYS[1]) + 1
+
+if cur >= rate then
+  if timeout > 0 then
+    redis.call("DEL", KEYS[1])
+    redis.call("SET", KEYS[2], 1, "EX", timeout)
+    return {1, 0, timeout}
+  end
+  local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+  if oldest[2] == nil then
+    return {1, 0, math.ceil(interval / 1000)}
+  end
+  return {1, 0, math.ceil((tonumber(oldest[2]) + interval - now) / 1000)}
+end
+
+redis.call("ZADD", KEYS[1], now, ARGV[4])
+redis.call("PEXPIRE", KEYS[1], interval)
+return {0, rate - cur - 1, 0}
+"""
 
 
 class RedisClient(AbstractCacheClient):
     def __init__(self, conn: Redis) -> None:
         self._conn = conn
+        self._fixed_window = conn.register_script(FIXED_WINDOW_SCRIPT)
+        self._sliding_window = conn.register_script(SLIDING_WINDOW_SCRIPT)
 
     async def get(self, key: str) -> Optional[str]:
         return await self._conn.get(key)
 
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return await self._conn.mget(keys)
+
     async def delete(self, key: str) -> None:
         await self._conn.delete(key)
 
@@ -26,3 +103,54 @@ class RedisClient(AbstractCacheClient):
 
     async def expire(self, key: str, ex: int) -> None:
         await self._conn.expire(key, ex)
+
+    async def rate_limit(
+        self,
+        key: str,
+        timeout_key: str,
+        rate: int,
+        interval: int,
+        timeout: int,
+        sliding: bool = False,
+    ) -> RateLimit:
+        if sliding:
+            reached, remaining, retry_after = await self._sliding_window(
+                keys=[key, timeout_key],
+                args=[rate, interval, timeout, os.urandom(8).hex()],
+            )
+        else:
+            reached, remaining, retry_after = await self._fixed_window(
+                keys=[key, timeout_key],
+                args=[rate, interval, timeout],
+            )
+
+        return RateLimit(bool(reached), int(remaining), int(retry_after))
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._conn.publish(channel, message)
+
+    async def subscribe(
+        self,
+        channel: str,
+        on_subscribe: Optional[Callable[[], None]] = None,
+    ) -> AsyncIterator[str]:
+        pubsub = self._conn.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "subscribe":
+                    if on_subscribe is not None:
+                        on_subscribe()
+                    continue
+
+                if message.get("type") != "message":
+                    continue
+
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode()
+
+                yield data
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
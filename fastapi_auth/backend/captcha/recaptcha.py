@@ -1,22 +1,56 @@
 from typing import Optional
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits, Timeout
 
 from fastapi_auth.backend.abc.captcha import AbstractCaptchaClient
 
 
 class RecaptchaClient(AbstractCaptchaClient):
-    def __init__(self, secret: str) -> None:
+    def __init__(
+        self,
+        secret: str,
+        timeout: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        http2: bool = True,
+    ) -> None:
         self._secret = secret
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._http2 = http2
+        self._client: Optional[AsyncClient] = None
+
+    async def startup(self) -> None:
+        if self._client is None:
+            self._client = AsyncClient(
+                base_url="https://www.google.com/",
+                http2=self._http2,
+                timeout=Timeout(self._timeout),
+                limits=Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_keepalive_connections,
+                ),
+            )
+
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def validate(self, captcha: Optional[str]) -> bool:
         if captcha is None:
             return False
 
-        async with AsyncClient(base_url="https://www.google.com/") as client:
-            payload = {
-                "secret": self._secret,
-                "response": captcha,
-            }
-            response = await client.post("/recaptcha/api/siteverify", data=payload)
-            return response.json().get("success")
+        if self._client is None:
+            await self.startup()
+
+        payload = {
+            "secret": self._secret,
+            "response": captcha,
+        }
+        response = await self._client.post(  # type: ignore
+            "/recaptcha/api/siteverify",
+            data=payload,
+        )
+        return response.json().get("success")
@@ -1,5 +1,7 @@
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from asyncpg import Connection
 from sqlsl import Queries
@@ -10,16 +12,30 @@ from fastapi_auth.backend.abc.db import (
     AbstractDatabaseRolesExtension,
 )
 from fastapi_auth.errors import RoleNotFoundError
-from fastapi_auth.models.user import OAuthDB, RoleDB, UserCreate, UserDB
+from fastapi_auth.models.user import OAuthDB, RoleDB, UserCreate, UserDB, UserFilter
 
 
 class Q(Queries):
     create_user: str
+    create_user_returning: str
+    get_user_email_and_username_exist: str
     get_user_by_id: str
     get_user_by_username: str
     get_user_by_email: str
     get_user_by_provider_and_sid: str
+    get_users_by_ids: str
+    get_users_by_usernames: str
+    get_users_by_emails: str
+    get_user_by_id_roles_only: str
+    get_user_by_username_roles_only: str
+    get_user_by_email_roles_only: str
+    get_user_by_provider_and_sid_roles_only: str
+    get_usernames_by_prefix: str
+    list_users: str
+    get_user_id_by_id: str
+    get_user_password_by_id: str
     update_user_by_id: str
+    update_last_login_bulk: str
     delete_user_by_id: str
 
     create_oauth: str
@@ -51,10 +67,98 @@ class Q(Queries):
     create_role_permission_relation: str
     delete_role_permission_relation: str
 
+    create_user_role_user_id_index: str
+    create_role_permission_role_id_index: str
+    create_user_username_pattern_index: str
+    create_user_email_pattern_index: str
+    create_user_created_at_id_index: str
+    create_user_role_role_id_index: str
+
 
 path = Path(__file__).parent / "postgres_sql"
 q = Q().from_dir(path)
 
+INDEXES = (
+    q.create_user_role_user_id_index,
+    q.create_role_permission_role_id_index,
+    q.create_user_username_pattern_index,
+    q.create_user_email_pattern_index,
+    q.create_user_created_at_id_index,
+    q.create_user_role_role_id_index,
+)
+
+
+async def create_indexes(conn: Connection) -> None:
+    """Create the indexes the user queries rely on, if they are missing.
+
+    Run it once after creating the tables and again after upgrading, for
+    example from a migration or deploy script. The indexes are built
+    CONCURRENTLY, which doesn't block writes but can't run inside a
+    transaction block, so pass a connection outside of one.
+    """
+    if conn.is_in_transaction():
+        raise RuntimeError("create_indexes can't run inside a transaction")
+
+    for query in INDEXES:
+        await conn.execute(query)
+
+
+USER_UPDATE_COLUMNS = (
+    "email",
+    "username",
+    "password",
+    "active",
+    "verified",
+    "last_login",
+)
+
+
+@lru_cache(maxsize=None)
+def _update_user_query(columns: Tuple[str, ...]) -> str:
+    assignments = ", ".join(
+        f"{column} = ${i}" for i, column in enumerate(columns, start=2)
+    )
+    return q.update_user_by_id.format(assignments)
+
+
+# filter -> (condition, number of parameters), applied in this order
+USER_LIST_FILTERS = {
+    "active": ("u.active = ${0}", 1),
+    "verified": ("u.verified = ${0}", 1),
+    "role": (
+        "EXISTS (SELECT 1 FROM auth_user_role ur JOIN auth_role r"
+        " ON r.id = ur.role_id WHERE ur.user_id = u.id AND r.name = ${0})",
+        1,
+    ),
+    "provider": (
+        "EXISTS (SELECT 1 FROM auth_oauth o"
+        " WHERE o.user_id = u.id AND o.provider = ${0})",
+        1,
+    ),
+    "created_from": ("u.created_at >= ${0}", 1),
+    "created_to": ("u.created_at < ${0}", 1),
+    # range scans on the text_pattern_ops indexes, chr(1114111) is the
+    # largest code point
+    "search": (
+        "((u.username ~>=~ ${0} AND u.username ~<~ (${0} || chr(1114111)))"
+        " OR (u.email ~>=~ ${0} AND u.email ~<~ (${0} || chr(1114111))))",
+        1,
+    ),
+    "after": ("(u.created_at, u.id) < (${0}, ${1})", 2),
+}
+
+
+@lru_cache(maxsize=None)
+def _list_users_query(filters: Tuple[str, ...]) -> str:
+    conditions = []
+    i = 1
+    for name in filters:
+        condition, count = USER_LIST_FILTERS[name]
+        conditions.append(condition.format(*range(i, i + count)))
+        i += count
+
+    return q.list_users.format(" AND ".join(conditions) or "TRUE", i)
+
 
 def _oauth_or_none(row) -> Optional[OAuthDB]:
     if row is not None:
@@ -214,21 +318,43 @@ def _user_or_none(row) -> Optional[UserDB]:
     return None
 
 
+def _users(rows) -> List[UserDB]:
+    return [_user_or_none(row) for row in rows]  # type: ignore
+
+
 class PostgresClient(AbstractDatabaseClient):
-    def __init__(self, conn: Connection) -> None:
+    def __init__(self, conn: Connection, roles_only: bool = False) -> None:
         self._conn = conn
         self.oauth = PostgresOAuthExtension(conn)
         self.roles = PostgresRolesExtension(conn)
 
+        # roles_only leaves permissions empty for Repo to expand from its
+        # RoleGraphCache
+        if roles_only:
+            self._get_user_by_id = q.get_user_by_id_roles_only
+            self._get_user_by_username = q.get_user_by_username_roles_only
+            self._get_user_by_email = q.get_user_by_email_roles_only
+            self._get_user_by_provider_and_sid = (
+                q.get_user_by_provider_and_sid_roles_only
+            )
+        else:
+            self._get_user_by_id = q.get_user_by_id
+            self._get_user_by_username = q.get_user_by_username
+            self._get_user_by_email = q.get_user_by_email
+            self._get_user_by_provider_and_sid = q.get_user_by_provider_and_sid
+
     async def get(self, id: int) -> Optional[UserDB]:
-        return _user_or_none(await self._conn.fetchrow(q.get_user_by_id, id))
+        return _user_or_none(await self._conn.fetchrow(self._get_user_by_id, id))
+
+    async def get_password(self, id: int) -> Optional[str]:
+        return await self._conn.fetchval(q.get_user_password_by_id, id)
 
     async def get_by_email(self, email: str) -> Optional[UserDB]:
-        return _user_or_none(await self._conn.fetchrow(q.get_user_by_email, email))
+        return _user_or_none(await self._conn.fetchrow(self._get_user_by_email, email))
 
     async def get_by_username(self, username: str) -> Optional[UserDB]:
         return _user_or_none(
-            await self._conn.fetchrow(q.get_user_by_username, username)
+            await self._conn.fetchrow(self._get_user_by_username, username)
         )
 
     async def get_by_provider_and_sid(
@@ -237,22 +363,80 @@ class PostgresClient(AbstractDatabaseClient):
         sid: str,
     ) -> Optional[UserDB]:
         return _user_or_none(
-            await self._conn.fetchrow(q.get_user_by_provider_and_sid, provider, sid)
+            await self._conn.fetchrow(self._get_user_by_provider_and_sid, provider, sid)
         )
 
+    async def get_many(self, ids: List[int]) -> List[UserDB]:
+        return _users(await self._conn.fetch(q.get_users_by_ids, ids))
+
+    async def get_many_by_username(self, usernames: List[str]) -> List[UserDB]:
+        return _users(await self._conn.fetch(q.get_users_by_usernames, usernames))
+
+    async def get_many_by_email(self, emails: List[str]) -> List[UserDB]:
+        return _users(await self._conn.fetch(q.get_users_by_emails, emails))
+
+    async def list_users(
+        self,
+        filters: UserFilter,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50,
+    ) -> List[UserDB]:
+        values = filters.dict(exclude_none=True)
+        if not values.get("search"):
+            values.pop("search", None)
+
+        names = tuple(name for name in USER_LIST_FILTERS if name in values)
+        args = [values[name] for name in names]
+        if after is not None:
+            names += ("after",)
+            args.extend(after)
+
+        query = _list_users_query(names)
+        return _users(await self._conn.fetch(query, *args, limit))
+
+    async def get_usernames_by_prefix(self, prefix: str) -> List[str]:
+        rows = await self._conn.fetch(q.get_usernames_by_prefix, prefix)
+        return [row["username"] for row in rows]
+
     async def create(self, obj: UserCreate) -> int:
         return await self._conn.fetchval(q.create_user, *obj.dict().values())  # type: ignore
 
+    async def create_returning(self, obj: UserCreate) -> Optional[UserDB]:
+        return _user_or_none(
+            await self._conn.fetchrow(q.create_user_returning, *obj.dict().values())
+        )
+
+    async def email_and_username_exist(
+        self,
+        email: str,
+        username: str,
+    ) -> Tuple[bool, bool]:
+        row = await self._conn.fetchrow(
+            q.get_user_email_and_username_exist,
+            email,
+            username,
+        )
+        return row["email_exists"], row["username_exists"]  # type: ignore
+
     async def update(self, id: int, obj: dict) -> bool:
-        if await self._conn.fetchrow(q.get_user_by_id, id) is None:
-            return False
+        if not obj:
+            return await self._conn.fetchval(q.get_user_id_by_id, id) is not None
 
-        async with self._conn.transaction():
-            for key, value in obj.items():
-                query = q.update_user_by_id.format(key)
-                await self._conn.execute(query, id, value)
+        columns = tuple(column for column in USER_UPDATE_COLUMNS if column in obj)
+        if len(columns) != len(obj):
+            unknown = ", ".join(key for key in obj if key not in columns)
+            raise ValueError(f"Can't update user columns: {unknown}")
 
-        return True
+        query = _update_user_query(columns)
+        values = [obj[column] for column in columns]
+        return await self._conn.fetchval(query, id, *values) is not None
+
+    async def update_last_login(self, items: List[Tuple[int, datetime]]) -> None:
+        if not items:
+            return
+
+        ids, last_logins = zip(*items)
+        await self._conn.execute(q.update_last_login_bulk, ids, last_logins)
 
     async def delete(self, id: int) -> bool:
         if await self._conn.fetchrow(q.get_user_by_id, id) is None:
@@ -0,0 +1,220 @@
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import asyncpg
+from asyncpg import Connection, Pool, Record
+from asyncpg.prepared_stmt import PreparedStatement
+
+from fastapi_auth.backend.db.postgres import PostgresClient, q
+
+HOT_QUERIES = (
+    q.get_user_by_id,
+    q.get_user_by_username,
+    q.get_user_by_email,
+    q.get_user_by_provider_and_sid,
+    q.get_user_by_id_roles_only,
+    q.get_user_by_username_roles_only,
+    q.get_user_by_email_roles_only,
+    q.get_user_by_provider_and_sid_roles_only,
+    q.get_user_id_by_id,
+    q.get_user_password_by_id,
+    q.get_user_email_and_username_exist,
+    q.get_usernames_by_prefix,
+    q.create_user_returning,
+    q.get_all_roles_and_permissions,
+)
+
+
+class PreparedConnection(Connection):
+    """Connection that keeps statements prepared with `prepare_cached`.
+
+    fetch(), fetchrow() and fetchval() run those queries through their
+    statement. The statements belong to the connection and survive
+    releases to the pool.
+    """
+
+    __slots__ = ("_statements",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._statements: Dict[str, PreparedStatement] = {}
+
+    async def prepare_cached(self, queries: Iterable[str]) -> None:
+        for query in queries:
+            self._statements[query] = await self.prepare(query)
+
+    async def fetch(self, query: str, *args: Any, **kwargs: Any) -> List[Record]:
+        statement = self._statements.get(query)
+        if statement is None or kwargs:
+            return await super().fetch(query, *args, **kwargs)
+
+        return await statement.fetch(*args)
+
+    async def fetchrow(self, query: str, *args: Any, **kwargs: Any) -> Optional[Record]:
+        statement = self._statements.get(query)
+        if statement is None or kwargs:
+            return await super().fetchrow(query, *args, **kwargs)
+
+        return await statement.fetchrow(*args)
+
+    async def fetchval(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        statement = self._statements.get(query)
+        if statement is None or kwargs:
+            return await super().fetchval(query, *args, **kwargs)
+
+        return await statement.fetchval(*args)
+
+
+async def _prepare_hot_queries(conn: PreparedConnection) -> None:
+    await conn.prepare_cached(HOT_QUERIES)
+
+
+@dataclass
+class PoolStats:
+    size: int = 0
+    idle: int = 0
+    checkouts: int = 0
+    wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def avg_wait_time(self) -> float:
+        if self.checkouts == 0:
+            return 0.0
+
+        return self.wait_time / self.checkouts
+
+
+class PoolExecutor:
+    """Connection-like object that acquires a pool connection per call.
+
+    Inside `transaction()` every call uses the connection the
+    transaction was started on.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 10,
+        max_size: int = 10,
+        prepare: bool = True,
+        **connect_kwargs: Any,
+    ) -> None:
+        self._dsn = dsn
+        self._min_size = min_size
+        self._max_size = max_size
+        self._prepare = prepare
+        self._connect_kwargs = connect_kwargs
+
+        self._pool: Optional[Pool] = None
+        self._pinned: ContextVar[Optional[Connection]] = ContextVar(
+            "fastapi_auth_pinned_connection", default=None
+        )
+        self._stats = PoolStats()
+
+    async def startup(self) -> None:
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(
+                self._dsn,
+                min_size=self._min_size,
+                max_size=self._max_size,
+                connection_class=PreparedConnection,
+                init=_prepare_hot_queries if self._prepare else None,
+                **self._connect_kwargs,
+            )
+
+    async def shutdown(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    def stats(self) -> PoolStats:
+        if self._pool is not None:
+            self._stats.size = self._pool.get_size()
+            self._stats.idle = self._pool.get_idle_size()
+
+        return self._stats
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Connection]:
+        pinned = self._pinned.get()
+        if pinned is not None:
+            yield pinned
+            return
+
+        if self._pool is None:
+            await self.startup()
+
+        start = time.perf_counter()
+        async with self._pool.acquire() as conn:  # type: ignore
+            wait_time = time.perf_counter() - start
+            self._stats.checkouts += 1
+            self._stats.wait_time += wait_time
+            self._stats.max_wait_time = max(self._stats.max_wait_time, wait_time)
+            yield conn
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Connection]:
+        pinned = self._pinned.get()
+        if pinned is not None:
+            async with pinned.transaction():
+                yield pinned
+            return
+
+        async with self.acquire() as conn:
+            token = self._pinned.set(conn)
+            try:
+                async with conn.transaction():
+                    yield conn
+            finally:
+                self._pinned.reset(token)
+
+    async def fetch(self, query: str, *args: Any) -> List[Record]:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args: Any) -> Optional[Record]:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args)
+
+
+class PostgresPoolClient(PostgresClient):
+    """PostgresClient over a pool it owns, shareable between requests."""
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 10,
+        max_size: int = 10,
+        roles_only: bool = False,
+        prepare: bool = True,
+        **connect_kwargs: Any,
+    ) -> None:
+        self.executor = PoolExecutor(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            prepare=prepare,
+            **connect_kwargs,
+        )
+        super().__init__(self.executor, roles_only)  # type: ignore
+
+    async def startup(self) -> None:
+        await self.executor.startup()
+
+    async def shutdown(self) -> None:
+        await self.executor.shutdown()
+
+    def stats(self) -> PoolStats:
+        return self.executor.stats()
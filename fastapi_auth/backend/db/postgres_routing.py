@@ -0,0 +1,130 @@
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, FrozenSet, List, Optional, Sequence
+
+from asyncpg import Connection, Record
+
+from fastapi_auth.backend.db.postgres import PostgresClient, q
+from fastapi_auth.backend.db.postgres_pool import PoolExecutor, PostgresPoolClient
+
+READ_QUERIES = frozenset(
+    (
+        q.get_user_by_id,
+        q.get_user_by_username,
+        q.get_user_by_email,
+        q.get_user_by_provider_and_sid,
+        q.get_users_by_ids,
+        q.get_users_by_usernames,
+        q.get_users_by_emails,
+        q.get_user_by_id_roles_only,
+        q.get_user_by_username_roles_only,
+        q.get_user_by_email_roles_only,
+        q.get_user_by_provider_and_sid_roles_only,
+        q.get_user_id_by_id,
+        q.get_user_password_by_id,
+        q.get_user_email_and_username_exist,
+        q.get_usernames_by_prefix,
+        q.get_oauth_by_user_id,
+        q.get_oauth_by_provider_and_sid,
+        q.get_all_roles_and_permissions,
+        q.get_role_by_name,
+        q.get_role_and_permissions_by_name,
+    )
+)
+
+# reads that go to the primary without making it sticky. RoleGraphCache
+# and PermissionRegistry reload all roles after a version bump, a lagging
+# replica would cache the old graph under the new version
+PRIMARY_READ_QUERIES = frozenset((q.get_all_roles_and_permissions,))
+
+# lookups that fill the user record cache, a lagging replica would cache
+# the row from before an update and invalidation for the whole ttl. The
+# password hash is left out of cached records and read next to them
+CACHED_USER_QUERIES = frozenset(
+    (
+        q.get_user_by_id,
+        q.get_user_by_username,
+        q.get_user_by_email,
+        q.get_user_by_id_roles_only,
+        q.get_user_by_username_roles_only,
+        q.get_user_by_email_roles_only,
+        q.get_user_password_by_id,
+    )
+)
+
+# list_users is formatted per filter combination, every variant shares
+# the text before the WHERE clause
+LIST_USERS_PREFIX = q.list_users.partition("{}")[0]
+
+
+class RoutingExecutor:
+    """Sends known read queries to a replica and everything else to the
+    primary. After the first write or transaction all queries stick to
+    the primary, so a request reads its own writes. `primary_reads` are
+    sent to the primary without sticking."""
+
+    def __init__(
+        self,
+        primary: PoolExecutor,
+        replicas: Sequence[PoolExecutor],
+        primary_reads: FrozenSet[str] = PRIMARY_READ_QUERIES,
+    ) -> None:
+        self._primary = primary
+        self._replica = random.choice(replicas) if replicas else None
+        self._primary_reads = primary_reads
+        self.sticky = False
+
+    def _route(self, query: str) -> PoolExecutor:
+        if self._replica is None or self.sticky or query in self._primary_reads:
+            return self._primary
+
+        if query not in READ_QUERIES and not query.startswith(LIST_USERS_PREFIX):
+            self.sticky = True
+            return self._primary
+
+        return self._replica
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Connection]:
+        self.sticky = True
+        async with self._primary.transaction() as conn:
+            yield conn
+
+    async def fetch(self, query: str, *args: Any) -> List[Record]:
+        return await self._route(query).fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args: Any) -> Optional[Record]:
+        return await self._route(query).fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        return await self._route(query).fetchval(query, *args)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        return await self._route(query).execute(query, *args)
+
+
+class PostgresRoutingClient(PostgresClient):
+    """Per-request client over a primary and replica pools.
+
+    Build one for each request from long-lived PostgresPoolClients. Set
+    `user_cache` when Repo caches user records, the lookups that fill
+    the cache then read from the primary.
+    """
+
+    def __init__(
+        self,
+        primary: PostgresPoolClient,
+        replicas: Sequence[PostgresPoolClient] = (),
+        roles_only: bool = False,
+        user_cache: bool = False,
+    ) -> None:
+        self.executor = RoutingExecutor(
+            primary.executor,
+            [replica.executor for replica in replicas],
+            (
+                PRIMARY_READ_QUERIES | CACHED_USER_QUERIES
+                if user_cache
+                else PRIMARY_READ_QUERIES
+            ),
+        )
+        super().__init__(self.executor, roles_only)  # type: ignore
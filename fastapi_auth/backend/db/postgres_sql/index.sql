@@ -0,0 +1,23 @@
+-- name: create_user_role_user_id_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_role_user_id_idx
+  ON auth_user_role (user_id);
+
+-- name: create_role_permission_role_id_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_role_permission_role_id_idx
+  ON auth_role_permission (role_id);
+
+-- name: create_user_username_pattern_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_username_pattern_idx
+  ON auth_user (username text_pattern_ops);
+
+-- name: create_user_email_pattern_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_email_pattern_idx
+  ON auth_user (email text_pattern_ops);
+
+-- name: create_user_created_at_id_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_created_at_id_idx
+  ON auth_user (created_at DESC, id DESC);
+
+-- name: create_user_role_role_id_index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_role_role_id_idx
+  ON auth_user_role (role_id, user_id);
@@ -2,7 +2,10 @@
 SELECT
   r.id,
   r.name,
-  COALESCE(array_agg(DISTINCT p.name), ARRAY[]::text[]) AS permissions
+  COALESCE(
+    array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+    ARRAY[]::text[]
+  ) AS permissions
 FROM
   auth_role r
 LEFT JOIN auth_role_permission rp
@@ -10,6 +10,39 @@ INSERT INTO auth_user (
 ) VALUES ($1, $2, $3, $4, $5, $6, $7)
 RETURNING id;
 
+-- name: create_user_returning
+INSERT INTO auth_user (
+  email,
+  username,
+  password,
+  active,
+  verified,
+  created_at,
+  last_login
+) VALUES ($1, $2, $3, $4, $5, $6, $7)
+ON CONFLICT DO NOTHING
+RETURNING
+  id,
+  email,
+  username,
+  password,
+  active,
+  verified,
+  created_at,
+  last_login,
+  ARRAY[]::text[] AS roles,
+  ARRAY[]::text[] AS permissions;
+
+-- name: get_user_email_and_username_exist
+SELECT
+  COALESCE(bool_or(email = $1), FALSE) AS email_exists,
+  COALESCE(bool_or(username = $2), FALSE) AS username_exists
+FROM
+  auth_user
+WHERE
+  email = $1
+  OR username = $2;
+
 -- name: get_user_by_id
 SELECT
   u.id,
@@ -22,32 +55,276 @@ SELECT
   u.last_login,
   o.provider AS oauth_provider,
   o.sid AS oauth_sid,
-  (
-    SELECT
-      COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[])
-    FROM
-      auth_role r
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
-  ) AS roles,
-  (
-    SELECT
-      COALESCE(array_agg(DISTINCT p.name), ARRAY[]::text[])
-    FROM
-      auth_permission p
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
-    JOIN auth_role_permission rp
-      ON ur.role_id = rp.role_id
-  ) AS permissions
+  agg.roles,
+  agg.permissions
 FROM
   auth_user u
 LEFT JOIN auth_oauth o
   ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
 WHERE
   u.id = $1;
 
 -- name: get_user_by_username
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM
+  auth_user u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+WHERE
+  u.username = $1;
+
+-- name: get_user_by_email
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM
+  auth_user u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+WHERE
+  u.email = $1;
+
+-- name: get_user_by_provider_and_sid
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM
+  auth_user u
+JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+WHERE
+  o.provider = $1
+  AND o.sid = $2;
+
+
+-- name: get_users_by_ids
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM
+  auth_user u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+WHERE
+  u.id = ANY($1::int[])
+ORDER BY
+  u.id;
+
+-- name: get_users_by_usernames
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM
+  auth_user u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+WHERE
+  u.username = ANY($1::text[])
+ORDER BY
+  u.id;
+
+-- name: get_users_by_emails
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM
+  auth_user u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+WHERE
+  u.email = ANY($1::text[])
+ORDER BY
+  u.id;
+
+-- name: get_user_by_id_roles_only
 SELECT
   u.id,
   u.email,
@@ -61,22 +338,45 @@ SELECT
   o.sid AS oauth_sid,
   (
     SELECT
-      COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[])
+      COALESCE(array_agg(r.name), ARRAY[]::text[])
     FROM
-      auth_role r
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
+      auth_user_role ur
+    JOIN auth_role r
+      ON r.id = ur.role_id
+    WHERE
+      ur.user_id = u.id
   ) AS roles,
+  ARRAY[]::text[] AS permissions
+FROM
+  auth_user u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+WHERE
+  u.id = $1;
+
+-- name: get_user_by_username_roles_only
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.password,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
   (
     SELECT
-      COALESCE(array_agg(DISTINCT p.name), ARRAY[]::text[])
+      COALESCE(array_agg(r.name), ARRAY[]::text[])
     FROM
-      auth_permission p
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
-    JOIN auth_role_permission rp
-      ON ur.role_id = rp.role_id
-  ) AS permissions
+      auth_user_role ur
+    JOIN auth_role r
+      ON r.id = ur.role_id
+    WHERE
+      ur.user_id = u.id
+  ) AS roles,
+  ARRAY[]::text[] AS permissions
 FROM
   auth_user u
 LEFT JOIN auth_oauth o
@@ -84,7 +384,7 @@ LEFT JOIN auth_oauth o
 WHERE
   u.username = $1;
 
--- name: get_user_by_email
+-- name: get_user_by_email_roles_only
 SELECT
   u.id,
   u.email,
@@ -98,22 +398,15 @@ SELECT
   o.sid AS oauth_sid,
   (
     SELECT
-      COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[])
+      COALESCE(array_agg(r.name), ARRAY[]::text[])
     FROM
-      auth_role r
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
+      auth_user_role ur
+    JOIN auth_role r
+      ON r.id = ur.role_id
+    WHERE
+      ur.user_id = u.id
   ) AS roles,
-  (
-    SELECT
-      COALESCE(array_agg(DISTINCT p.name), ARRAY[]::text[])
-    FROM
-      auth_permission p
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
-    JOIN auth_role_permission rp
-      ON ur.role_id = rp.role_id
-  ) AS permissions
+  ARRAY[]::text[] AS permissions
 FROM
   auth_user u
 LEFT JOIN auth_oauth o
@@ -121,7 +414,7 @@ LEFT JOIN auth_oauth o
 WHERE
   u.email = $1;
 
--- name: get_user_by_provider_and_sid
+-- name: get_user_by_provider_and_sid_roles_only
 SELECT
   u.id,
   u.email,
@@ -135,38 +428,116 @@ SELECT
   o.sid AS oauth_sid,
   (
     SELECT
-      COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[])
+      COALESCE(array_agg(r.name), ARRAY[]::text[])
     FROM
-      auth_role r
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
+      auth_user_role ur
+    JOIN auth_role r
+      ON r.id = ur.role_id
+    WHERE
+      ur.user_id = u.id
   ) AS roles,
-  (
-    SELECT
-      COALESCE(array_agg(DISTINCT p.name), ARRAY[]::text[])
-    FROM
-      auth_permission p
-    JOIN auth_user_role ur
-      ON u.id = ur.user_id
-    JOIN auth_role_permission rp
-      ON ur.role_id = rp.role_id
-  ) AS permissions
+  ARRAY[]::text[] AS permissions
 FROM
   auth_user u
-JOIN auth_oauth o
+LEFT JOIN auth_oauth o
   ON u.id = o.user_id
 WHERE
   o.provider = $1
   AND o.sid = $2;
 
+-- name: get_usernames_by_prefix
+SELECT
+  username
+FROM
+  auth_user
+WHERE
+  username ~>=~ $1
+  AND username ~<~ ($1 || ':')
+  AND ltrim(substr(username, length($1) + 1), '0123456789') = '';
+
+-- name: list_users
+SELECT
+  u.id,
+  u.email,
+  u.username,
+  u.active,
+  u.verified,
+  u.created_at,
+  u.last_login,
+  o.provider AS oauth_provider,
+  o.sid AS oauth_sid,
+  agg.roles,
+  agg.permissions
+FROM (
+  SELECT
+    *
+  FROM
+    auth_user u
+  WHERE
+    {}
+  ORDER BY
+    u.created_at DESC,
+    u.id DESC
+  LIMIT ${}
+) u
+LEFT JOIN auth_oauth o
+  ON u.id = o.user_id
+CROSS JOIN LATERAL (
+  SELECT
+    COALESCE(array_agg(DISTINCT r.name), ARRAY[]::text[]) AS roles,
+    COALESCE(
+      array_agg(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL),
+      ARRAY[]::text[]
+    ) AS permissions
+  FROM
+    auth_user_role ur
+  JOIN auth_role r
+    ON r.id = ur.role_id
+  LEFT JOIN auth_role_permission rp
+    ON rp.role_id = ur.role_id
+  LEFT JOIN auth_permission p
+    ON p.id = rp.permission_id
+  WHERE
+    ur.user_id = u.id
+) agg
+ORDER BY
+  u.created_at DESC,
+  u.id DESC;
+
+-- name: get_user_id_by_id
+SELECT
+  id
+FROM
+  auth_user
+WHERE
+  id = $1;
+
+-- name: get_user_password_by_id
+SELECT
+  password
+FROM
+  auth_user
+WHERE
+  id = $1;
 
 -- name: update_user_by_id
 UPDATE
   auth_user
 SET
-  {} = $2
+  {}
 WHERE
-  id = $1;
+  id = $1
+RETURNING id;
+
+-- name: update_last_login_bulk
+UPDATE
+  auth_user u
+SET
+  last_login = v.last_login
+FROM
+  unnest($1::int[], $2::timestamptz[]) AS v(id, last_login)
+WHERE
+  u.id = v.id;
 
 -- name: delete_user_by_id
 DELETE FROM
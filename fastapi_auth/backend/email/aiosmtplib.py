@@ -1,8 +1,11 @@
+import asyncio
 from email.message import EmailMessage
+from typing import List, Optional
 
 import aiosmtplib
 
 from fastapi_auth.backend.abc.email import AbstractEmailClient
+from fastapi_auth.logging import logger
 
 
 class AIOSMTPLibEmailClient(AbstractEmailClient):
@@ -23,6 +26,11 @@ class AIOSMTPLibEmailClient(AbstractEmailClient):
         check_new_email_message: str,
         oauth_account_removal_subject: str,
         oauth_account_removal_message: str,
+        workers: int = 2,
+        queue_size: int = 1000,
+        retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 20,
     ) -> None:
         self._hostname = hostname
         self._username = username
@@ -45,6 +53,90 @@ class AIOSMTPLibEmailClient(AbstractEmailClient):
         self._oauth_account_removal_subject = oauth_account_removal_subject
         self._oauth_account_removal_message = oauth_account_removal_message
 
+        self._workers = workers
+        self._queue_size = queue_size
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.dropped = 0
+
+    async def startup(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._queue_size)
+            self._tasks = [
+                asyncio.create_task(self._worker(self._queue))
+                for _ in range(self._workers)
+            ]
+
+    async def shutdown(self) -> None:
+        if self._queue is None:
+            return
+
+        queue, self._queue = self._queue, None
+        for _ in self._tasks:
+            await queue.put(None)
+
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self._hostname,
+            port=self._port,
+            timeout=self._timeout,
+            use_tls=True,
+        )
+        await smtp.connect()
+        await smtp.login(self._username, self._password)
+        return smtp
+
+    async def _close(self, smtp: Optional[aiosmtplib.SMTP]) -> None:
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+
+    async def _deliver(
+        self,
+        smtp: Optional[aiosmtplib.SMTP],
+        msg: EmailMessage,
+    ) -> Optional[aiosmtplib.SMTP]:
+        attempt = 0
+        while True:
+            try:
+                if smtp is None or not smtp.is_connected:
+                    smtp = await self._connect()
+                await smtp.send_message(msg)
+                return smtp
+            except Exception:
+                await self._close(smtp)
+                smtp = None
+                if attempt >= self._retries:
+                    logger.exception(f"failed to send email to {msg['To']}")
+                    return None
+
+            # the first failure is usually an idle session dropped by the server
+            if attempt > 0:
+                await asyncio.sleep(self._backoff * 2 ** (attempt - 1))
+            attempt += 1
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        smtp = None
+        while True:
+            msg = await queue.get()
+            try:
+                if msg is None:
+                    break
+                smtp = await self._deliver(smtp, msg)
+            finally:
+                queue.task_done()
+
+        await self._close(smtp)
+
     async def _send_email(self, email: str, subject: str, message: str) -> None:
         msg = EmailMessage()
         msg["From"] = f"{self._display_name} <{self._username}>"
@@ -52,15 +144,14 @@ class AIOSMTPLibEmailClient(AbstractEmailClient):
         msg["Subject"] = subject
         msg.set_content(message, subtype="html")
 
-        await aiosmtplib.send(
-            msg,
-            hostname=self._hostname,
-            username=self._username,
-            password=self._password,
-            port=self._port,
-            timeout=20,
-            use_tls=True,
-        )
+        if self._queue is None:
+            await self.startup()
+
+        try:
+            self._queue.put_nowait(msg)  # type: ignore
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error(f"email queue is full, dropped email to {email}")
 
     async def request_verification(self, email: str, token: str) -> None:
         await self._send_email(
@@ -1,5 +1,8 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Dict, Iterable, List, Tuple
 
 import jwt
 
@@ -13,11 +16,35 @@ class JWTBackend(AbstractJWTBackend):
         algorithm: str = "EdDSA",
         private_key: Any = "",
         public_key: Any = "",
+        cache_size: int = 0,
     ):
         self._algorithm = algorithm
         self._private_key = private_key
         self._public_key = public_key
 
+        # digest -> (exp, payload), disabled when cache_size is 0
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _sign(self, payload: dict) -> str:
+        return jwt.encode(payload, self._private_key, algorithm=self._algorithm)
+
+    def _claims(
+        self,
+        payload: dict,
+        type: str,
+        iat: datetime,
+        expiration: int,
+    ) -> dict:
+        return {
+            **payload,
+            "type": type,
+            "iat": iat,
+            "exp": iat + timedelta(seconds=expiration),
+        }
+
     def create_token(
         self,
         type: str,
@@ -25,28 +52,93 @@ class JWTBackend(AbstractJWTBackend):
         expiration: int,
     ) -> str:
         iat = datetime.now(timezone.utc)
-        exp = iat + timedelta(seconds=expiration)
-
-        payload.update(
-            {
-                "type": type,
-                "iat": iat,
-                "exp": exp,
-            }
-        )
+        return self._sign(self._claims(payload, type, iat, expiration))
 
-        return jwt.encode(payload, self._private_key, algorithm=self._algorithm)
+    def create_tokens_bulk(
+        self,
+        payloads: Iterable[dict],
+        access_expiration: int,
+        refresh_expiration: int,
+        access_type: str = "access",
+        refresh_type: str = "refresh",
+    ) -> List[Tuple[str, str]]:
+        iat = datetime.now(timezone.utc)
+        return [
+            (
+                self._sign(self._claims(payload, access_type, iat, access_expiration)),
+                self._sign(
+                    self._claims(payload, refresh_type, iat, refresh_expiration)
+                ),
+            )
+            for payload in payloads
+        ]
+
+    def create_token_pair(
+        self,
+        payload: dict,
+        access_expiration: int,
+        refresh_expiration: int,
+        access_type: str = "access",
+        refresh_type: str = "refresh",
+    ) -> Tuple[str, str]:
+        return self.create_tokens_bulk(
+            [payload],
+            access_expiration,
+            refresh_expiration,
+            access_type,
+            refresh_type,
+        )[0]
+
+    def _decode(self, token: str) -> dict:
+        return jwt.decode(
+            token,
+            self._public_key,
+            algorithms=[self._algorithm],
+        )
 
     def decode_token(self, token: str) -> dict:
-        if token:
+        if not token:
+            raise TokenDecodingError
+
+        if self._cache_size <= 0:
             try:
-                payload = jwt.decode(
-                    token,
-                    self._public_key,
-                    algorithms=[self._algorithm],
-                )
-                return payload
+                return self._decode(token)
             except Exception:
-                pass
+                raise TokenDecodingError
+
+        key = hashlib.sha256(token.encode()).digest()
+        item = self._cache.get(key)
+        if item is not None:
+            exp, payload = item
+            if exp > time.time():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return dict(payload)
+
+            del self._cache[key]
+
+        self.misses += 1
+        try:
+            payload = self._decode(token)
+        except Exception:
+            raise TokenDecodingError
+
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            self._cache[key] = (exp, payload)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return dict(payload)
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self._cache_size,
+        }
 
-        raise TokenDecodingError
+    def clear_cache(self) -> None:
+        """Drop cached payloads, e.g. after rotating keys."""
+        self._cache.clear()
@@ -0,0 +1,136 @@
+import base64
+import time
+from typing import Any, Iterable, List, Tuple
+
+import orjson
+from jwt.algorithms import get_default_algorithms
+
+from fastapi_auth.backend.jwt.default import JWTBackend
+
+RESERVED_CLAIMS = ("type", "iat", "exp")
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class PrecompiledJWTBackend(JWTBackend):
+    """JWTBackend that prepares keys and the header segment once.
+
+    Tokens are byte-compatible with PyJWT. Tokens with any other header
+    are still decoded by PyJWT.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "EdDSA",
+        private_key: Any = "",
+        public_key: Any = "",
+        cache_size: int = 0,
+    ):
+        super().__init__(algorithm, private_key, public_key, cache_size)
+
+        self._alg = get_default_algorithms()[algorithm]
+        self._signing_key = self._alg.prepare_key(private_key) if private_key else None
+        self._verifying_key = self._alg.prepare_key(public_key) if public_key else None
+
+        header = orjson.dumps(
+            {"alg": algorithm, "typ": "JWT"}, option=orjson.OPT_SORT_KEYS
+        )
+        self._header_segment = _b64encode(header)
+
+    def _sign_raw(self, raw: bytes) -> str:
+        signing_input = self._header_segment + b"." + _b64encode(raw)
+        signature = self._alg.sign(signing_input, self._signing_key)
+        return (signing_input + b"." + _b64encode(signature)).decode()
+
+    def _sign(self, payload: dict) -> str:
+        return self._sign_raw(orjson.dumps(payload))
+
+    def _claims_prefix(self, payload: dict) -> bytes:
+        # payload serialized once as '{...,' so registered claims can be
+        # appended for every token minted from it
+        claims = {k: v for k, v in payload.items() if k not in RESERVED_CLAIMS}
+        prefix = orjson.dumps(claims)[:-1]
+        return prefix + b"," if claims else prefix
+
+    def _sign_with_claims(
+        self,
+        prefix: bytes,
+        type: str,
+        iat: int,
+        expiration: int,
+    ) -> str:
+        return self._sign_raw(
+            prefix
+            + b'"type":'
+            + orjson.dumps(type)
+            + b',"iat":%d,"exp":%d}' % (iat, iat + expiration)
+        )
+
+    def create_token(
+        self,
+        type: str,
+        payload: dict,
+        expiration: int,
+    ) -> str:
+        iat = int(time.time())
+        return self._sign_with_claims(
+            self._claims_prefix(payload), type, iat, expiration
+        )
+
+    def create_tokens_bulk(
+        self,
+        payloads: Iterable[dict],
+        access_expiration: int,
+        refresh_expiration: int,
+        access_type: str = "access",
+        refresh_type: str = "refresh",
+    ) -> List[Tuple[str, str]]:
+        iat = int(time.time())
+        tokens = []
+        for payload in payloads:
+            prefix = self._claims_prefix(payload)
+            tokens.append(
+                (
+                    self._sign_with_claims(prefix, access_type, iat, access_expiration),
+                    self._sign_with_claims(
+                        prefix, refresh_type, iat, refresh_expiration
+                    ),
+                )
+            )
+
+        return tokens
+
+    def _decode(self, token: str) -> dict:
+        raw = token.encode()
+        signing_input, _, signature = raw.rpartition(b".")
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if header_segment != self._header_segment:
+            return super()._decode(token)
+
+        if not self._alg.verify(
+            signing_input, self._verifying_key, _b64decode(signature)
+        ):
+            raise ValueError("invalid signature")
+
+        payload = orjson.loads(_b64decode(payload_segment))
+        if not isinstance(payload, dict):
+            raise ValueError("invalid payload")
+
+        now = time.time()
+        for claim in ("iat", "nbf", "exp"):
+            if claim in payload and not isinstance(payload[claim], int):
+                raise ValueError(f"{claim} must be an integer")
+
+        if "nbf" in payload and payload["nbf"] > now:
+            raise ValueError("token is not yet valid")
+
+        if "exp" in payload and payload["exp"] <= now:
+            raise ValueError("token has expired")
+
+        return payload
@@ -1,13 +1,100 @@
+import asyncio
+from typing import Any, Optional
+
+from httpx import (
+    AsyncClient,
+    ConnectError,
+    ConnectTimeout,
+    Limits,
+    PoolTimeout,
+    Response,
+    Timeout,
+    TransportError,
+)
+
 from fastapi_auth.backend.abc.oauth import AbstractOAuthProvider
 
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# the request never reached the server, so retrying can't replay it
+NOT_SENT_ERRORS = (ConnectError, ConnectTimeout, PoolTimeout)
+
 
 class BaseOAuthProvider(AbstractOAuthProvider):
     name: str
 
-    def __init__(self, id: str, secret: str, login_only: bool = False) -> None:
+    def __init__(
+        self,
+        id: str,
+        secret: str,
+        login_only: bool = False,
+        http_client: Optional[AsyncClient] = None,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        retries: int = 2,
+        backoff: float = 0.2,
+    ) -> None:
         self._id = id
         self._secret = secret
         self._login_only = login_only
 
+        # an injected client is shared and closed by its owner
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._retries = retries
+        self._backoff = backoff
+
     def is_login_only(self) -> bool:
         return self._login_only
+
+    async def startup(self) -> None:
+        if self._client is None:
+            self._client = AsyncClient(
+                timeout=Timeout(self._timeout),
+                limits=Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_keepalive_connections,
+                ),
+            )
+
+    async def shutdown(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> Response:
+        """Authorization codes are single use, so code exchanges pass
+        idempotent=False and are only retried if they were never sent."""
+        if self._client is None:
+            await self.startup()
+
+        retryable_errors = TransportError if idempotent else NOT_SENT_ERRORS
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.request(  # type: ignore
+                    method, url, **kwargs
+                )
+            except retryable_errors:
+                if attempt >= self._retries:
+                    raise
+            else:
+                if (
+                    not idempotent
+                    or response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self._retries
+                ):
+                    return response
+
+            await asyncio.sleep(self._backoff * 2**attempt)
+            attempt += 1
@@ -1,7 +1,5 @@
 from typing import Tuple
 
-from httpx import AsyncClient
-
 from .base import BaseOAuthProvider
 
 
@@ -18,27 +16,29 @@ class FacebookOAuthProvider(BaseOAuthProvider):
         )
 
     async def get_user_data(self, redirect_uri: str, code: str) -> Tuple[str, str]:
-        async with AsyncClient(base_url="https://graph.facebook.com") as client:
-            response = await client.get(
-                "/v8.0/oauth/access_token",
-                params={
-                    "client_id": self._id,
-                    "client_secret": self._secret,
-                    "code": code,
-                    "redirect_uri": redirect_uri,
-                },
-            )
-
-            data = response.json()
-            access_token = data.get("access_token")
-
-            response = await client.get(
-                "/me",
-                params={
-                    "access_token": access_token,
-                    "fields": "id,email",
-                },
-            )
+        response = await self._request(
+            "GET",
+            "https://graph.facebook.com/v8.0/oauth/access_token",
+            idempotent=False,
+            params={
+                "client_id": self._id,
+                "client_secret": self._secret,
+                "code": code,
+                "redirect_uri": redirect_uri,
+            },
+        )
+
+        data = response.json()
+        access_token = data.get("access_token")
+
+        response = await self._request(
+            "GET",
+            "https://graph.facebook.com/me",
+            params={
+                "access_token": access_token,
+                "fields": "id,email",
+            },
+        )
 
         data = response.json()
         sid = data.get("user_id")
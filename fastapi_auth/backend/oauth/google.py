@@ -1,7 +1,6 @@
 from typing import Tuple
 
 import jwt
-from httpx import AsyncClient
 
 from .base import BaseOAuthProvider
 
@@ -20,17 +19,18 @@ class GoogleOAuthProvider(BaseOAuthProvider):
         )
 
     async def get_user_data(self, redirect_uri: str, code: str) -> Tuple[str, str]:
-        async with AsyncClient(base_url="https://oauth2.googleapis.com") as client:
-            response = await client.post(
-                "/token",
-                params={
-                    "client_id": self._id,
-                    "client_secret": self._secret,
-                    "code": code,
-                    "redirect_uri": redirect_uri,
-                    "grant_type": "authorization_code",
-                },
-            )
+        response = await self._request(
+            "POST",
+            "https://oauth2.googleapis.com/token",
+            idempotent=False,
+            params={
+                "client_id": self._id,
+                "client_secret": self._secret,
+                "code": code,
+                "redirect_uri": redirect_uri,
+                "grant_type": "authorization_code",
+            },
+        )
 
         data = response.json()
         id_token = data.get("id_token")
@@ -1,7 +1,5 @@
 from typing import Tuple
 
-from httpx import AsyncClient
-
 from .base import BaseOAuthProvider
 
 
@@ -20,16 +18,17 @@ class VKOAuthProvider(BaseOAuthProvider):
         )
 
     async def get_user_data(self, redirect_uri: str, code: str) -> Tuple[str, str]:
-        async with AsyncClient(base_url="https://oauth.vk.com") as client:
-            response = await client.get(
-                "/access_token",
-                params={
-                    "client_id": self._id,
-                    "client_secret": self._secret,
-                    "code": code,
-                    "redirect_uri": redirect_uri,
-                },
-            )
+        response = await self._request(
+            "GET",
+            "https://oauth.vk.com/access_token",
+            idempotent=False,
+            params={
+                "client_id": self._id,
+                "client_secret": self._secret,
+                "code": code,
+                "redirect_uri": redirect_uri,
+            },
+        )
 
         data = response.json()
         sid = data.get("user_id")
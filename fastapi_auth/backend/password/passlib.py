@@ -1,19 +1,128 @@
-from typing import List
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, TypeVar
 
 from passlib.context import CryptContext
 
 from fastapi_auth.backend.abc.password import AbstractPasswordBackend
+from fastapi_auth.errors import PasswordBackendOverloadedError
+
+T = TypeVar("T")
+
+_pwd_context: Optional[CryptContext] = None
+
+
+def _create_context(schemes: List[str]) -> CryptContext:
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+    )
+
+
+def _init_worker(schemes: List[str]) -> None:
+    global _pwd_context
+    _pwd_context = _create_context(schemes)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return _pwd_context.verify(plain_password, hashed_password)  # type: ignore
+
+
+def _hash(password: str) -> str:
+    return _pwd_context.hash(password)  # type: ignore
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    @property
+    def avg_time(self) -> float:
+        if self.calls == 0:
+            return 0.0
+
+        return self.total_time / self.calls
 
 
 class PasslibPasswordBackend(AbstractPasswordBackend):
-    def __init__(self, schemes: List[str] = ["bcrypt"]) -> None:
-        self.pwd_context = CryptContext(
-            schemes=schemes,
-            deprecated="auto",
+    """Hashes and verifies passwords in a process pool.
+
+    At most `max_pending` calls may be queued or running at once,
+    further calls fail fast with PasswordBackendOverloadedError.
+    """
+
+    def __init__(
+        self,
+        schemes: List[str] = ["bcrypt"],
+        pool_size: Optional[int] = None,
+        max_pending: int = 64,
+    ) -> None:
+        self._schemes = schemes
+        self._pool_size = pool_size
+        self._max_pending = max_pending
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.hash_stats = CallStats()
+        self.verify_stats = CallStats()
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._pool_size,
+                initializer=_init_worker,
+                initargs=(self._schemes,),
+            )
+
+        return self._executor
+
+    async def _run(self, stats: CallStats, fn: Callable[..., T], *args) -> T:
+        if self._pending >= self._max_pending:
+            self.rejected += 1
+            raise PasswordBackendOverloadedError
+
+        self._pending += 1
+        start = time.perf_counter()
+
+        def done(future: asyncio.Future) -> None:
+            self._pending -= 1
+            stats.add(time.perf_counter() - start)
+            if not future.cancelled():
+                # mark it retrieved in case the caller is gone
+                future.exception()
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
+        # cancelling the caller does not stop the worker process, so the
+        # call stays pending until the worker is done with it
+        future.add_done_callback(done)
+        return await asyncio.shield(future)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            self.verify_stats,
+            _verify,
+            plain_password,
+            hashed_password,
         )
 
-    def verify(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_stats, _hash, password)
 
-    def hash(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    async def shutdown(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # joining the workers blocks until running calls are done
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, executor.shutdown)
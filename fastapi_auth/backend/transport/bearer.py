@@ -0,0 +1,73 @@
+from typing import Optional
+
+from fastapi import Request, Response
+from starlette.types import Scope
+
+from fastapi_auth.backend.abc.transport import AbstractTransport
+
+
+def get_header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+
+    return None
+
+
+def get_bearer_token(scope: Scope) -> Optional[str]:
+    value = get_header(scope, b"authorization")
+    if value is None:
+        return None
+
+    scheme, _, token = value.partition(b" ")
+    if scheme.lower() != b"bearer":
+        return None
+
+    return token.strip().decode("latin-1") or None
+
+
+def get_cookie(scope: Scope, name: str) -> Optional[str]:
+    value = get_header(scope, b"cookie")
+    if value is None:
+        return None
+
+    key = name.encode("latin-1")
+    for chunk in value.split(b";"):
+        k, sep, v = chunk.partition(b"=")
+        if sep and k.strip() == key:
+            return v.strip().strip(b'"').decode("latin-1")
+
+    return None
+
+
+class BearerTransport(AbstractTransport):
+    """Tokens in the Authorization header, issued in the response body.
+
+    The refresh token is sent as the bearer token to the refresh route.
+    """
+
+    def login(
+        self,
+        response: Response,
+        access_token: str,
+        refresh_token: str,
+        access_token_expiration: int,
+        refresh_token_expiration: int,
+    ) -> Optional[dict]:
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+        }
+
+    def logout(self, response: Response) -> None:
+        pass
+
+    def refresh_access_token(self, response, token: str, expiration: int) -> None:
+        pass
+
+    def get_access_token(self, request: Request) -> Optional[str]:
+        return get_bearer_token(request.scope)
+
+    def get_refresh_token(self, request: Request) -> Optional[str]:
+        return get_bearer_token(request.scope)
@@ -0,0 +1,49 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+from fastapi_auth.backend.transport.bearer import get_bearer_token, get_cookie
+from fastapi_auth.backend.transport.cookie import CookieTransport
+
+
+class HeaderCookieTransport(CookieTransport):
+    """Bearer header or cookies read from the raw cookie header.
+
+    Login sets the cookies and also returns the tokens in the body.
+    """
+
+    def login(
+        self,
+        response: Response,
+        access_token: str,
+        refresh_token: str,
+        access_token_expiration: int,
+        refresh_token_expiration: int,
+    ) -> Optional[dict]:
+        super().login(
+            response,
+            access_token,
+            refresh_token,
+            access_token_expiration,
+            refresh_token_expiration,
+        )
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+        }
+
+    def get_access_token(self, request: Request) -> Optional[str]:
+        token = get_bearer_token(request.scope)
+        if token is None:
+            token = get_cookie(request.scope, self._access_cookie_name)
+
+        return token
+
+    def get_refresh_token(self, request: Request) -> Optional[str]:
+        # browsers may send the access token as bearer on refresh as well
+        token = get_cookie(request.scope, self._refresh_cookie_name)
+        if token is None:
+            token = get_bearer_token(request.scope)
+
+        return token
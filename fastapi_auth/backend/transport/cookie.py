@@ -51,7 +51,7 @@ class CookieTransport(AbstractTransport):
         refresh_token: str,
         access_token_expiration: int,
         refresh_token_expiration: int,
-    ) -> None:
+    ) -> Optional[dict]:
         self._set_access_token_cookie(
             response,
             access_token,
@@ -62,6 +62,7 @@ class CookieTransport(AbstractTransport):
             refresh_token,
             refresh_token_expiration,
         )
+        return None
 
     def logout(self, response: Response) -> None:
         response.delete_cookie(self._access_cookie_name)
@@ -2,7 +2,7 @@ from typing import Callable, Optional
 
 from fastapi import Depends, Request
 
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 
 
 class GlobalDependencies:
@@ -12,14 +12,14 @@ class GlobalDependencies:
 async def get_user(
     request: Request,
     repo=Depends(GlobalDependencies.get_repo),
-) -> Optional[User]:
+) -> Optional[UserPrincipal]:
     return await request.app.state._fastapi_auth.get_user(request, repo)
 
 
 async def get_authenticated_user(
     request: Request,
     repo=Depends(GlobalDependencies.get_repo),
-) -> User:
+) -> UserPrincipal:
     return await request.app.state._fastapi_auth.get_authenticated_user(request, repo)
 
 
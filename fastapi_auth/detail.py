@@ -14,3 +14,4 @@ class Detail:
     EMAIL_MISMATCH = "email mismatch"
     OAUTH_ACCOUNT_ALREADY_EXISTS = "oauth account already exists"
     OAUTH_ACCOUNT_NOT_SET = "oauth account not set"
+    INVALID_CURSOR = "invalid cursor"
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class FastAPIAuthException(Exception):
     pass
 
@@ -46,6 +49,10 @@ class InvalidPasswordError(FastAPIAuthException):
     pass
 
 
+class PasswordBackendOverloadedError(FastAPIAuthException):
+    pass
+
+
 # db
 class UserNotFoundError(FastAPIAuthException):
     pass
@@ -57,7 +64,9 @@ class RoleNotFoundError(FastAPIAuthException):
 
 # rate limit
 class TimeoutError(FastAPIAuthException):
-    pass
+    def __init__(self, retry_after: Optional[int] = None) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
 
 
 # oauth
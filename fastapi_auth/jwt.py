@@ -1,7 +1,15 @@
 from dataclasses import dataclass
-from typing import Tuple
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
 from fastapi_auth.backend.abc.jwt import AbstractJWTBackend
+from fastapi_auth.errors import TokenDecodingError
+from fastapi_auth.permissions import PermissionRegistry
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi_auth.repo import RolesRepo
+
+PERMISSION_MASK_CLAIM = "pm"
+PERMISSION_VERSION_CLAIM = "pv"
 
 
 @dataclass
@@ -49,12 +57,53 @@ class JWT:
         self,
         backend: AbstractJWTBackend,
         tp: TokenParams,
+        permission_registry: Optional[PermissionRegistry] = None,
     ):
         self._backend = backend
         self._tp = tp
+        self._permission_registry = permission_registry
+
+    def _compress(self, payload: dict) -> dict:
+        registry = self._permission_registry
+        if registry is None or "permissions" not in payload:
+            return payload
+
+        mask = registry.encode(payload["permissions"] or ())
+        if mask is None:
+            return payload
+
+        payload = {k: v for k, v in payload.items() if k != "permissions"}
+        payload[PERMISSION_MASK_CLAIM] = mask
+        payload[PERMISSION_VERSION_CLAIM] = registry.version
+        return payload
+
+    def expand_permissions(self, payload: dict) -> dict:
+        mask = payload.pop(PERMISSION_MASK_CLAIM, None)
+        version = payload.pop(PERMISSION_VERSION_CLAIM, None)
+        if mask is None:
+            return payload
+
+        registry = self._permission_registry
+        if registry is not None and version == registry.version:
+            payload["permissions"] = registry.decode(mask)
+        elif payload.get("type") == self._tp.access_token_type:
+            raise TokenDecodingError
+        else:
+            # refresh reloads permissions from the database
+            payload["permissions"] = frozenset()
+
+        return payload
+
+    async def refresh_permissions(self, roles: "RolesRepo") -> None:
+        if self._permission_registry is not None:
+            await self._permission_registry.refresh(roles)
+
+    def verify_token(self, token: str) -> dict:
+        # signature and expiry only, the permission mask stays compressed
+        return self._backend.decode_token(token)
 
     def decode_token(self, token: str) -> dict:
-        return self._backend.decode_token(token)
+        return self.expand_permissions(self.verify_token(token))
 
     def create_token(self, type: str, payload: dict, expiration: int) -> str:
         return self._backend.create_token(type, payload, expiration)
@@ -64,16 +113,28 @@ class JWT:
         payload: dict,
     ) -> str:
         return self._backend.create_token(
-            "access", payload, self._tp.access_token_expiration
+            "access", self._compress(payload), self._tp.access_token_expiration
         )
 
     def create_refresh_token(self, payload: dict) -> str:
         return self._backend.create_token(
-            "refresh", payload, self._tp.refresh_token_expiration
+            "refresh", self._compress(payload), self._tp.refresh_token_expiration
         )
 
     def create_tokens(self, payload: dict) -> Tuple[str, str]:
-        return (
-            self.create_access_token(payload),
-            self.create_refresh_token(payload),
+        return self._backend.create_token_pair(
+            self._compress(payload),
+            self._tp.access_token_expiration,
+            self._tp.refresh_token_expiration,
+            self._tp.access_token_type,
+            self._tp.refresh_token_type,
+        )
+
+    def create_tokens_bulk(self, payloads: Iterable[dict]) -> List[Tuple[str, str]]:
+        return self._backend.create_tokens_bulk(
+            (self._compress(payload) for payload in payloads),
+            self._tp.access_token_expiration,
+            self._tp.refresh_token_expiration,
+            self._tp.access_token_type,
+            self._tp.refresh_token_type,
         )
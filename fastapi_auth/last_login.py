@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi_auth.backend.abc.db import AbstractDatabaseClient
+from fastapi_auth.logging import logger
+from fastapi_auth.repo import UserRecordCache
+
+
+class LastLoginRecorder:
+    """Buffers last_login updates and writes them in bulk.
+
+    `db` must outlive single requests, the recorder flushes from a
+    background task every `flush_interval` seconds, as soon as `maxsize`
+    users are buffered, and once more on shutdown. Pass the `user_cache`
+    of the repo when it caches user records, written users are dropped
+    from it.
+    """
+
+    def __init__(
+        self,
+        db: AbstractDatabaseClient,
+        flush_interval: float = 0.5,
+        maxsize: int = 10_000,
+        user_cache: Optional[UserRecordCache] = None,
+    ) -> None:
+        self._db = db
+        self._user_cache = user_cache
+        self._flush_interval = flush_interval
+        self._maxsize = maxsize
+
+        self._buffer: Dict[int, datetime] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.dropped = 0
+
+    def record(self, id: int, last_login: datetime) -> None:
+        if id not in self._buffer and len(self._buffer) >= self._maxsize:
+            self.dropped += 1
+        else:
+            self._buffer[id] = last_login
+
+        if self._task is None and not self._closing:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(self._wakeup))
+
+        if len(self._buffer) >= self._maxsize and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, {}
+        try:
+            await self._db.update_last_login(list(batch.items()))
+        except Exception:
+            logger.exception("last_login flush failed")
+            for id, last_login in batch.items():
+                if id not in self._buffer and len(self._buffer) < self._maxsize:
+                    self._buffer[id] = last_login
+            return
+
+        if self._user_cache is not None:
+            try:
+                await self._user_cache.invalidate_many(batch)
+            except Exception:
+                logger.exception("last_login user cache invalidation failed")
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            wakeup.clear()
+            await self.flush()
+
+    async def shutdown(self) -> None:
+        self._closing = True
+        if self._task is not None and self._wakeup is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
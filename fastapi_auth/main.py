@@ -1,4 +1,6 @@
-from typing import Callable, Iterable, Optional
+import inspect
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Iterable, Optional
 
 from fastapi import APIRouter, FastAPI, HTTPException, Request
 
@@ -11,9 +13,16 @@ from fastapi_auth.backend.abc.password import AbstractPasswordBackend
 from fastapi_auth.backend.abc.transport import AbstractTransport
 from fastapi_auth.backend.abc.validator import AbstractValidator
 from fastapi_auth.dependencies import GlobalDependencies
-from fastapi_auth.errors import AuthorizationError, TokenDecodingError
+from fastapi_auth.errors import (
+    AuthorizationError,
+    TokenDecodingError,
+    WrongTokenTypeError,
+)
 from fastapi_auth.jwt import JWT, TokenParams
-from fastapi_auth.models.user import User
+from fastapi_auth.last_login import LastLoginRecorder
+from fastapi_auth.middleware import SCOPE_USER_KEY, AuthenticationMiddleware
+from fastapi_auth.models.user import UserPrincipal
+from fastapi_auth.permissions import PermissionRegistry
 from fastapi_auth.repo import Repo
 from fastapi_auth.routers import (
     get_admin_router,
@@ -41,32 +50,119 @@ class FastAPIAuth:
         token_params: TokenParams,
         transport: AbstractTransport,
         authorization: AbstractAuthorization,
+        middleware: bool = False,
+        public_paths: Iterable[str] = (),
+        permission_registry: Optional[PermissionRegistry] = None,
+        get_middleware_repo: Optional[Callable] = None,
     ) -> None:
         self.get_repo = get_repo
         app.dependency_overrides[GlobalDependencies.get_repo] = get_repo
 
-        self._jwt = JWT(jwt_backend, token_params)
+        self._jwt = JWT(jwt_backend, token_params, permission_registry)
         self._transport = transport
         self._authorization = authorization
         self._token_params = token_params
 
+        app.add_event_handler("shutdown", authorization.shutdown)
+        self._get_middleware_repo = get_middleware_repo
+        if middleware:
+            self._add_middleware(app, public_paths)
+        if permission_registry is not None:
+            app.add_event_handler("startup", self._load_permissions)
+
         app.state._fastapi_auth = self
 
-    async def get_user(self, request: Request, repo: Repo) -> Optional[User]:
+    def _add_middleware(self, app: FastAPI, public_paths: Iterable[str]) -> None:
+        if self._get_middleware_repo is None:
+            if inspect.signature(self.get_repo).parameters:
+                raise ValueError(
+                    "get_repo takes dependencies, middleware mode needs "
+                    "get_middleware_repo"
+                )
+
+            get_repo = self.get_repo
+            self._get_middleware_repo = lambda request: get_repo()
+
+        # the middleware authenticates, dependencies must not build a repo
+        app.dependency_overrides[GlobalDependencies.get_repo] = lambda: None
+        app.add_middleware(
+            AuthenticationMiddleware,
+            auth=self,
+            public_paths=public_paths,
+        )
+
+    async def _load_permissions(self) -> None:
+        # get_repo with dependencies can't be called here, the first
+        # request loads the registry instead
+        if inspect.signature(self.get_repo).parameters:
+            return
+
+        async with self._create_repo(self.get_repo) as repo:
+            await self._jwt.refresh_permissions(repo.roles)
+
+    @asynccontextmanager
+    async def _open_repo(
+        self, request: Request, repo: Optional[Repo]
+    ) -> AsyncIterator[Repo]:
+        if repo is not None:
+            yield repo
+            return
+
+        if self._get_middleware_repo is None:
+            raise RuntimeError("get_middleware_repo is not set")
+
+        # outside of routes there is no dependency injection
+        async with self._create_repo(self._get_middleware_repo, request) as repo:
+            yield repo
+
+    @asynccontextmanager
+    async def _create_repo(self, get_repo: Callable, *args) -> AsyncIterator[Repo]:
+        result = get_repo(*args)
+        if inspect.isasyncgen(result):
+            async with asynccontextmanager(lambda: result)() as repo:
+                yield repo
+            return
+
+        if inspect.isawaitable(result):
+            result = await result
+        yield result
+
+    async def _get_user(
+        self, request: Request, repo: Optional[Repo]
+    ) -> Optional[UserPrincipal]:
         try:
             token = self._transport.get_access_token(request)
-            payload = self._jwt.decode_token(token)
-            user = User(**payload)
-            await self._authorization.authorize(
-                repo,
-                user,
-                self._token_params.access_token_type,
-            )
+            if not token:
+                return None
+
+            # reject bad tokens before a repo (and its connection) is opened
+            payload = self._jwt.verify_token(token)
+            async with self._open_repo(request, repo) as repo:
+                await self._jwt.refresh_permissions(repo.roles)
+                user = UserPrincipal.from_payload(self._jwt.expand_permissions(payload))
+                await self._authorization.authorize(
+                    repo,
+                    user,
+                    self._token_params.access_token_type,
+                )
             return user
-        except (TokenDecodingError, AuthorizationError):
+        except (TokenDecodingError, AuthorizationError, WrongTokenTypeError):
             return None
 
-    async def get_authenticated_user(self, request: Request, repo: Repo) -> User:
+    async def authenticate(self, request: Request) -> Optional[UserPrincipal]:
+        return await self._get_user(request, None)
+
+    async def get_user(
+        self, request: Request, repo: Optional[Repo]
+    ) -> Optional[UserPrincipal]:
+        if SCOPE_USER_KEY in request.scope:
+            return request.scope[SCOPE_USER_KEY]
+
+        return await self._get_user(request, repo)
+
+    async def get_authenticated_user(
+        self, request: Request, repo: Repo
+    ) -> UserPrincipal:
         user = await self.get_user(request, repo)
         if user is not None:
             return user
@@ -127,19 +223,27 @@ class FastAPIAuthApp(FastAPIAuth):
         oauth_message_path: str = "/oauth",
         origin: str = "http://127.0.0.1",
         debug: bool = False,
+        last_login_recorder: Optional[LastLoginRecorder] = None,
+        middleware: bool = False,
+        public_paths: Iterable[str] = (),
+        permission_registry: Optional[PermissionRegistry] = None,
+        get_middleware_repo: Optional[Callable] = None,
     ) -> None:
         self._app = app
         self.get_repo = get_repo
         app.dependency_overrides[GlobalDependencies.get_repo] = get_repo
 
-        self._jwt = JWT(jwt_backend, token_params)
+        self._jwt = JWT(jwt_backend, token_params, permission_registry)
         self._token_params = token_params
         self._transport = transport
-        self._oauth_providers = oauth_providers
+        self._oauth_providers = {
+            provider.name: provider for provider in oauth_providers
+        }
         self._authorization = authorization
         self._password_backend = password_backend
         self._email_client = email_client
         self._captcha_client = captcha_client
+        self._last_login_recorder = last_login_recorder
 
         if validator is not None:
             GlobalValidator.set(validator)
@@ -156,6 +260,23 @@ class FastAPIAuthApp(FastAPIAuth):
         self._oauth_callback_prefix = oauth_path_prefix
         self._oauth_message_path = oauth_message_path
 
+        app.add_event_handler("startup", captcha_client.startup)
+        app.add_event_handler("shutdown", captcha_client.shutdown)
+        app.add_event_handler("startup", email_client.startup)
+        app.add_event_handler("shutdown", email_client.shutdown)
+        for oauth_provider in self._oauth_providers.values():
+            app.add_event_handler("startup", oauth_provider.startup)
+            app.add_event_handler("shutdown", oauth_provider.shutdown)
+        app.add_event_handler("shutdown", authorization.shutdown)
+        app.add_event_handler("shutdown", password_backend.shutdown)
+        if last_login_recorder is not None:
+            app.add_event_handler("shutdown", last_login_recorder.shutdown)
+        self._get_middleware_repo = get_middleware_repo
+        if middleware:
+            self._add_middleware(app, public_paths)
+        if permission_registry is not None:
+            app.add_event_handler("startup", self._load_permissions)
+
         app.state._fastapi_auth = self
 
     def include_routers(self, api_prefix: str) -> None:
@@ -178,6 +299,7 @@ class FastAPIAuthApp(FastAPIAuth):
             email_client=self._email_client,
             captcha_client=self._captcha_client,
             debug=self._debug,
+            last_login_recorder=self._last_login_recorder,
         )
         return get_auth_router(
             self.get_repo,
@@ -206,6 +328,7 @@ class FastAPIAuthApp(FastAPIAuth):
             oauth_providers=self._oauth_providers,
             origin=self._origin,
             path_prefix=self._oauth_callback_prefix,
+            last_login_recorder=self._last_login_recorder,
         )
         return get_oauth_router(
             self.get_repo,
@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING, Iterable
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi_auth.main import FastAPIAuth
+
+SCOPE_USER_KEY = "fastapi_auth.user"
+
+
+class AuthenticationMiddleware:
+    """Authenticate once per request and keep the user in the scope.
+
+    Requests to `public_paths` and below them are passed through untouched,
+    "/public" covers "/public/docs" but not "/publication".
+
+    Routes do not build the repo for authentication in this mode, it comes
+    from `get_middleware_repo(request)` instead. It may return a repo, an
+    awaitable or be an async generator; without it `get_repo` is used and
+    must not take any parameters.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        auth: "FastAPIAuth",
+        public_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self._auth = auth
+        paths = [path.rstrip("/") for path in public_paths]
+        self._public_paths = frozenset(path or "/" for path in paths)
+        self._public_prefixes = tuple(f"{path}/" for path in paths)
+
+    def _is_public(self, path: str) -> bool:
+        return path in self._public_paths or path.startswith(self._public_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not self._is_public(scope["path"]):
+            scope[SCOPE_USER_KEY] = await self._auth.authenticate(Request(scope))
+
+        await self.app(scope, receive, send)
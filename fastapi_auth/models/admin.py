@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -16,3 +16,20 @@ class RoleUpdate(BaseModel):
 class MassLogoutStatusResponse(BaseModel):
     active: bool
     date: Optional[datetime] = None
+
+
+class UserListItem(BaseModel):
+    id: int
+    email: str
+    username: str
+    roles: List[str]
+    active: bool
+    verified: bool
+    created_at: datetime
+    last_login: datetime
+    provider: Optional[str] = None
+
+
+class UserListResponse(BaseModel):
+    items: List[UserListItem]
+    next_cursor: Optional[str] = None
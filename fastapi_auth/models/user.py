@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, FrozenSet, Iterator, List, Optional, Tuple
 
 from pydantic import BaseModel, validator
 
+from fastapi_auth.errors import TokenDecodingError
 from fastapi_auth.models.common import DefaultModel
 
 
@@ -102,6 +103,80 @@ class User(ToPayload):
         return self.has_role("admin")
 
 
+class UserPrincipal:
+    """Lightweight authenticated user built from a token payload."""
+
+    __slots__ = ("id", "username", "roles", "permissions", "iat", "exp", "type")
+
+    def __init__(
+        self,
+        id: int,
+        username: str,
+        roles: FrozenSet[str],
+        permissions: FrozenSet[str],
+        iat: int,
+        exp: int,
+        type: str,
+    ) -> None:
+        self.id = id
+        self.username = username
+        self.roles = roles
+        self.permissions = permissions
+        self.iat = iat
+        self.exp = exp
+        self.type = type
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "UserPrincipal":
+        try:
+            return cls(
+                payload["id"],
+                payload["username"],
+                frozenset(payload.get("roles") or ()),
+                frozenset(payload.get("permissions") or ()),
+                payload["iat"],
+                payload["exp"],
+                payload["type"],
+            )
+        except (KeyError, TypeError):
+            raise TokenDecodingError
+
+    def is_authenticated(self) -> bool:
+        return True
+
+    def has_role(self, role: str) -> bool:
+        return role in self.roles
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions
+
+    def is_admin(self) -> bool:
+        return self.has_role("admin")
+
+    def payload(self) -> dict:
+        return {
+            "id": self.id,
+            "username": self.username,
+            "roles": sorted(self.roles),
+            "permissions": sorted(self.permissions),
+        }
+
+    def to_model(self) -> User:
+        return User(
+            **self.payload(),
+            iat=self.iat,
+            exp=self.exp,
+            type=self.type,
+        )
+
+    def dict(self) -> dict:
+        return self.to_model().dict()
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        # lets dict(user) and jsonable_encoder serialize the principal
+        return iter(self.dict().items())
+
+
 class UserUpdate(BaseModel):
     email: Optional[str] = None
     username: Optional[str] = None
@@ -121,6 +196,16 @@ class UserUpdate(BaseModel):
         )
 
 
+class UserFilter(BaseModel):
+    active: Optional[bool] = None
+    verified: Optional[bool] = None
+    role: Optional[str] = None
+    provider: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    search: Optional[str] = None
+
+
 class RoleDB(BaseModel):
     id: int
     name: str
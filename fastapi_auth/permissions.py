@@ -0,0 +1,75 @@
+import hashlib
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fastapi_auth.repo import RolesRepo
+
+
+class PermissionRegistry:
+    """Maps permission names to bits for compact token claims.
+
+    Bits are assigned in sorted name order and `version` is a digest of
+    the names, so every worker loading the same roles agrees on both.
+    The registry follows the role graph version in the cache backend and
+    reloads when it changes, which is checked at most every
+    `check_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        permissions: Iterable[str] = (),
+        check_interval: float = 1.0,
+    ) -> None:
+        self._set(permissions)
+        self.roles_version: Optional[str] = None
+        self._check_interval = check_interval
+        self._checked_at: Optional[float] = None
+
+    def _set(self, permissions: Iterable[str]) -> None:
+        self._names = sorted(set(permissions))
+        self._bits: Dict[str, int] = {
+            name: 1 << i for i, name in enumerate(self._names)
+        }
+        self.version = hashlib.sha256("\n".join(self._names).encode()).hexdigest()[:8]
+        self._decode = lru_cache(maxsize=1024)(self._decode_mask)
+
+    async def load(self, roles: "RolesRepo") -> None:
+        # read the version first, a concurrent bump triggers another load
+        version = await roles.version()
+        self._checked_at = time.monotonic()
+        # the role graph may lag behind the version, read the database
+        self._set(
+            permission
+            for role in await roles.db.roles.all()
+            for permission in role.permissions
+        )
+        self.roles_version = version
+
+    async def refresh(self, roles: "RolesRepo") -> None:
+        now = time.monotonic()
+        if self._checked_at is None:
+            await self.load(roles)
+        elif now - self._checked_at >= self._check_interval:
+            self._checked_at = now
+            if await roles.version() != self.roles_version:
+                await self.load(roles)
+
+    def encode(self, permissions: Iterable[str]) -> Optional[str]:
+        """Return the hex mask or None if a permission is not registered."""
+        mask = 0
+        for permission in permissions:
+            bit = self._bits.get(permission)
+            if bit is None:
+                return None
+            mask |= bit
+
+        return format(mask, "x")
+
+    def _decode_mask(self, mask: str) -> FrozenSet[str]:
+        value = int(mask, 16)
+        return frozenset(name for i, name in enumerate(self._names) if value >> i & 1)
+
+    def decode(self, mask: str) -> FrozenSet[str]:
+        return self._decode(mask)
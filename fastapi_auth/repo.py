@@ -1,11 +1,142 @@
+import asyncio
 from datetime import datetime, timezone
-from typing import Any, List, Optional
-
-from fastapi_auth.backend.abc.cache import AbstractCacheClient
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import orjson
+
+from fastapi_auth.backend.abc.cache import AbstractCacheClient, RateLimit
 from fastapi_auth.backend.abc.db import AbstractDatabaseClient
 from fastapi_auth.errors import TokenAlreadyUsedError, UserNotFoundError
 from fastapi_auth.jwt import TokenParams
-from fastapi_auth.models.user import OAuthDB, RoleDB, UserCreate, UserDB, UserUpdate
+from fastapi_auth.models.user import (
+    OAuthDB,
+    RoleDB,
+    UserCreate,
+    UserDB,
+    UserFilter,
+    UserUpdate,
+)
+from fastapi_auth.roles import RoleGraphCache
+
+
+class AuthorizationState(NamedTuple):
+    banned: bool
+    kick_ts: Optional[int]
+    mass_logout_ts: Optional[int]
+
+    def is_revoked(self, iat: int) -> bool:
+        if self.banned:
+            return True
+
+        if self.kick_ts is not None and self.kick_ts >= iat:
+            return True
+
+        return self.mass_logout_ts is not None and self.mass_logout_ts >= iat
+
+
+def _version(raw: Any) -> Optional[str]:
+    if isinstance(raw, bytes):
+        return raw.decode()
+
+    return None if raw is None else str(raw)
+
+
+class UserRecordCache:
+    """Read-through cache of UserDB records, disabled when ttl is 0.
+
+    Records are stored by id, username and email keys only hold the id
+    and are checked against the record they point to. The password hash
+    is not cached, read it with `Repo.get_password`.
+
+    Each record carries the roles version it was read under and is
+    ignored once the version moves on, so role and permission changes
+    never leave stale roles or permissions in the cache.
+    """
+
+    def __init__(
+        self,
+        cache: AbstractCacheClient,
+        prefix: str,
+        ttl: int,
+        version_key: str,
+    ) -> None:
+        self.cache = cache
+        self.prefix = prefix
+        self.ttl = ttl
+        self.version_key = version_key
+
+    async def get(self, id: int) -> Tuple[Optional[UserDB], Optional[str]]:
+        """Return the record and the current roles version, pass the
+        version to `set` when the record has to be read from the database."""
+        if self.ttl <= 0:
+            return None, None
+
+        raw, version = await self.cache.mget([f"{self.prefix}:{id}", self.version_key])
+        version = _version(version)
+        if raw is None:
+            return None, version
+
+        item = orjson.loads(raw)
+        if item.pop("roles_version", None) != version:
+            return None, version
+
+        return UserDB(**item), version
+
+    async def get_by(
+        self, field: str, value: str
+    ) -> Tuple[Optional[UserDB], Optional[str]]:
+        if self.ttl <= 0:
+            return None, None
+
+        id, version = await self.cache.mget(
+            [f"{self.prefix}:{field}:{value}", self.version_key]
+        )
+        if id is None:
+            return None, _version(version)
+
+        user, version = await self.get(int(id))
+        if user is not None and getattr(user, field) == value:
+            return user, version
+
+        return None, version
+
+    async def set(
+        self,
+        user: UserDB,
+        version: Optional[str],
+        field: Optional[str] = None,
+    ) -> None:
+        if self.ttl <= 0:
+            return
+
+        await self.cache.set(
+            f"{self.prefix}:{user.id}",
+            orjson.dumps({**user.dict(exclude={"password"}), "roles_version": version}),
+            ex=self.ttl,
+        )
+        if field is not None:
+            await self.cache.set(
+                f"{self.prefix}:{field}:{getattr(user, field)}",
+                user.id,
+                ex=self.ttl,
+            )
+
+    async def invalidate(self, id: int) -> None:
+        if self.ttl > 0:
+            await self.cache.delete(f"{self.prefix}:{id}")
+
+    async def invalidate_many(self, ids: Iterable[int]) -> None:
+        if self.ttl > 0:
+            await asyncio.gather(*(self.invalidate(id) for id in ids))
 
 
 class AdminRepo:
@@ -13,17 +144,21 @@ class AdminRepo:
         self,
         db: AbstractDatabaseClient,
         cache: AbstractCacheClient,
+        user_cache: UserRecordCache,
         access_token_expiration: int,
         refresh_token_expiration: int,
         ban_key_prefix: str,
         kick_key_prefix: str,
         mass_logout_key: str,
+        authorization_channel: str,
     ) -> None:
         self.db = db
         self.cache = cache
+        self.user_cache = user_cache
         self.ban_key_prefix = ban_key_prefix
         self.kick_key_prefix = kick_key_prefix
         self.mass_logout_key = mass_logout_key
+        self.authorization_channel = authorization_channel
         self.access_token_expiration = access_token_expiration
         self.refresh_token_expiration = refresh_token_expiration
 
@@ -32,18 +167,22 @@ class AdminRepo:
             id,
             UserUpdate(active=False).to_update_dict(),
         )
+        await self.user_cache.invalidate(id)
         await self.cache.set(
             f"{self.ban_key_prefix}:{id}",
             1,
             ex=self.access_token_expiration,
         )
+        await self._publish_user_changed(id)
 
     async def unban(self, id: int) -> None:
         await self.db.update(
             id,
             UserUpdate(active=True).to_update_dict(),
         )
+        await self.user_cache.invalidate(id)
         await self.cache.delete(f"{self.ban_key_prefix}:{id}")
+        await self._publish_user_changed(id)
 
     async def kick(self, id: int) -> None:
         ts = int(datetime.now(timezone.utc).timestamp())
@@ -52,9 +191,11 @@ class AdminRepo:
             ts,
             ex=self.refresh_token_expiration,
         )
+        await self._publish_user_changed(id)
 
     async def unkick(self, id: int) -> None:
         await self.cache.delete(f"{self.kick_key_prefix}:{id}")
+        await self._publish_user_changed(id)
 
     async def activate_mass_logout(self) -> None:
         ts = int(datetime.now(timezone.utc).timestamp())
@@ -63,9 +204,17 @@ class AdminRepo:
             ts,
             ex=self.refresh_token_expiration,
         )
+        await self._publish_mass_logout_changed()
 
     async def deactivate_mass_logout(self) -> None:
         await self.cache.delete(self.mass_logout_key)
+        await self._publish_mass_logout_changed()
+
+    async def _publish_user_changed(self, id: int) -> None:
+        await self.cache.publish(self.authorization_channel, f"user:{id}")
+
+    async def _publish_mass_logout_changed(self) -> None:
+        await self.cache.publish(self.authorization_channel, "mass_logout")
 
     async def get_mass_logout_ts(self) -> Optional[int]:
         ts = await self.cache.get(self.mass_logout_key)
@@ -80,21 +229,26 @@ class OAuthRepo:
         self,
         db: AbstractDatabaseClient,
         cache: AbstractCacheClient,
+        user_cache: UserRecordCache,
     ) -> None:
         self.db = db
         self.cache = cache
+        self.user_cache = user_cache
 
     async def get(self, user_id: int) -> Optional[OAuthDB]:
         return await self.db.oauth.get_by_user_id(user_id)
 
     async def create(self, user_id: int, provider: str, sid: str) -> None:
         await self.db.oauth.create(user_id, provider, str(sid))
+        await self.user_cache.invalidate(user_id)
 
     async def update(self, user_id: int, provider: str, sid: str) -> None:
         await self.db.oauth.update_by_user_id(user_id, provider, str(sid))
+        await self.user_cache.invalidate(user_id)
 
     async def delete(self, user_id: int) -> None:
         await self.db.oauth.delete_by_user_id(user_id)
+        await self.user_cache.invalidate(user_id)
 
 
 class RolesRepo:
@@ -102,35 +256,73 @@ class RolesRepo:
         self,
         db: AbstractDatabaseClient,
         cache: AbstractCacheClient,
+        user_cache: UserRecordCache,
+        version_key: str,
+        role_graph: Optional[RoleGraphCache] = None,
     ) -> None:
         self.db = db
         self.cache = cache
+        self.user_cache = user_cache
+        self._version_key = version_key
+        self._role_graph = role_graph
 
     # NOTE: this is stupid
 
+    async def _changed(self) -> None:
+        await self.cache.incr(self._version_key)
+        if self._role_graph is not None:
+            self._role_graph.invalidate()
+
+    async def version(self) -> Optional[str]:
+        return await self.cache.get(self._version_key)
+
+    async def expand(self, roles: List[str]) -> Optional[List[str]]:
+        if self._role_graph is None:
+            return None
+
+        graph = await self._role_graph.get(self.db, self.cache, self._version_key)
+        return graph.expand(roles)
+
     async def create(self, name: str) -> int:
-        return await self.db.roles.create(name)
+        id = await self.db.roles.create(name)
+        await self._changed()
+        return id
 
     async def get_by_name(self, name: str) -> Optional[RoleDB]:
-        return await self.db.roles.get_by_name(name)
+        if self._role_graph is None:
+            return await self.db.roles.get_by_name(name)
+
+        graph = await self._role_graph.get(self.db, self.cache, self._version_key)
+        return graph.get(name)
 
     async def add_permission(self, role_name: str, permission_name: str) -> None:
         await self.db.roles.add_permission(role_name, permission_name)
+        await self._changed()
 
     async def remove_permission(self, role_name: str, permission_name: str) -> None:
         await self.db.roles.remove_permission(role_name, permission_name)
+        await self._changed()
 
     async def delete_by_name(self, name: str) -> None:
-        return await self.db.roles.delete_by_name(name)
+        await self.db.roles.delete_by_name(name)
+        await self._changed()
 
     async def grant(self, user_id: int, role_name: str) -> None:
         await self.db.roles.grant(user_id, role_name)
+        await self.user_cache.invalidate(user_id)
+        await self._changed()
 
     async def revoke(self, user_id: int, role_name: str) -> None:
         await self.db.roles.revoke(user_id, role_name)
+        await self.user_cache.invalidate(user_id)
+        await self._changed()
 
     async def all(self) -> List[RoleDB]:
-        return await self.db.roles.all()
+        if self._role_graph is None:
+            return await self.db.roles.all()
+
+        graph = await self._role_graph.get(self.db, self.cache, self._version_key)
+        return graph.all()
 
 
 class Repo:
@@ -140,27 +332,46 @@ class Repo:
     mass_logout_key: str = "users:mass_logout"
     ban_key_prefix: str = "users:ban"
     kick_key_prefix: str = "users:kick"
+    authorization_channel: str = "users:authorization"
+    roles_version_key: str = "users:roles:version"
+    user_key_prefix: str = "users:record"
 
     def __init__(
         self,
         db: AbstractDatabaseClient,
         cache: AbstractCacheClient,
         tp: TokenParams,
+        role_graph: Optional[RoleGraphCache] = None,
+        user_cache_ttl: int = 0,
     ) -> None:
         self.db = db
         self.cache = cache
         self.tp = tp
+        self.user_cache = UserRecordCache(
+            cache,
+            self.user_key_prefix,
+            user_cache_ttl,
+            self.roles_version_key,
+        )
         self.admin = AdminRepo(
             db,
             cache,
+            self.user_cache,
             tp.access_token_expiration,
             tp.refresh_token_expiration,
             self.ban_key_prefix,
             self.kick_key_prefix,
             self.mass_logout_key,
+            self.authorization_channel,
+        )
+        self.oauth = OAuthRepo(db, cache, self.user_cache)
+        self.roles = RolesRepo(
+            db,
+            cache,
+            self.user_cache,
+            self.roles_version_key,
+            role_graph,
         )
-        self.oauth = OAuthRepo(db, cache)
-        self.roles = RolesRepo(db, cache)
 
     def _create_obj(self, user: Optional[dict]) -> UserDB:
         if user is None:
@@ -177,23 +388,83 @@ class Repo:
 
         return UserDB(**user, oauth=oauth)
 
-    def _user_or_error(self, user: Optional[UserDB]) -> UserDB:
-        if user is not None:
-            return user
+    async def _user_or_error(self, user: Optional[UserDB]) -> UserDB:
+        if user is None:
+            raise UserNotFoundError
+
+        permissions = await self.roles.expand(user.roles)
+        if permissions is not None:
+            user.permissions = permissions
 
-        raise UserNotFoundError
+        return user
 
     async def get(self, id: int) -> UserDB:
-        user = await self.db.get(id)
-        return self._user_or_error(user)
+        user, version = await self.user_cache.get(id)
+        if user is None:
+            user = await self.db.get(id)
+            if user is not None:
+                await self.user_cache.set(user, version)
+
+        return await self._user_or_error(user)
+
+    async def _get_by(
+        self,
+        field: str,
+        value: str,
+        fetch: Callable[[str], Awaitable[Optional[UserDB]]],
+    ) -> UserDB:
+        user, version = await self.user_cache.get_by(field, value)
+        if user is None:
+            user = await fetch(value)
+            if user is not None:
+                await self.user_cache.set(user, version, field)
+
+        return await self._user_or_error(user)
 
     async def get_by_email(self, email: str) -> UserDB:
-        user = await self.db.get_by_email(email)
-        return self._user_or_error(user)
+        return await self._get_by("email", email, self.db.get_by_email)
 
     async def get_by_username(self, username: str) -> UserDB:
-        user = await self.db.get_by_username(username)
-        return self._user_or_error(user)
+        return await self._get_by("username", username, self.db.get_by_username)
+
+    async def _expand_many(self, users: List[UserDB]) -> List[UserDB]:
+        for user in users:
+            permissions = await self.roles.expand(user.roles)
+            if permissions is not None:
+                user.permissions = permissions
+
+        return users
+
+    async def get_many(self, ids: List[int]) -> List[UserDB]:
+        return await self._expand_many(await self.db.get_many(ids))
+
+    async def get_many_by_username(self, usernames: List[str]) -> List[UserDB]:
+        return await self._expand_many(await self.db.get_many_by_username(usernames))
+
+    async def get_many_by_email(self, emails: List[str]) -> List[UserDB]:
+        return await self._expand_many(await self.db.get_many_by_email(emails))
+
+    async def list_users(
+        self,
+        filters: UserFilter,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50,
+    ) -> Tuple[List[UserDB], Optional[Tuple[datetime, int]]]:
+        """Return a page and the keyset of the next one, if there is one."""
+        users = await self.db.list_users(filters, after, limit + 1)
+        next_after = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_after = (users[-1].created_at, users[-1].id)
+
+        return await self._expand_many(users), next_after
+
+    async def get_password(self, user: UserDB) -> Optional[str]:
+        # cached records don't carry the password hash
+        if self.user_cache.ttl <= 0 or user.password is not None:
+            return user.password
+
+        return await self.db.get_password(user.id)
 
     async def get_by_login(self, login: str) -> UserDB:
         if "@" in login:
@@ -206,26 +477,48 @@ class Repo:
 
     async def get_by_provider_and_sid(self, provider: str, sid: str) -> UserDB:
         user = await self.db.get_by_provider_and_sid(provider, str(sid))
-        return self._user_or_error(user)
+        return await self._user_or_error(user)
+
+    async def get_usernames_by_prefix(self, prefix: str) -> List[str]:
+        return await self.db.get_usernames_by_prefix(prefix)
 
     async def create(self, obj: UserCreate) -> int:
         return await self.db.create(obj)
 
+    async def create_returning(self, obj: UserCreate) -> Optional[UserDB]:
+        return await self.db.create_returning(obj)
+
+    async def email_and_username_exist(
+        self,
+        email: str,
+        username: str,
+    ) -> Tuple[bool, bool]:
+        return await self.db.email_and_username_exist(email, username)
+
     async def update(self, id: int, obj: dict) -> None:
         await self.db.update(id, obj)
+        await self.user_cache.invalidate(id)
 
     async def delete(self, id: int) -> None:
         await self.db.delete(id)
+        await self.user_cache.invalidate(id)
 
     async def user_was_recently_banned(self, id: int) -> bool:
         return bool(await self.cache.get(f"{self.ban_key_prefix}:{id}"))
 
-    async def user_was_kicked(self, id: int, iat: int) -> bool:
+    async def get_kick_ts(self, id: int) -> Optional[int]:
         ts = await self.cache.get(f"{self.kick_key_prefix}:{id}")
+        if ts is not None:
+            return int(ts)
+
+        return None
+
+    async def user_was_kicked(self, id: int, iat: int) -> bool:
+        ts = await self.get_kick_ts(id)
         if ts is None:
             return False
 
-        return int(ts) >= iat
+        return ts >= iat
 
     async def user_in_mass_logout(self, iat: int) -> bool:
         ts = await self.admin.get_mass_logout_ts()
@@ -234,15 +527,30 @@ class Repo:
 
         return int(ts) >= iat
 
+    async def get_authorization_state(self, id: int) -> AuthorizationState:
+        ban, kick_ts, mass_logout_ts = await self.cache.mget(
+            [
+                f"{self.ban_key_prefix}:{id}",
+                f"{self.kick_key_prefix}:{id}",
+                self.mass_logout_key,
+            ]
+        )
+        return AuthorizationState(
+            banned=bool(ban),
+            kick_ts=int(kick_ts) if kick_ts is not None else None,
+            mass_logout_ts=int(mass_logout_ts) if mass_logout_ts is not None else None,
+        )
+
     async def verify_email(self, email: str) -> bool:
         item = await self.db.get_by_email(email)
         if item is None:
             return False
 
         await self.db.update(
-            item.get("id"),  # type: ignore
+            item.id,
             UserUpdate(verified=True).to_update_dict(),
         )
+        await self.user_cache.invalidate(item.id)
         return True
 
     async def use_token(self, token: str, ex: int) -> None:
@@ -251,6 +559,28 @@ class Repo:
         if not res:
             raise TokenAlreadyUsedError
 
+    async def rate_limit(
+        self,
+        type: str,
+        rate: int,
+        interval: int,
+        timeout: int,
+        id: Any,
+        sliding: bool = False,
+    ) -> RateLimit:
+        key = f"{self.rate_key_prefix}:{type}:{id}"
+        if sliding:
+            key = f"{key}:sliding"
+
+        return await self.cache.rate_limit(
+            key,
+            f"{self.timeout_key_prefix}:{type}:{id}",
+            rate,
+            interval,
+            timeout,
+            sliding,
+        )
+
     async def rate_limit_reached(
         self,
         type: str,
@@ -259,16 +589,5 @@ class Repo:
         timeout: int,
         id: Any,
     ) -> bool:
-        timeout_key = f"{self.timeout_key_prefix}:{type}:{id}"
-        if await self.cache.get(timeout_key) is not None:
-            return True
-
-        cur = await self.cache.incr(f"{self.rate_key_prefix}:{type}:{id}")
-        if cur == 1:
-            await self.cache.expire(type, interval)
-
-        if cur >= rate:
-            await self.cache.set(timeout_key, 1, ex=timeout)
-            return True
-
-        return False
+        limit = await self.rate_limit(type, rate, interval, timeout, id)
+        return limit.reached
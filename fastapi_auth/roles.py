@@ -0,0 +1,78 @@
+import asyncio
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from fastapi_auth.backend.abc.cache import AbstractCacheClient
+from fastapi_auth.backend.abc.db import AbstractDatabaseClient
+from fastapi_auth.models.user import RoleDB
+
+
+class RoleGraph:
+    def __init__(self, roles: List[RoleDB], version: Optional[str]) -> None:
+        self.version = version
+        self._roles: Dict[str, RoleDB] = {role.name: role for role in roles}
+        self._permissions: Dict[str, FrozenSet[str]] = {
+            role.name: frozenset(role.permissions) for role in roles
+        }
+
+    def all(self) -> List[RoleDB]:
+        return [role.copy(deep=True) for role in self._roles.values()]
+
+    def get(self, name: str) -> Optional[RoleDB]:
+        role = self._roles.get(name)
+        if role is not None:
+            return role.copy(deep=True)
+
+        return None
+
+    def expand(self, roles: Iterable[str]) -> List[str]:
+        permissions: FrozenSet[str] = frozenset()
+        for role in roles:
+            permissions = permissions.union(self._permissions.get(role, ()))
+
+        return sorted(permissions)
+
+
+class RoleGraphCache:
+    """Process-local roles and permissions.
+
+    The graph is reloaded when the version counter in the cache backend
+    changes, which is checked at most every `check_interval` seconds.
+    """
+
+    def __init__(self, check_interval: float = 1.0) -> None:
+        self._check_interval = check_interval
+        self._graph: Optional[RoleGraph] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(
+        self,
+        db: AbstractDatabaseClient,
+        cache: AbstractCacheClient,
+        version_key: str,
+    ) -> RoleGraph:
+        now = time.monotonic()
+        graph = self._graph
+        if graph is not None and now - self._checked_at < self._check_interval:
+            return graph
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            graph = self._graph
+            if graph is not None and now < self._checked_at:
+                return graph
+
+            # read the version first, a concurrent bump triggers another load
+            version = await cache.get(version_key)
+            if graph is None or graph.version != version:
+                graph = RoleGraph(await db.roles.all(), version)
+                self._graph = graph
+
+            self._checked_at = time.monotonic()
+            return graph
+
+    def invalidate(self) -> None:
+        self._graph = None
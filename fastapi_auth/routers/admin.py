@@ -1,14 +1,39 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import datetime, timezone
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.exceptions import HTTPException
 
 from fastapi_auth.dependencies import admin_required
-from fastapi_auth.models.admin import MassLogoutStatusResponse, RoleCreate, RoleUpdate
-from fastapi_auth.models.user import RoleDB
+from fastapi_auth.detail import Detail
+from fastapi_auth.models.admin import (
+    MassLogoutStatusResponse,
+    RoleCreate,
+    RoleUpdate,
+    UserListItem,
+    UserListResponse,
+)
+from fastapi_auth.models.user import RoleDB, UserFilter
 from fastapi_auth.repo import Repo
 
 
+def _encode_cursor(after: Tuple[datetime, int]) -> str:
+    created_at, id = after
+    data = orjson.dumps([created_at.isoformat(), id])
+    return urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        data = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = orjson.loads(data)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, detail=Detail.INVALID_CURSOR)
+
+
 def get_admin_router(
     get_repo: Callable,
 ) -> APIRouter:
@@ -41,6 +66,30 @@ def get_admin_router(
     async def admin_deactivate_mass_logout(repo: Repo = Depends(get_repo)):
         await repo.admin.deactivate_mass_logout()
 
+    @router.get(
+        "/users",
+        name="admin:list_users",
+        response_model=UserListResponse,
+    )
+    async def admin_list_users(
+        filters: UserFilter = Depends(),
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=100),
+        repo: Repo = Depends(get_repo),
+    ):
+        after = _decode_cursor(cursor) if cursor else None
+        users, next_after = await repo.list_users(filters, after, limit)
+        return UserListResponse(
+            items=[
+                UserListItem(
+                    **user.dict(include=set(UserListItem.__fields__)),
+                    provider=user.oauth.provider if user.oauth else None,
+                )
+                for user in users
+            ],
+            next_cursor=_encode_cursor(next_after) if next_after else None,
+        )
+
     @router.post(
         "/roles",
         name="admin:create_role",
@@ -10,6 +10,7 @@ from fastapi_auth.errors import (
     EmailAlreadyExistsError,
     InvalidCaptchaError,
     InvalidPasswordError,
+    PasswordBackendOverloadedError,
     PasswordNotSetError,
     TimeoutError,
     UsernameAlreadyExistsError,
@@ -53,6 +54,7 @@ def get_auth_router(
                 else:
                     on_create_action(request, user_db)
 
+            await jwt.refresh_permissions(repo.roles)
             access_token, refresh_token = jwt.create_tokens(user_db.payload())
             return transport.login(
                 response,
@@ -65,9 +67,11 @@ def get_auth_router(
         except InvalidCaptchaError:  # pragma: no cover
             raise HTTPException(400, detail=Detail.INVALID_CAPTCHA)
         except UsernameAlreadyExistsError:  # pragma: no cover
-            raise HTTPException(400, detail=Detail.EMAIL_ALREADY_EXISTS)
-        except EmailAlreadyExistsError:  # pragma: no cover
             raise HTTPException(400, detail=Detail.USERNAME_ALREADY_EXISTS)
+        except EmailAlreadyExistsError:  # pragma: no cover
+            raise HTTPException(400, detail=Detail.EMAIL_ALREADY_EXISTS)
+        except PasswordBackendOverloadedError:  # pragma: no cover
+            raise HTTPException(503)
 
     @router.post("/login", name="auth:login")
     async def auth_login(
@@ -82,6 +86,7 @@ def get_auth_router(
                 data_in,
                 request.client.host,  # type: ignore
             )
+            await jwt.refresh_permissions(repo.roles)
             access_token, refresh_token = jwt.create_tokens(user_db.payload())
             return transport.login(
                 response,
@@ -99,8 +104,14 @@ def get_auth_router(
             raise HTTPException(401, detail=Detail.PASSWORD_NOT_SET)
         except UserNotFoundError:  # pragma: no cover
             raise HTTPException(404)
-        except TimeoutError:  # pragma: no cover
-            raise HTTPException(429)
+        except TimeoutError as e:  # pragma: no cover
+            headers = None
+            if e.retry_after is not None:
+                headers = {"Retry-After": str(e.retry_after)}
+
+            raise HTTPException(429, headers=headers)
+        except PasswordBackendOverloadedError:  # pragma: no cover
+            raise HTTPException(503)
 
     @router.post("/logout", name="auth:logout")
     async def auth_logout(response: Response):
@@ -8,13 +8,14 @@ from fastapi_auth.errors import (
     EmailAlreadyVerifiedError,
     EmailMismatchError,
     SameEmailError,
+    TimeoutError,
     TokenAlreadyUsedError,
     TokenDecodingError,
     UserNotFoundError,
     WrongTokenTypeError,
 )
 from fastapi_auth.models.email import ChangeEmailRequest
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 from fastapi_auth.repo import Repo
 from fastapi_auth.services.email import EmailService
 
@@ -26,7 +27,7 @@ def get_email_router(get_repo: Callable, service: EmailService) -> APIRouter:
     async def email_request_verification(
         *,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
             await service.request_verification(repo, user)
@@ -60,7 +61,7 @@ def get_email_router(get_repo: Callable, service: EmailService) -> APIRouter:
         *,
         data_in: ChangeEmailRequest,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
             await service.request_email_change(repo, data_in, user)
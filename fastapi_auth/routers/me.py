@@ -15,7 +15,7 @@ from fastapi_auth.errors import (
     WrongTokenTypeError,
 )
 from fastapi_auth.models.me import ChangeUsernameRequest, MeResponse
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 from fastapi_auth.repo import Repo
 from fastapi_auth.services.me import MeService
 
@@ -37,7 +37,7 @@ def get_me_router(
     async def me_get(
         *,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         return await service.get(repo, user)
 
@@ -47,16 +47,16 @@ def get_me_router(
         data_in: ChangeUsernameRequest,
         request: Request,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
-            user, update_obj = await service.change_username(repo, data_in, user)
+            user_model, update_obj = await service.change_username(repo, data_in, user)
 
             if on_update_action is not None:  # pragma: no cover
                 if asyncio.iscoroutinefunction(on_update_action):
-                    await on_update_action(request, user, update_obj)
+                    await on_update_action(request, user_model, update_obj)
                 else:
-                    on_update_action(request, user, update_obj)
+                    on_update_action(request, user_model, update_obj)
 
         except SameUsernameError:  # pragma: no cover
             raise HTTPException(400, detail=Detail.SAME_USERNAME)
@@ -68,7 +68,7 @@ def get_me_router(
         provider_name: str,
         response: Response,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
             token = await service.add_oauth_account(repo, provider_name, user)
@@ -87,7 +87,7 @@ def get_me_router(
     )
     async def me_request_account_removal(
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
             await service.request_oauth_account_removal(repo, user)
@@ -104,6 +104,7 @@ def get_oauth_router(
                     else:
                         on_create_action(request, user_db)
 
+            await jwt.refresh_permissions(repo.roles)
             access_token, refresh_token = jwt.create_tokens(user_db.payload())
             response = RedirectResponse("/")
             transport.login(
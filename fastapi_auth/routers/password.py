@@ -9,6 +9,7 @@ from fastapi_auth.errors import (
     InvalidCaptchaError,
     InvalidPasswordError,
     PasswordAlreadyExistsError,
+    PasswordBackendOverloadedError,
     PasswordNotSetError,
     TimeoutError,
     TokenAlreadyUsedError,
@@ -22,7 +23,7 @@ from fastapi_auth.models.password import (
     PasswordSetRequest,
     PasswordStatusResponse,
 )
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 from fastapi_auth.repo import Repo
 from fastapi_auth.services.password import PasswordService
 
@@ -53,7 +54,7 @@ def get_password_router(get_repo: Callable, service: PasswordService):
     async def password_get_status(
         *,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         return await service.get_status(repo, user)
 
@@ -62,19 +63,21 @@ def get_password_router(get_repo: Callable, service: PasswordService):
         *,
         data_in: PasswordSetRequest,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
             await service.set(repo, data_in, user)
         except PasswordAlreadyExistsError:  # pragma: no cover
             raise HTTPException(400, detail=Detail.PASSWORD_ALREADY_EXISTS)
+        except PasswordBackendOverloadedError:  # pragma: no cover
+            raise HTTPException(503)
 
     @router.post("/password/change", name="password:change")
     async def password_change(
         *,
         data_in: PasswordChangeRequest,
         repo: Repo = Depends(get_repo),
-        user: User = Depends(get_authenticated_user),
+        user: UserPrincipal = Depends(get_authenticated_user),
     ):
         try:
             await service.change(repo, data_in, user)
@@ -82,6 +85,8 @@ def get_password_router(get_repo: Callable, service: PasswordService):
             raise HTTPException(400, detail=Detail.PASSWORD_NOT_SET)
         except InvalidPasswordError:  # pragma: no cover
             raise HTTPException(400, detail=Detail.INCORRECT_OLD_PASSWORD)
+        except PasswordBackendOverloadedError:  # pragma: no cover
+            raise HTTPException(503)
 
     @router.post("/password/reset", name="password:reset")
     async def password_reset(
@@ -95,5 +100,7 @@ def get_password_router(get_repo: Callable, service: PasswordService):
             raise HTTPException(400, detail=Detail.WRONG_TOKEN_TYPE)
         except TokenAlreadyUsedError:  # pragma: no cover
             raise HTTPException(400, detail=Detail.TOKEN_ALREADY_USED)
+        except PasswordBackendOverloadedError:  # pragma: no cover
+            raise HTTPException(503)
 
     return router
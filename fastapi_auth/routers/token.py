@@ -10,10 +10,11 @@ from fastapi_auth.errors import (
     AuthorizationError,
     TokenDecodingError,
     UserNotActiveError,
+    WrongTokenTypeError,
 )
 from fastapi_auth.jwt import JWT, TokenParams
 from fastapi_auth.models.token import RefreshAccessTokenResponse, TokenPayloadResponse
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 from fastapi_auth.repo import Repo
 
 
@@ -31,8 +32,8 @@ def get_token_router(
         name="token:payload",
         response_model=TokenPayloadResponse,
     )
-    async def token_payload(user: User = Depends(get_authenticated_user)):
-        return user
+    async def token_payload(user: UserPrincipal = Depends(get_authenticated_user)):
+        return user.to_model()
 
     @router.post(
         "/token/refresh",
@@ -46,12 +47,13 @@ def get_token_router(
         try:
             refresh_token = transport.get_refresh_token(request)
             payload = jwt.decode_token(refresh_token)
-            user = User(**payload)
+            user = UserPrincipal.from_payload(payload)
             await authorization.authorize(repo, user, "refresh")
             user_db = await repo.get(user.id)
             if not user_db.active:
                 raise UserNotActiveError
 
+            await jwt.refresh_permissions(repo.roles)
             access_token = jwt.create_access_token(user_db.payload())
             response = ORJSONResponse({"access_token": access_token})
             transport.refresh_access_token(
@@ -59,7 +61,7 @@ def get_token_router(
             )
             return response
 
-        except (TokenDecodingError, AuthorizationError):  # pragma: no cover
+        except (TokenDecodingError, AuthorizationError, WrongTokenTypeError):
             raise HTTPException(401)
 
     return router
@@ -13,9 +13,9 @@ from fastapi_auth.errors import (
     TimeoutError,
     UsernameAlreadyExistsError,
     UserNotActiveError,
-    UserNotFoundError,
 )
 from fastapi_auth.jwt import JWT, TokenParams
+from fastapi_auth.last_login import LastLoginRecorder
 from fastapi_auth.models.auth import LoginRequest, RegisterRequest
 from fastapi_auth.models.user import UserCreate, UserDB, UserUpdate
 from fastapi_auth.repo import Repo
@@ -32,6 +32,7 @@ class AuthService:
         email_client: Optional[AbstractEmailClient],
         captcha_client: Optional[AbstractCaptchaClient],
         debug: bool,
+        last_login_recorder: Optional[LastLoginRecorder] = None,
     ):
         self._jwt = jwt
         self._tp = token_params
@@ -40,6 +41,7 @@ class AuthService:
         self._email_client = email_client
         self._captcha_client = captcha_client
         self._debug = debug
+        self._last_login_recorder = last_login_recorder
 
     async def register(
         self,
@@ -54,25 +56,25 @@ class AuthService:
         ):
             raise InvalidCaptchaError
 
-        try:
-            await repo.get_by_email(data_in.email)
+        email_exists, username_exists = await repo.email_and_username_exist(
+            data_in.email, data_in.username
+        )
+        if email_exists:
             raise EmailAlreadyExistsError
-        except UserNotFoundError:
-            pass
-
-        try:
-            await repo.get_by_username(data_in.username)
+        if username_exists:
             raise UsernameAlreadyExistsError
-        except UserNotFoundError:
-            pass
-
-        user_create = UserCreate(
-            **data_in.dict(),
-            password=self._password_backend.hash(data_in.password1),
-        )
 
-        id = await repo.create(user_create)
-        user = await repo.get(id)
+        password = await self._password_backend.hash(data_in.password1)
+        user_create = UserCreate(**data_in.dict(), password=password)
+        user = await repo.create_returning(user_create)
+        if user is None:
+            # lost a race to a concurrent registration
+            email_exists, _ = await repo.email_and_username_exist(
+                data_in.email, data_in.username
+            )
+            if email_exists:
+                raise EmailAlreadyExistsError
+            raise UsernameAlreadyExistsError
 
         if self._email_client is not None:
             try:
@@ -94,26 +96,30 @@ class AuthService:
         data_in: LoginRequest,
         ip: str,
     ) -> UserDB:
-        if await repo.rate_limit_reached("login", 30, 60, 120, ip):
-            raise TimeoutError
+        limit = await repo.rate_limit("login", 30, 60, 120, ip, sliding=True)
+        if limit.reached:
+            raise TimeoutError(limit.retry_after)
 
         user = await repo.get_by_login(data_in.login)
+        password = await repo.get_password(user)
 
-        if user.password is None:
+        if password is None:
             raise PasswordNotSetError
 
-        if not self._password_backend.verify(data_in.password, user.password):
+        if not await self._password_backend.verify(data_in.password, password):
             raise InvalidPasswordError
 
         if not user.active:
             raise UserNotActiveError
 
-        last_login_update_obj = UserUpdate(
-            last_login=datetime.now(timezone.utc),
-        )
-        await repo.update(
-            user.id,
-            last_login_update_obj.to_update_dict(),
-        )
+        last_login = datetime.now(timezone.utc)
+        if self._last_login_recorder is not None:
+            self._last_login_recorder.record(user.id, last_login)
+        else:
+            last_login_update_obj = UserUpdate(last_login=last_login)
+            await repo.update(
+                user.id,
+                last_login_update_obj.to_update_dict(),
+            )
 
         return user
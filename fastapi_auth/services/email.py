@@ -8,7 +8,7 @@ from fastapi_auth.errors import (
 )
 from fastapi_auth.jwt import JWT, TokenParams
 from fastapi_auth.models.email import ChangeEmailRequest, EmailActionTokenPayload
-from fastapi_auth.models.user import User, UserUpdate
+from fastapi_auth.models.user import UserPrincipal, UserUpdate
 from fastapi_auth.repo import Repo
 
 
@@ -42,7 +42,7 @@ class EmailService:
         self._tp = token_params
         self._email_client = email_client
 
-    async def request_verification(self, repo: Repo, user: User) -> None:
+    async def request_verification(self, repo: Repo, user: UserPrincipal) -> None:
         item = await repo.get(user.id)
 
         if item.verified:
@@ -89,7 +89,7 @@ class EmailService:
         self,
         repo: Repo,
         data_in: ChangeEmailRequest,
-        user: User,
+        user: UserPrincipal,
     ) -> None:
         item = await repo.get(user.id)
 
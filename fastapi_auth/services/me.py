@@ -13,7 +13,7 @@ from fastapi_auth.errors import (
 from fastapi_auth.jwt import JWT, TokenParams
 from fastapi_auth.models.me import ChangeUsernameRequest
 from fastapi_auth.models.oauth import OAuthAccountActionTokenPayload
-from fastapi_auth.models.user import User, UserDB, UserUpdate
+from fastapi_auth.models.user import User, UserDB, UserPrincipal, UserUpdate
 from fastapi_auth.repo import Repo
 
 
@@ -28,14 +28,14 @@ class MeService:
         self._email_client = email_client
         self._tp = token_params
 
-    async def get(self, repo: Repo, user: User) -> UserDB:
+    async def get(self, repo: Repo, user: UserPrincipal) -> UserDB:
         return await repo.get(user.id)
 
     async def change_username(
         self,
         repo: Repo,
         data_in: ChangeUsernameRequest,
-        user: User,
+        user: UserPrincipal,
     ) -> Tuple[User, UserUpdate]:
         item = await repo.get(user.id)
 
@@ -57,13 +57,13 @@ class MeService:
 
         # NOTE: refresh access token on frontend
 
-        return user, update_obj
+        return user.to_model(), update_obj
 
     async def add_oauth_account(
         self,
         repo: Repo,
         provider: str,
-        user: User,
+        user: UserPrincipal,
     ) -> str:
         item = await repo.get(user.id)
 
@@ -81,13 +81,15 @@ class MeService:
             self._tp.add_oauth_account_token_expiration,
         )
 
-    async def request_oauth_account_removal(self, repo: Repo, user: User) -> None:
+    async def request_oauth_account_removal(
+        self, repo: Repo, user: UserPrincipal
+    ) -> None:
         item = await repo.get(user.id)
 
         if item.oauth is None:
             raise OAuthAccountNotSetError
 
-        if item.password is None:
+        if await repo.get_password(item) is None:
             raise PasswordNotSetError
 
         payload = {
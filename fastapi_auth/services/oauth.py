@@ -1,6 +1,5 @@
-import random
 from datetime import datetime, timezone
-from typing import Iterable, Optional
+from typing import Mapping, Optional
 
 from fastapi_auth.backend.abc.oauth import AbstractOAuthProvider
 from fastapi_auth.errors import (
@@ -11,34 +10,31 @@ from fastapi_auth.errors import (
     WrongTokenTypeError,
 )
 from fastapi_auth.jwt import JWT, TokenParams
+from fastapi_auth.last_login import LastLoginRecorder
 from fastapi_auth.models.oauth import OAuthAccountActionTokenPayload
 from fastapi_auth.models.user import UserCreate, UserDB, UserUpdate
 from fastapi_auth.repo import Repo
 
-MAX_ATTEMPTS = 15
-
 
 class OAuthService:
     def __init__(
         self,
         jwt: JWT,
         token_params: TokenParams,
-        oauth_providers: Iterable[AbstractOAuthProvider],
+        oauth_providers: Mapping[str, AbstractOAuthProvider],
         origin: str,
         path_prefix: str,
+        last_login_recorder: Optional[LastLoginRecorder] = None,
     ) -> None:
         self._jwt = jwt
         self._tp = token_params
         self._oauth_providers = oauth_providers
         self._origin = origin
         self._path_prefix = path_prefix
+        self._last_login_recorder = last_login_recorder
 
     def get_provider(self, provider_name: str) -> Optional[AbstractOAuthProvider]:
-        for provider in self._oauth_providers:
-            if provider.name == provider_name:
-                return provider
-
-        return None
+        return self._oauth_providers.get(provider_name)
 
     def create_redirect_uri(self, provider_name: str) -> str:
         return f"{self._origin}{self._path_prefix}/{provider_name}/callback"
@@ -57,11 +53,15 @@ class OAuthService:
         if not item.active:
             raise UserNotActiveError
 
-        last_login_update_obj = UserUpdate(last_login=datetime.now(timezone.utc))
-        await repo.update(
-            item.id,
-            last_login_update_obj.to_update_dict(),
-        )
+        last_login = datetime.now(timezone.utc)
+        if self._last_login_recorder is not None:
+            self._last_login_recorder.record(item.id, last_login)
+        else:
+            last_login_update_obj = UserUpdate(last_login=last_login)
+            await repo.update(
+                item.id,
+                last_login_update_obj.to_update_dict(),
+            )
 
         return item
 
@@ -96,25 +96,16 @@ class OAuthService:
     async def _resolve_username(self, repo: Repo, email: str) -> str:
         username = email.split("@")[0]
 
-        i = 0
-        while True:
-            postfix = str(i) if i > 0 else ""
-            resolved_username = f"{username}{postfix}"
-            try:
-                await repo.get_by_username(resolved_username)
-            except UserNotFoundError:
-                return resolved_username
-
-            i += 1  # pragma: no cover
-
-            if i > MAX_ATTEMPTS:  # pragma: no cover
-                postfix = "".join(random.choices("0123456789", k=6))
-                resolved_username = f"{username}{postfix}"
-                try:
-                    await repo.get_by_username(resolved_username)
-                    raise Exception("something is wrong")
-                except UserNotFoundError:
-                    return resolved_username
+        # taken usernames are the prefix followed by digits only
+        taken = set(await repo.get_usernames_by_prefix(username))
+        if username not in taken:
+            return username
+
+        i = 1
+        while f"{username}{i}" in taken:
+            i += 1
+
+        return f"{username}{i}"
 
     async def add_oauth_account(
         self,
@@ -20,7 +20,7 @@ from fastapi_auth.models.password import (
     PasswordSetRequest,
     PasswordStatusResponse,
 )
-from fastapi_auth.models.user import User, UserUpdate
+from fastapi_auth.models.user import UserPrincipal, UserUpdate
 from fastapi_auth.repo import Repo
 
 
@@ -44,34 +44,37 @@ class PasswordService:
     async def get_status(
         self,
         repo: Repo,
-        user: User,
+        user: UserPrincipal,
     ) -> PasswordStatusResponse:
         item = await repo.get(user.id)
 
-        has_password = item.password is not None
+        has_password = await repo.get_password(item) is not None
         return PasswordStatusResponse(has_password=has_password)
 
-    async def set(self, repo: Repo, data_in: PasswordSetRequest, user: User) -> None:
+    async def set(
+        self, repo: Repo, data_in: PasswordSetRequest, user: UserPrincipal
+    ) -> None:
         item = await repo.get(user.id)
 
-        if item.password is not None:
+        if await repo.get_password(item) is not None:
             raise PasswordAlreadyExistsError
 
         await self._set(repo, item.id, data_in.password1)
 
     async def _set(self, repo: Repo, id: int, password: str) -> None:
-        password_hash = self._password_backend.hash(password)
+        password_hash = await self._password_backend.hash(password)
         update_user_obj = UserUpdate(password=password_hash).to_update_dict()
         await repo.update(id, update_user_obj)
 
     async def change(
-        self, repo: Repo, data_in: PasswordChangeRequest, user: User
+        self, repo: Repo, data_in: PasswordChangeRequest, user: UserPrincipal
     ) -> None:
         user_db = await repo.get(user.id)
-        if user_db.password is None:
+        password = await repo.get_password(user_db)
+        if password is None:
             raise PasswordNotSetError
 
-        if not self._password_backend.verify(data_in.old_password, user_db.password):
+        if not await self._password_backend.verify(data_in.old_password, password):
             raise InvalidPasswordError
 
         await self._set(repo, user.id, data_in.password1)
@@ -0,0 +1,112 @@
+import asyncio
+from typing import AsyncIterator, Callable, Optional
+
+import pytest
+
+from fastapi_auth.backend.authorization.cache import AuthorizationStateCache
+from fastapi_auth.jwt import TokenParams
+from fastapi_auth.repo import AuthorizationState, Repo
+from tests.mocks import MockCacheClient
+
+pytestmark = pytest.mark.asyncio
+
+
+class PubSubCacheClient(MockCacheClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.connecting = asyncio.Event()
+        self.confirm = asyncio.Event()
+        self.confirmed = asyncio.Event()
+        self.messages: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    async def subscribe(
+        self,
+        channel: str,
+        on_subscribe: Optional[Callable[[], None]] = None,
+    ) -> AsyncIterator[str]:
+        self.connecting.set()
+        await self.confirm.wait()
+        self.confirm.clear()
+        if on_subscribe is not None:
+            on_subscribe()
+        self.confirmed.set()
+
+        while True:
+            message = await self.messages.get()
+            if message is None:
+                raise ConnectionError
+
+            yield message
+
+
+@pytest.fixture
+async def state_cache():
+    state_cache = AuthorizationStateCache(ttl=30)
+    yield state_cache
+    await state_cache.shutdown()
+
+
+async def test_get_state_is_cached(
+    mock_repo: Repo,
+    state_cache: AuthorizationStateCache,
+):
+    state = await state_cache.get_state(mock_repo, 2)
+    assert not state.banned
+
+    await mock_repo.cache.set(f"{mock_repo.ban_key_prefix}:2", 1, ex=60)
+    assert not (await state_cache.get_state(mock_repo, 2)).banned
+
+
+async def test_invalidate(mock_repo: Repo, state_cache: AuthorizationStateCache):
+    await state_cache.get_state(mock_repo, 2)
+    await mock_repo.cache.set(f"{mock_repo.ban_key_prefix}:2", 1, ex=60)
+
+    state_cache.invalidate("user:2")
+    assert (await state_cache.get_state(mock_repo, 2)).banned
+
+
+async def test_invalidate_during_fetch_is_not_cached(
+    mock_repo: Repo,
+    state_cache: AuthorizationStateCache,
+):
+    get_authorization_state = mock_repo.get_authorization_state
+
+    async def get_stale_state(id: int) -> AuthorizationState:
+        state = await get_authorization_state(id)
+        # the ban lands after the read but before the result is cached
+        await mock_repo.cache.set(f"{mock_repo.ban_key_prefix}:{id}", 1, ex=60)
+        state_cache.invalidate(f"user:{id}")
+        return state
+
+    mock_repo.get_authorization_state = get_stale_state  # type: ignore
+    assert not (await state_cache.get_state(mock_repo, 2)).banned
+
+    mock_repo.get_authorization_state = get_authorization_state  # type: ignore
+    assert (await state_cache.get_state(mock_repo, 2)).banned
+
+
+async def test_invalidate_during_reconnect(
+    mock_db, state_cache: AuthorizationStateCache
+):
+    cache = PubSubCacheClient()
+    repo = Repo(mock_db, cache, TokenParams())
+    state_cache._reconnect_interval = 0
+
+    await state_cache.get_state(repo, 2)
+    await cache.connecting.wait()
+    cache.confirm.set()
+    await cache.confirmed.wait()
+
+    # drop the connection, the next subscription is not confirmed yet
+    cache.connecting.clear()
+    cache.confirmed.clear()
+    await cache.messages.put(None)
+    await cache.connecting.wait()
+
+    assert not (await state_cache.get_state(repo, 2)).banned
+    # published before the server confirms, so the message never arrives
+    await cache.set(f"{repo.ban_key_prefix}:2", 1, ex=60)
+
+    cache.confirm.set()
+    await cache.confirmed.wait()
+    assert (await state_cache.get_state(repo, 2)).banned
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+try:
+    import aioredis  # noqa: F401
+except (ImportError, TypeError):  # aioredis 2 does not import on Python 3.11
+    pytest.skip("aioredis is not available", allow_module_level=True)
+
+fakeredis = pytest.importorskip("fakeredis.aioredis")
+
+from fastapi_auth.backend.cache.redis import RedisClient  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def redis_client():
+    yield RedisClient(fakeredis.FakeRedis())
+
+
+async def test_fixed_window(redis_client: RedisClient):
+    limits = [await redis_client.rate_limit("k", "t", 3, 60, 0) for _ in range(3)]
+    assert [limit.reached for limit in limits] == [False, False, True]
+    assert limits[0].remaining == 1
+    assert 0 < limits[2].retry_after <= 60
+    assert 0 < await redis_client._conn.ttl("k") <= 60
+
+
+async def test_fixed_window_timeout(redis_client: RedisClient):
+    for _ in range(3):
+        limit = await redis_client.rate_limit("k", "t", 3, 60, 120)
+
+    assert limit.reached
+    assert limit.retry_after == 120
+    assert await redis_client._conn.get("k") is None
+    assert (await redis_client.rate_limit("k", "t", 3, 60, 120)).reached
+
+
+async def test_sliding_window(redis_client: RedisClient):
+    for _ in range(2):
+        limit = await redis_client.rate_limit("k", "t", 3, 1, 0, sliding=True)
+        assert not limit.reached
+
+    limit = await redis_client.rate_limit("k", "t", 3, 1, 0, sliding=True)
+    assert limit.reached
+    assert limit.retry_after == 1
+
+    await asyncio.sleep(1.1)
+    limit = await redis_client.rate_limit("k", "t", 3, 1, 0, sliding=True)
+    assert not limit.reached
+    assert 0 < await redis_client._conn.pttl("k") <= 1000
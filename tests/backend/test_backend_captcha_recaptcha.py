@@ -0,0 +1,67 @@
+from typing import Any, List
+
+import pytest
+from httpx import AsyncClient, MockTransport, Request, Response
+
+from fastapi_auth.backend.captcha import recaptcha
+from fastapi_auth.backend.captcha.recaptcha import RecaptchaClient
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def clients(monkeypatch: pytest.MonkeyPatch):
+    clients: List[AsyncClient] = []
+    requests: List[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, json={"success": b"response=ok" in request.content})
+
+    def create_client(**kwargs: Any) -> AsyncClient:
+        client = AsyncClient(transport=MockTransport(handler), **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(recaptcha, "AsyncClient", create_client)
+    yield clients, requests
+
+
+async def test_client_is_shared(clients):
+    created, requests = clients
+    captcha_client = RecaptchaClient("secret")
+
+    assert not await captcha_client.validate(None)
+    assert created == []
+
+    assert await captcha_client.validate("ok")
+    assert not await captcha_client.validate("wrong")
+
+    assert len(created) == 1
+    assert len(requests) == 2
+    assert all(
+        request.url == "https://www.google.com/recaptcha/api/siteverify"
+        for request in requests
+    )
+
+    await captcha_client.shutdown()
+    assert created[0].is_closed
+
+
+async def test_startup_shutdown(clients):
+    created, _ = clients
+    captcha_client = RecaptchaClient("secret")
+
+    await captcha_client.startup()
+    await captcha_client.startup()
+    assert len(created) == 1
+
+    await captcha_client.shutdown()
+    await captcha_client.shutdown()
+    assert created[0].is_closed
+
+    # a validate after shutdown opens a new client
+    assert await captcha_client.validate("ok")
+    assert len(created) == 2
+    assert not created[1].is_closed
+    await captcha_client.shutdown()
@@ -0,0 +1,180 @@
+from datetime import datetime, timezone
+from typing import Any, List
+
+import pytest
+
+from fastapi_auth.backend.db.postgres import (
+    INDEXES,
+    USER_UPDATE_COLUMNS,
+    PostgresClient,
+    create_indexes,
+    q,
+)
+from fastapi_auth.models.user import UserFilter
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime.now(timezone.utc)
+
+
+def create_row(id: int, oauth_provider: Any = None) -> dict:
+    return {
+        "id": id,
+        "email": f"example{id}@gmail.com",
+        "username": f"user{id}",
+        "password": None,
+        "active": True,
+        "verified": True,
+        "created_at": NOW,
+        "last_login": NOW,
+        "oauth_provider": oauth_provider,
+        "oauth_sid": "sid" if oauth_provider else None,
+        "roles": ["admin"],
+        "permissions": [],
+    }
+
+
+class FakeConnection:
+    def __init__(self, rows: List[dict]) -> None:
+        self.rows = rows
+        self.calls: list = []
+
+    async def fetch(self, query: str, *args: Any) -> List[dict]:
+        self.calls.append((query, args))
+        return self.rows
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        self.calls.append((query, args))
+        return self.rows[0]["id"] if self.rows else None
+
+
+@pytest.mark.parametrize(
+    "method, query, values",
+    [
+        ("get_many", q.get_users_by_ids, [1, 2]),
+        ("get_many_by_username", q.get_users_by_usernames, ["user1", "user2"]),
+        ("get_many_by_email", q.get_users_by_emails, ["example1@gmail.com"]),
+    ],
+)
+async def test_get_many(method: str, query: str, values: list):
+    conn = FakeConnection([create_row(1), create_row(2, "google")])
+    client = PostgresClient(conn)  # type: ignore
+
+    users = await getattr(client, method)(values)
+
+    assert conn.calls == [(query, (values,))]
+    assert [user.id for user in users] == [1, 2]
+    assert users[0].oauth is None
+    assert users[1].oauth.provider == "google"
+
+
+@pytest.mark.parametrize("column", USER_UPDATE_COLUMNS)
+async def test_update_column(column: str):
+    conn = FakeConnection([create_row(1)])
+    client = PostgresClient(conn)  # type: ignore
+
+    assert await client.update(1, {column: "value"})
+    assert conn.calls == [
+        (q.update_user_by_id.format(f"{column} = $2"), (1, "value")),
+    ]
+
+
+async def test_update_query():
+    conn = FakeConnection([])
+    client = PostgresClient(conn)  # type: ignore
+
+    assert not await client.update(1, {"verified": True, "username": "user"})
+
+    query, args = conn.calls[0]
+    # columns follow USER_UPDATE_COLUMNS, not the order of the dict
+    assert query == (
+        "UPDATE   auth_user SET   username = $2, verified = $3 WHERE   id = $1"
+        " RETURNING id;"
+    )
+    assert args == (1, "user", True)
+
+
+async def test_update_rejects_unknown_columns():
+    conn = FakeConnection([create_row(1)])
+    client = PostgresClient(conn)  # type: ignore
+
+    with pytest.raises(ValueError, match="id, roles"):
+        await client.update(1, {"email": "example@gmail.com", "id": 2, "roles": []})
+
+    assert conn.calls == []
+
+
+async def test_update_nothing():
+    conn = FakeConnection([create_row(1)])
+    client = PostgresClient(conn)  # type: ignore
+
+    assert await client.update(1, {})
+    assert conn.calls == [(q.get_user_id_by_id, (1,))]
+
+
+class IndexConnection:
+    def __init__(self, in_transaction: bool) -> None:
+        self.in_transaction = in_transaction
+        self.queries: List[str] = []
+
+    def is_in_transaction(self) -> bool:
+        return self.in_transaction
+
+    async def execute(self, query: str) -> str:
+        self.queries.append(query)
+        return ""
+
+
+async def test_create_indexes():
+    conn = IndexConnection(in_transaction=False)
+    await create_indexes(conn)  # type: ignore
+
+    assert conn.queries == list(INDEXES)
+    assert all("CONCURRENTLY IF NOT EXISTS" in query for query in conn.queries)
+
+
+async def test_create_indexes_in_transaction():
+    conn = IndexConnection(in_transaction=True)
+    with pytest.raises(RuntimeError):
+        await create_indexes(conn)  # type: ignore
+
+    assert conn.queries == []
+
+
+@pytest.mark.parametrize(
+    "filters, after, conditions, args",
+    [
+        ({}, None, ["TRUE", "LIMIT $1"], (10,)),
+        ({"search": ""}, None, ["TRUE", "LIMIT $1"], (10,)),
+        (
+            {"role": "admin", "active": True},
+            None,
+            ["u.active = $1 AND EXISTS", "r.name = $2)", "LIMIT $3"],
+            (True, "admin", 10),
+        ),
+        (
+            {"search": "ex", "verified": False},
+            (NOW, 5),
+            [
+                "u.verified = $1 AND ((u.username ~>=~ $2",
+                "(u.created_at, u.id) < ($3, $4)",
+                "LIMIT $5",
+            ],
+            (False, "ex", NOW, 5, 10),
+        ),
+    ],
+)
+async def test_list_users_query(
+    filters: dict, after: Any, conditions: List[str], args: tuple
+):
+    conn = FakeConnection([create_row(1)])
+    client = PostgresClient(conn)  # type: ignore
+
+    users = await client.list_users(UserFilter(**filters), after, 10)
+
+    query, query_args = conn.calls[0]
+    for condition in conditions:
+        assert condition in query
+    assert query_args == args
+    assert "password" not in query
+    assert users[0].password is None
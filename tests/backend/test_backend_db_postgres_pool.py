@@ -0,0 +1,138 @@
+from contextlib import asynccontextmanager
+from typing import Any, List
+
+import pytest
+from asyncpg import Connection
+
+from fastapi_auth.backend.db.postgres import q
+from fastapi_auth.backend.db.postgres_pool import (
+    HOT_QUERIES,
+    PoolExecutor,
+    PreparedConnection,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield
+
+    async def fetch(self, query: str, *args: Any) -> list:
+        self.queries.append(query)
+        return []
+
+    async def fetchrow(self, query: str, *args: Any) -> None:
+        self.queries.append(query)
+
+    async def fetchval(self, query: str, *args: Any) -> None:
+        self.queries.append(query)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        self.queries.append(query)
+        return ""
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.connections: List[FakeConnection] = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        conn = FakeConnection()
+        self.connections.append(conn)
+        yield conn
+
+    def get_size(self) -> int:
+        return 10
+
+    def get_idle_size(self) -> int:
+        return 10
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def pool():
+    yield FakePool()
+
+
+@pytest.fixture
+def executor(pool: FakePool):
+    executor = PoolExecutor("postgresql://localhost/test")
+    executor._pool = pool  # type: ignore
+    yield executor
+
+
+async def test_acquire_per_call(pool: FakePool, executor: PoolExecutor):
+    await executor.fetchrow("a")
+    await executor.execute("b")
+
+    assert [conn.queries for conn in pool.connections] == [["a"], ["b"]]
+
+    stats = executor.stats()
+    assert stats.checkouts == 2
+    assert (stats.size, stats.idle) == (10, 10)
+    assert stats.max_wait_time >= stats.avg_wait_time >= 0
+
+
+async def test_transaction_pins_connection(pool: FakePool, executor: PoolExecutor):
+    async with executor.transaction() as conn:
+        await executor.fetch("a")
+        async with executor.transaction() as nested:
+            assert nested is conn
+            await executor.fetchval("b")
+
+    await executor.fetch("c")
+
+    assert [conn.queries for conn in pool.connections] == [["a", "b"], ["c"]]
+    assert pool.connections[0].transactions == 2
+
+
+class FakeStatement:
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.calls: List[tuple] = []
+
+    async def fetchrow(self, *args: Any) -> tuple:
+        self.calls.append(args)
+        return (self.query, args)
+
+
+class FakePreparedConnection(PreparedConnection):
+    def __init__(self) -> None:
+        self._statements = {}
+
+    def __del__(self) -> None:
+        pass  # there is no protocol to close
+
+    async def prepare(self, query: str) -> FakeStatement:  # type: ignore
+        return FakeStatement(query)
+
+
+async def test_prepare_cached(monkeypatch: pytest.MonkeyPatch):
+    async def fetchrow(self, query: str, *args: Any, **kwargs: Any) -> tuple:
+        return ("unprepared", query)
+
+    monkeypatch.setattr(Connection, "fetchrow", fetchrow)
+    conn = FakePreparedConnection()
+    await conn.prepare_cached(HOT_QUERIES)
+
+    assert list(conn._statements) == list(HOT_QUERIES)
+    assert await conn.fetchrow(q.get_user_by_id, 1) == (q.get_user_by_id, (1,))
+    assert await conn.fetchrow(q.delete_user_by_id, 1) == (
+        "unprepared",
+        q.delete_user_by_id,
+    )
+    # a timeout or record_class goes through the regular path
+    assert await conn.fetchrow(q.get_user_by_id, 1, timeout=1) == (
+        "unprepared",
+        q.get_user_by_id,
+    )
@@ -0,0 +1,96 @@
+from contextlib import asynccontextmanager
+from typing import Any, List
+
+import pytest
+
+from fastapi_auth.backend.db.postgres import q
+from fastapi_auth.backend.db.postgres_routing import (
+    CACHED_USER_QUERIES,
+    LIST_USERS_PREFIX,
+    PRIMARY_READ_QUERIES,
+    RoutingExecutor,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeExecutor:
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield None
+
+    async def fetch(self, query: str, *args: Any) -> list:
+        self.queries.append(query)
+        return []
+
+    async def fetchrow(self, query: str, *args: Any) -> None:
+        self.queries.append(query)
+
+    async def fetchval(self, query: str, *args: Any) -> None:
+        self.queries.append(query)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        self.queries.append(query)
+        return ""
+
+
+@pytest.fixture
+def primary():
+    yield FakeExecutor()
+
+
+@pytest.fixture
+def replica():
+    yield FakeExecutor()
+
+
+async def test_reads_go_to_replica(primary: FakeExecutor, replica: FakeExecutor):
+    executor = RoutingExecutor(primary, [replica])  # type: ignore
+    await executor.fetchrow(q.get_user_by_id, 1)
+    await executor.fetch(f"{LIST_USERS_PREFIX} WHERE active", 50)
+
+    assert primary.queries == []
+    assert len(replica.queries) == 2
+
+
+async def test_write_sticks_to_primary(primary: FakeExecutor, replica: FakeExecutor):
+    executor = RoutingExecutor(primary, [replica])  # type: ignore
+    await executor.execute(q.update_last_login_bulk, [], [])
+    await executor.fetchrow(q.get_user_by_id, 1)
+
+    assert primary.queries == [q.update_last_login_bulk, q.get_user_by_id]
+    assert replica.queries == []
+
+
+async def test_role_graph_reload_reads_primary(
+    primary: FakeExecutor,
+    replica: FakeExecutor,
+):
+    executor = RoutingExecutor(primary, [replica])  # type: ignore
+    await executor.fetch(q.get_all_roles_and_permissions)
+    await executor.fetchrow(q.get_user_by_id, 1)
+
+    assert primary.queries == [q.get_all_roles_and_permissions]
+    assert replica.queries == [q.get_user_by_id]
+    assert not executor.sticky
+
+
+async def test_cached_user_lookups_read_primary(
+    primary: FakeExecutor,
+    replica: FakeExecutor,
+):
+    executor = RoutingExecutor(
+        primary,  # type: ignore
+        [replica],  # type: ignore
+        PRIMARY_READ_QUERIES | CACHED_USER_QUERIES,
+    )
+    await executor.fetchrow(q.get_user_by_username, "admin")
+    await executor.fetchval(q.get_user_password_by_id, 1)
+    await executor.fetch(q.get_users_by_ids, [1])
+
+    assert primary.queries == [q.get_user_by_username, q.get_user_password_by_id]
+    assert replica.queries == [q.get_users_by_ids]
+    assert not executor.sticky
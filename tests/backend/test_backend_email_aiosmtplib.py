@@ -0,0 +1,92 @@
+import asyncio
+from email.message import EmailMessage
+from typing import List
+
+import pytest
+
+from fastapi_auth.backend.email.aiosmtplib import AIOSMTPLibEmailClient
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeSMTP:
+    def __init__(self, client: "FakeEmailClient") -> None:
+        self._client = client
+        self.is_connected = True
+
+    async def send_message(self, msg: EmailMessage) -> None:
+        if self._client.fail:
+            self._client.fail -= 1
+            self.is_connected = False
+            raise ConnectionError
+
+        self._client.sent.append(msg["To"])
+
+    async def quit(self) -> None:
+        self.is_connected = False
+
+    def close(self) -> None:
+        self.is_connected = False
+
+
+class FakeEmailClient(AIOSMTPLibEmailClient):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            "localhost",
+            "username",
+            "password",
+            465,
+            "display_name",
+            *(["{}"] * 10),
+            **kwargs,
+        )
+        self.connects = 0
+        self.fail = 0
+        self.sent: List[str] = []
+
+    async def _connect(self) -> FakeSMTP:  # type: ignore
+        self.connects += 1
+        return FakeSMTP(self)
+
+
+async def test_send_email():
+    client = FakeEmailClient(workers=1)
+    await client.request_verification("example1@gmail.com", "token")
+    await client.request_password_reset("example2@gmail.com", "token")
+    await client.shutdown()
+
+    assert client.sent == ["example1@gmail.com", "example2@gmail.com"]
+    assert client.connects == 1
+
+
+async def test_queue_full_drops():
+    client = FakeEmailClient(workers=1, queue_size=1)
+    await client.startup()
+    await client.request_verification("example1@gmail.com", "token")
+    await client.request_verification("example2@gmail.com", "token")
+
+    assert client.dropped == 1
+
+    await client.shutdown()
+
+    assert client.sent == ["example1@gmail.com"]
+
+
+async def test_reconnect_immediately():
+    client = FakeEmailClient(workers=1, backoff=60)
+    client.fail = 1
+    await client.request_verification("example1@gmail.com", "token")
+    await asyncio.wait_for(client.shutdown(), 1)
+
+    assert client.sent == ["example1@gmail.com"]
+    assert client.connects == 2
+
+
+async def test_retries_exhausted():
+    client = FakeEmailClient(workers=1, retries=2, backoff=0)
+    client.fail = 3
+    await client.request_verification("example1@gmail.com", "token")
+    await client.request_verification("example2@gmail.com", "token")
+    await client.shutdown()
+
+    assert client.sent == ["example2@gmail.com"]
@@ -0,0 +1,131 @@
+import time
+
+import jwt
+import pytest
+
+from fastapi_auth.backend.jwt.default import JWTBackend
+from fastapi_auth.backend.jwt.precompiled import PrecompiledJWTBackend
+from fastapi_auth.errors import TokenDecodingError
+from fastapi_auth.jwt import JWT, TokenParams
+from tests.mocks import MockJWTBackend
+
+pytestmark = pytest.mark.asyncio
+
+SECRET = "secret" * 6
+
+PAYLOAD = {"id": 1, "username": "admin", "roles": ["admin"]}
+
+
+def create_backend(cache_size: int = 0) -> JWTBackend:
+    return JWTBackend("HS256", SECRET, SECRET, cache_size=cache_size)
+
+
+async def test_decode_token():
+    backend = create_backend()
+    payload = backend.decode_token(backend.create_token("access", PAYLOAD, 60))
+
+    assert payload["id"] == 1
+    assert payload["type"] == "access"
+    assert backend.cache_info()["size"] == 0
+
+
+@pytest.mark.parametrize("cache_size", [0, 2])
+async def test_decode_invalid_token(cache_size: int):
+    backend = create_backend(cache_size)
+    expired = jwt.encode({**PAYLOAD, "exp": int(time.time()) - 1}, SECRET)
+
+    for token in ("", "invalid", expired):
+        with pytest.raises(TokenDecodingError):
+            backend.decode_token(token)
+
+    assert backend.cache_info()["size"] == 0
+
+
+async def test_cache_hit():
+    backend = create_backend(2)
+    token = backend.create_token("access", PAYLOAD, 60)
+
+    payload = backend.decode_token(token)
+    payload["id"] = 2
+    assert backend.decode_token(token)["id"] == 1
+
+    assert backend.cache_info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+async def test_cache_is_lru():
+    backend = create_backend(2)
+    tokens = [
+        backend.create_token("access", {**PAYLOAD, "id": id}, 60) for id in range(3)
+    ]
+
+    backend.decode_token(tokens[0])
+    backend.decode_token(tokens[1])
+    backend.decode_token(tokens[0])
+    backend.decode_token(tokens[2])
+    assert backend.cache_info()["size"] == 2
+
+    backend.decode_token(tokens[0])
+    assert backend.hits == 2
+    backend.decode_token(tokens[1])
+    assert backend.misses == 4
+
+
+async def test_cached_token_expires(monkeypatch: pytest.MonkeyPatch):
+    backend = create_backend(2)
+    token = backend.create_token("access", PAYLOAD, 60)
+    backend.decode_token(token)
+
+    # past exp the cached payload is not used, the token is verified again
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    backend.decode_token(token)
+
+    assert backend.hits == 0
+    assert backend.misses == 2
+
+
+async def test_clear_cache():
+    backend = create_backend(2)
+    backend.decode_token(backend.create_token("access", PAYLOAD, 60))
+    backend.clear_cache()
+
+    assert backend.cache_info()["size"] == 0
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        JWTBackend("HS256", SECRET, SECRET),
+        PrecompiledJWTBackend("HS256", SECRET, SECRET),
+        MockJWTBackend(),
+    ],
+)
+async def test_create_token_pair_does_not_mutate_payload(backend):
+    payload = dict(PAYLOAD)
+    backend.create_token("access", payload, 60)
+    backend.create_token_pair(payload, 60, 120)
+    backend.create_tokens_bulk([payload], 60, 120)
+
+    assert payload == PAYLOAD
+
+
+async def test_create_token_pair():
+    backend = create_backend()
+    access_token, refresh_token = backend.create_token_pair(PAYLOAD, 60, 120)
+    access = backend.decode_token(access_token)
+    refresh = backend.decode_token(refresh_token)
+
+    assert (access["type"], refresh["type"]) == ("access", "refresh")
+    assert access["iat"] == refresh["iat"]
+    assert refresh["exp"] - access["exp"] == 60
+
+
+async def test_create_tokens_bulk():
+    auth_jwt = JWT(create_backend(), TokenParams())
+    payloads = [{**PAYLOAD, "id": id} for id in range(3)]
+    tokens = auth_jwt.create_tokens_bulk(payloads)
+
+    assert len(tokens) == 3
+    for id, (access_token, refresh_token) in enumerate(tokens):
+        assert auth_jwt.decode_token(access_token)["id"] == id
+        assert auth_jwt.decode_token(refresh_token)["type"] == "refresh"
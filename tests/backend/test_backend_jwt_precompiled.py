@@ -0,0 +1,84 @@
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from fastapi_auth.backend.jwt.default import JWTBackend
+from fastapi_auth.backend.jwt.precompiled import PrecompiledJWTBackend
+from fastapi_auth.errors import TokenDecodingError
+
+pytestmark = pytest.mark.asyncio
+
+PRIVATE_KEY = Ed25519PrivateKey.generate()
+PUBLIC_KEY = PRIVATE_KEY.public_key()
+
+PAYLOAD = {"id": 1, "username": "admin", "roles": ["admin"]}
+
+
+@pytest.fixture
+def backend():
+    yield PrecompiledJWTBackend("EdDSA", PRIVATE_KEY, PUBLIC_KEY)
+
+
+@pytest.fixture
+def pyjwt_backend():
+    yield JWTBackend("EdDSA", PRIVATE_KEY, PUBLIC_KEY)
+
+
+async def test_compatible_with_pyjwt(
+    backend: PrecompiledJWTBackend,
+    pyjwt_backend: JWTBackend,
+):
+    token = backend.create_token("access", PAYLOAD, 60)
+    payload = jwt.decode(token, PUBLIC_KEY, algorithms=["EdDSA"])
+    assert payload == {
+        **PAYLOAD,
+        "type": "access",
+        "iat": payload["iat"],
+        "exp": payload["iat"] + 60,
+    }
+    assert jwt.get_unverified_header(token) == {"alg": "EdDSA", "typ": "JWT"}
+
+    token = pyjwt_backend.create_token("access", PAYLOAD, 60)
+    assert backend.decode_token(token) == pyjwt_backend.decode_token(token)
+
+
+async def test_reserved_claims_are_replaced(backend: PrecompiledJWTBackend):
+    token = backend.create_token("access", {**PAYLOAD, "type": "x", "exp": 1}, 60)
+    payload = backend.decode_token(token)
+
+    assert payload["type"] == "access"
+    assert payload["exp"] == payload["iat"] + 60
+
+
+async def test_other_header_is_decoded_by_pyjwt(backend: PrecompiledJWTBackend):
+    token = jwt.encode(PAYLOAD, PRIVATE_KEY, algorithm="EdDSA", headers={"kid": "1"})
+    assert backend.decode_token(token) == PAYLOAD
+
+
+async def test_invalid_tokens(backend: PrecompiledJWTBackend):
+    token = backend.create_token("access", PAYLOAD, 60)
+    other = PrecompiledJWTBackend(
+        "EdDSA", Ed25519PrivateKey.generate(), PUBLIC_KEY
+    ).create_token("access", PAYLOAD, 60)
+    expired = backend.create_token("access", PAYLOAD, -1)
+    not_yet_valid = backend._sign({**PAYLOAD, "nbf": int(time.time()) + 60})
+    float_exp = backend._sign({**PAYLOAD, "exp": time.time() + 60})
+
+    for invalid in (token[:-2], other, expired, not_yet_valid, float_exp, "a.b.c"):
+        with pytest.raises(TokenDecodingError):
+            backend.decode_token(invalid)
+
+
+async def test_create_tokens_bulk(backend: PrecompiledJWTBackend):
+    tokens = backend.create_tokens_bulk([PAYLOAD, {**PAYLOAD, "id": 2}], 60, 120)
+
+    assert len(tokens) == 2
+    for id, (access_token, refresh_token) in enumerate(tokens, 1):
+        access = backend.decode_token(access_token)
+        refresh = backend.decode_token(refresh_token)
+        assert access["id"] == refresh["id"] == id
+        assert access["iat"] == refresh["iat"]
+        assert refresh["exp"] - access["exp"] == 60
+        assert (access["type"], refresh["type"]) == ("access", "refresh")
@@ -0,0 +1,94 @@
+import jwt
+import pytest
+from httpx import (
+    AsyncClient,
+    ConnectError,
+    MockTransport,
+    ReadTimeout,
+    Request,
+    Response,
+)
+
+from fastapi_auth.backend.oauth import FacebookOAuthProvider, GoogleOAuthProvider
+
+pytestmark = pytest.mark.asyncio
+
+ID_TOKEN = jwt.encode({"sub": "1", "email": "example1@gmail.com"}, "secret")
+
+
+def create_client(responses):
+    requests = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    return AsyncClient(transport=MockTransport(handler)), requests
+
+
+async def test_code_exchange_retries_connect_error():
+    client, requests = create_client(
+        [
+            ConnectError("refused"),
+            Response(200, json={"id_token": ID_TOKEN}),
+        ]
+    )
+    provider = GoogleOAuthProvider("id", "secret", http_client=client, backoff=0)
+
+    assert await provider.get_user_data("/redirect", "code") == (
+        "1",
+        "example1@gmail.com",
+    )
+    assert len(requests) == 2
+
+
+async def test_code_exchange_does_not_retry_read_timeout():
+    client, requests = create_client(
+        [
+            ReadTimeout("slow"),
+            Response(200, json={"id_token": ID_TOKEN}),
+        ]
+    )
+    provider = GoogleOAuthProvider("id", "secret", http_client=client, backoff=0)
+
+    with pytest.raises(ReadTimeout):
+        await provider.get_user_data("/redirect", "code")
+
+    assert len(requests) == 1
+
+
+async def test_code_exchange_does_not_retry_status():
+    client, requests = create_client(
+        [
+            Response(503, json={"error": "unavailable"}),
+            Response(200, json={}),
+        ]
+    )
+    provider = FacebookOAuthProvider("id", "secret", http_client=client, backoff=0)
+    await provider.get_user_data("/redirect", "code")
+
+    assert len(requests) == 2
+    assert requests[0].url.path == "/v8.0/oauth/access_token"
+    assert requests[1].url.path == "/me"
+
+
+async def test_idempotent_request_retries():
+    client, requests = create_client(
+        [
+            Response(200, json={"access_token": "token"}),
+            ReadTimeout("slow"),
+            Response(503),
+            Response(200, json={"user_id": "1", "email": "example1@gmail.com"}),
+        ]
+    )
+    provider = FacebookOAuthProvider("id", "secret", http_client=client, backoff=0)
+
+    assert await provider.get_user_data("/redirect", "code") == (
+        "1",
+        "example1@gmail.com",
+    )
+    assert len(requests) == 4
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from fastapi_auth.backend.password.passlib import PasslibPasswordBackend
+from fastapi_auth.errors import PasswordBackendOverloadedError
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def password_backend():
+    password_backend = PasslibPasswordBackend(["pbkdf2_sha256"], pool_size=1)
+    yield password_backend
+    await password_backend.shutdown()
+
+
+async def test_hash_and_verify(password_backend: PasslibPasswordBackend):
+    password_hash = await password_backend.hash("123456")
+
+    assert await password_backend.verify("123456", password_hash)
+    assert not await password_backend.verify("1234567", password_hash)
+    assert password_backend.hash_stats.calls == 1
+    assert password_backend.verify_stats.calls == 2
+    assert password_backend.verify_stats.max_time > 0
+    assert password_backend._pending == 0
+
+
+async def test_overloaded():
+    password_backend = PasslibPasswordBackend(["pbkdf2_sha256"], max_pending=0)
+
+    with pytest.raises(PasswordBackendOverloadedError):
+        await password_backend.hash("123456")
+
+    assert password_backend.rejected == 1
+    assert password_backend._executor is None
+
+
+async def test_cancelled_call_stays_pending(password_backend: PasslibPasswordBackend):
+    task = asyncio.ensure_future(password_backend.hash("123456"))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # the worker is still hashing
+    assert password_backend._pending == 1
+
+    while password_backend._pending:
+        await asyncio.sleep(0.01)
+
+    assert password_backend.hash_stats.calls == 1
+
+
+async def test_shutdown_does_not_block(password_backend: PasslibPasswordBackend):
+    task = asyncio.ensure_future(password_backend.hash("123456"))
+    await asyncio.sleep(0)
+
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.ensure_future(tick())
+    await password_backend.shutdown()
+    ticker.cancel()
+
+    # the loop kept running while the worker finished the hash
+    assert ticks > 1
+    assert password_backend._executor is None
+    assert await password_backend.verify("123456", await task)
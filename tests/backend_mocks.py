@@ -3,7 +3,7 @@ import pytest
 from fastapi_auth.backend.abc.cache import AbstractCacheClient
 from fastapi_auth.backend.abc.db import AbstractDatabaseClient
 from fastapi_auth.backend.abc.jwt import AbstractJWTBackend
-from fastapi_auth.jwt import JWT
+from fastapi_auth.jwt import JWT, TokenParams
 from fastapi_auth.repo import Repo
 from tests.mocks import (
     MockAuthorization,
@@ -27,7 +27,7 @@ def mock_jwt_backend():
 
 @pytest.fixture
 def mock_jwt(mock_jwt_backend: AbstractJWTBackend):
-    yield JWT(mock_jwt_backend, 60, 60)
+    yield JWT(mock_jwt_backend, TokenParams())
 
 
 @pytest.fixture
@@ -55,7 +55,7 @@ def mock_repo(
     mock_db: AbstractDatabaseClient,
     mock_cache: AbstractCacheClient,
 ):
-    yield Repo(mock_db, mock_cache, 60, 60)
+    yield Repo(mock_db, mock_cache, TokenParams())
 
 
 @pytest.fixture
@@ -8,9 +8,7 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from fastapi_auth import FastAPIAuthApp
 from fastapi_auth.backend.abc.authorization import AbstractAuthorization
-from fastapi_auth.backend.abc.cache import AbstractCacheClient
 from fastapi_auth.backend.abc.captcha import AbstractCaptchaClient
-from fastapi_auth.backend.abc.db import AbstractDatabaseClient
 from fastapi_auth.backend.abc.email import AbstractEmailClient
 from fastapi_auth.backend.abc.jwt import AbstractJWTBackend
 from fastapi_auth.backend.abc.oauth import AbstractOAuthProvider
@@ -19,7 +17,8 @@ from fastapi_auth.backend.abc.transport import AbstractTransport
 from fastapi_auth.backend.abc.validator import AbstractValidator
 from fastapi_auth.dependencies import admin_required, get_authenticated_user, get_user
 from fastapi_auth.jwt import TokenParams
-from fastapi_auth.models.user import Anonim, User
+from fastapi_auth.models.user import UserPrincipal
+from fastapi_auth.repo import Repo
 
 pytest_plugins = ["backend_mocks"]
 
@@ -33,8 +32,7 @@ def event_loop():
 
 @pytest.fixture
 def app(
-    mock_db: AbstractDatabaseClient,
-    mock_cache: AbstractCacheClient,
+    mock_repo: Repo,
     mock_jwt_backend: AbstractJWTBackend,
     mock_transport: AbstractTransport,
     mock_authorization: AbstractAuthorization,
@@ -51,12 +49,9 @@ def app(
     )
     auth_app = FastAPIAuthApp(
         app,
-        mock_db,
-        mock_cache,
+        lambda: mock_repo,
         mock_jwt_backend,
         TokenParams(),
-        60,
-        60,
         mock_transport,
         mock_authorization,
         mock_oauth_providers,
@@ -82,21 +77,22 @@ async def test_client(app: FastAPI):
 
 @pytest.fixture
 def mock_admin(app: FastAPI):
-    user = User(
-        **{
-            "id": 1,
-            "username": "admin",
-            "roles": ["admin"],
-            "iat": 1,
-            "exp": 1,
-            "type": "access",
+    user = UserPrincipal(
+        1,
+        "admin",
+        frozenset(["admin"]),
+        frozenset(),
+        1,
+        1,
+        "access",
+    )
+    app.dependency_overrides.update(
+        {
+            admin_required: lambda: None,
+            get_user: lambda: user,
+            get_authenticated_user: lambda: user,
         }
     )
-    app.dependency_overrides = {
-        admin_required: lambda: None,
-        get_user: lambda: user,
-        get_authenticated_user: lambda: user,
-    }
 
     yield user
 
@@ -111,119 +107,123 @@ def _raise_http_exception_401():
 
 @pytest.fixture
 def mock_user(app: FastAPI):
-    user = User(
-        **{
-            "id": 2,
-            "username": "user",
-            "roles": [],
-            "iat": 1,
-            "exp": 1,
-            "type": "access",
-        }
+    user = UserPrincipal(
+        2,
+        "user",
+        frozenset(),
+        frozenset(),
+        1,
+        1,
+        "access",
     )
 
-    app.dependency_overrides = {
-        admin_required: _raise_http_exception_403,
-        get_user: lambda: user,
-        get_authenticated_user: lambda: user,
-    }
+    app.dependency_overrides.update(
+        {
+            admin_required: _raise_http_exception_403,
+            get_user: lambda: user,
+            get_authenticated_user: lambda: user,
+        }
+    )
 
     yield user
 
 
 @pytest.fixture
 def mock_unverified_user(app: FastAPI):
-    user = User(
-        **{
-            "id": 4,
-            "username": "unverified",
-            "roles": [],
-            "iat": 1,
-            "exp": 1,
-            "type": "access",
+    user = UserPrincipal(
+        4,
+        "unverified",
+        frozenset(),
+        frozenset(),
+        1,
+        1,
+        "access",
+    )
+    app.dependency_overrides.update(
+        {
+            admin_required: _raise_http_exception_403,
+            get_user: lambda: user,
+            get_authenticated_user: lambda: user,
         }
     )
-    app.dependency_overrides = {
-        admin_required: _raise_http_exception_403,
-        get_user: lambda: user,
-        get_authenticated_user: lambda: user,
-    }
 
     yield user
 
 
 @pytest.fixture
 def mock_banned_user(app: FastAPI):
-    user = User(
-        **{
-            "id": 5,
-            "username": "banned",
-            "roles": [],
-            "iat": 1,
-            "exp": 1,
-            "type": "access",
+    user = UserPrincipal(
+        5,
+        "banned",
+        frozenset(),
+        frozenset(),
+        1,
+        1,
+        "access",
+    )
+    app.dependency_overrides.update(
+        {
+            admin_required: _raise_http_exception_401,
+            get_user: _raise_http_exception_401,
+            get_authenticated_user: _raise_http_exception_401,
         }
     )
-    app.dependency_overrides = {
-        admin_required: _raise_http_exception_401,
-        get_user: _raise_http_exception_401,
-        get_authenticated_user: _raise_http_exception_401,
-    }
 
     yield user
 
 
 @pytest.fixture
 def mock_social_user(app: FastAPI):
-    user = User(
-        **{
-            "id": 3,
-            "username": "social",
-            "roles": [],
-            "iat": 1,
-            "exp": 1,
-            "type": "access",
+    user = UserPrincipal(
+        3,
+        "social",
+        frozenset(),
+        frozenset(),
+        1,
+        1,
+        "access",
+    )
+    app.dependency_overrides.update(
+        {
+            admin_required: _raise_http_exception_403,
+            get_user: lambda: user,
+            get_authenticated_user: lambda: user,
         }
     )
-    app.dependency_overrides = {
-        admin_required: _raise_http_exception_403,
-        get_user: lambda: user,
-        get_authenticated_user: lambda: user,
-    }
 
     yield user
 
 
 @pytest.fixture
 def mock_social_user_with_password(app: FastAPI):
-    user = User(
-        **{
-            "id": 6,
-            "username": "social_with_password",
-            "roles": [],
-            "iat": 1,
-            "exp": 1,
-            "type": "access",
+    user = UserPrincipal(
+        6,
+        "social_with_password",
+        frozenset(),
+        frozenset(),
+        1,
+        1,
+        "access",
+    )
+    app.dependency_overrides.update(
+        {
+            admin_required: _raise_http_exception_403,
+            get_user: lambda: user,
+            get_authenticated_user: lambda: user,
         }
     )
-    app.dependency_overrides = {
-        admin_required: _raise_http_exception_403,
-        get_user: lambda: user,
-        get_authenticated_user: lambda: user,
-    }
 
     yield user
 
 
 @pytest.fixture
 def mock_anonim(app: FastAPI):
-    user = Anonim()
-    app.dependency_overrides[admin_required] = _raise_http_exception_403
-    app.dependency_overrides[get_user] = lambda: user
-    app.dependency_overrides[get_authenticated_user] = _raise_http_exception_401
-    app.dependency_overrides = {
-        admin_required: _raise_http_exception_403,
-        get_user: lambda: user,
-        get_authenticated_user: _raise_http_exception_401,
-    }
+    user = None
+    app.dependency_overrides.update(
+        {
+            admin_required: _raise_http_exception_403,
+            get_user: lambda: user,
+            get_authenticated_user: _raise_http_exception_401,
+        }
+    )
     yield user
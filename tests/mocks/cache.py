@@ -1,37 +1,106 @@
-from typing import Optional, Union
+import asyncio
+import time
+from typing import AsyncIterator, Callable, List, Optional, Union
 
-from fastapi_auth.backend.abc.cache import AbstractCacheClient
+from fastapi_auth.backend.abc.cache import AbstractCacheClient, RateLimit
 
 
 class MockCacheClient(AbstractCacheClient):
     def __init__(self) -> None:
         self.db: dict = {}
+        self.expires: dict = {}
+        self.offset: float = 0
+
+    def now(self) -> float:
+        return time.monotonic() + self.offset
+
+    def ttl(self, key: str) -> Optional[float]:
+        expires_at = self.expires.get(key)
+        if expires_at is None:
+            return None
+
+        return expires_at - self.now()
+
+    def _get(self, key: str):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= self.now():
+            self.db.pop(key, None)
+            self.expires.pop(key, None)
 
-    async def get(self, key: str) -> Optional[str]:
         return self.db.get(key)
 
+    async def get(self, key: str) -> Optional[str]:
+        return self._get(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self._get(key) for key in keys]
+
     async def delete(self, key: str) -> None:
         self.db.pop(key, None)
+        self.expires.pop(key, None)
 
     async def set(self, key: str, value: Union[str, bytes, int], ex: int) -> None:
         self.db[key] = value
+        self.expires[key] = self.now() + ex
 
     async def setnx(self, key: str, value: Union[str, bytes, int], ex: int) -> bool:
-        if self.db.get(key) is None:
-            self.db[key] = value
+        if self._get(key) is None:
+            await self.set(key, value, ex)
             return True
 
         return False
 
     async def incr(self, key: str) -> int:
-        v = self.db.get(key)
+        v = self._get(key)
         if v is None:
             self.db[key] = 1
             return 1
         else:
-            new_v = v + 1
+            new_v = int(v) + 1
             self.db[key] = new_v
             return new_v
 
     async def expire(self, key: str, ex: int) -> None:
+        if key in self.db:
+            self.expires[key] = self.now() + ex
+
+    async def rate_limit(
+        self,
+        key: str,
+        timeout_key: str,
+        rate: int,
+        interval: int,
+        timeout: int,
+        sliding: bool = False,
+    ) -> RateLimit:
+        blocked = self.ttl(timeout_key)
+        if self._get(timeout_key) is not None and blocked is not None:
+            return RateLimit(True, 0, int(blocked))
+
+        cur = await self.incr(key)
+        if self.ttl(key) is None:
+            await self.expire(key, interval)
+
+        if cur >= rate:
+            if timeout > 0:
+                await self.delete(key)
+                await self.set(timeout_key, 1, timeout)
+                return RateLimit(True, 0, timeout)
+
+            return RateLimit(True, 0, int(self.ttl(key)))  # type: ignore
+
+        return RateLimit(False, rate - cur - 1, 0)
+
+    async def publish(self, channel: str, message: str) -> None:
         pass
+
+    async def subscribe(
+        self,
+        channel: str,
+        on_subscribe: Optional[Callable[[], None]] = None,
+    ) -> AsyncIterator[str]:
+        if on_subscribe is not None:
+            on_subscribe()
+
+        await asyncio.Event().wait()
+        yield ""
@@ -1,9 +1,92 @@
 from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 
-from fastapi_auth.backend.abc.db import AbstractDatabaseClient
-from fastapi_auth.errors import UserNotFoundError
-from fastapi_auth.models.user import UserDB
-from fastapi_auth.types import UID
+from fastapi_auth.backend.abc.db import (
+    AbstractDatabaseClient,
+    AbstractDatabaseOAuthExtension,
+    AbstractDatabaseRolesExtension,
+)
+from fastapi_auth.errors import RoleNotFoundError
+from fastapi_auth.models.user import OAuthDB, RoleDB, UserCreate, UserDB, UserFilter
+
+
+class MockDatabaseOAuthExtension(AbstractDatabaseOAuthExtension):
+    def __init__(self, items: List[dict]) -> None:
+        self.items = items
+
+    async def get_by_user_id(self, user_id: int) -> Optional[OAuthDB]:
+        for item in self.items:
+            if item["user_id"] == user_id:
+                return OAuthDB(**item)
+
+        return None
+
+    async def create(self, user_id: int, provider: str, sid: str) -> None:
+        self.items.append({"user_id": user_id, "provider": provider, "sid": sid})
+
+    async def update_by_user_id(self, user_id: int, provider: str, sid: str) -> None:
+        await self.delete_by_user_id(user_id)
+        await self.create(user_id, provider, sid)
+
+    async def delete_by_user_id(self, user_id: int) -> None:
+        self.items[:] = [item for item in self.items if item["user_id"] != user_id]
+
+
+class MockDatabaseRolesExtension(AbstractDatabaseRolesExtension):
+    def __init__(self, users: dict) -> None:
+        self.users = users
+        self.roles: dict = {"admin": set()}
+
+    def _role(self, name: str) -> RoleDB:
+        return RoleDB(
+            id=list(self.roles).index(name) + 1,
+            name=name,
+            permissions=sorted(self.roles[name]),
+        )
+
+    async def create(self, name: str) -> int:
+        self.roles.setdefault(name, set())
+        return self._role(name).id
+
+    async def get_by_name(self, name: str) -> Optional[RoleDB]:
+        if name not in self.roles:
+            return None
+
+        return self._role(name)
+
+    async def add_permission(self, role_name: str, permission_name: str) -> None:
+        if role_name not in self.roles:
+            raise RoleNotFoundError
+
+        self.roles[role_name].add(permission_name)
+
+    async def remove_permission(self, role_name: str, permission_name: str) -> None:
+        if role_name not in self.roles:
+            raise RoleNotFoundError
+
+        self.roles[role_name].discard(permission_name)
+
+    async def delete_by_name(self, name: str) -> None:
+        self.roles.pop(name, None)
+        for user in self.users.values():
+            if name in user["roles"]:
+                user["roles"].remove(name)
+
+    async def grant(self, user_id: int, role_name: str) -> None:
+        if role_name not in self.roles:
+            raise RoleNotFoundError
+
+        roles = self.users[user_id]["roles"]
+        if role_name not in roles:
+            roles.append(role_name)
+
+    async def revoke(self, user_id: int, role_name: str) -> None:
+        roles = self.users[user_id]["roles"]
+        if role_name in roles:
+            roles.remove(role_name)
+
+    async def all(self) -> List[RoleDB]:
+        return [self._role(name) for name in self.roles]
 
 
 class MockDatabaseClient(AbstractDatabaseClient):
@@ -36,10 +119,6 @@ class MockDatabaseClient(AbstractDatabaseClient):
                 "email": "example3@gmail.com",
                 "username": "social",
                 "roles": [],
-                "oauth": {
-                    "provider": "mock",
-                    "sid": "3",
-                },
                 "active": True,
                 "verified": True,
                 "created_at": datetime.now(timezone.utc),
@@ -61,10 +140,6 @@ class MockDatabaseClient(AbstractDatabaseClient):
                 "email": "example5@gmail.com",
                 "username": "banned",
                 "password": "123456",
-                "oauth": {
-                    "provider": "mock",
-                    "sid": "5",
-                },
                 "roles": [],
                 "active": False,
                 "verified": False,
@@ -76,10 +151,6 @@ class MockDatabaseClient(AbstractDatabaseClient):
                 "email": "example6@gmail.com",
                 "username": "social_with_password",
                 "password": "123456",
-                "oauth": {
-                    "provider": "mock",
-                    "sid": "6",
-                },
                 "roles": [],
                 "active": True,
                 "verified": True,
@@ -87,77 +158,164 @@ class MockDatabaseClient(AbstractDatabaseClient):
                 "last_login": datetime.now(timezone.utc),
             },
         }
-        self.oauth = [
-            {
-                "user_id": 3,
-                "provider": "mock",
-                "sid": "3",
-            },
-            {
-                "user_id": 5,
-                "provider": "mock",
-                "sid": "5",
-            },
-        ]
+        self.oauth = MockDatabaseOAuthExtension(
+            [
+                {"user_id": 3, "provider": "mock", "sid": "3"},
+                {"user_id": 5, "provider": "mock", "sid": "5"},
+                {"user_id": 6, "provider": "mock", "sid": "6"},
+            ]
+        )
+        self.roles = MockDatabaseRolesExtension(self.db)
         self.i: int = 6
 
-    async def get(self, id: UID) -> UserDB:
-        v = self.db.get(id)
-        if v is not None:
-            return UserDB(**v)
+    def _user(self, value: dict) -> UserDB:
+        permissions = set()
+        for role in value["roles"]:
+            permissions.update(self.roles.roles.get(role, ()))
+
+        oauth = None
+        for item in self.oauth.items:
+            if item["user_id"] == value["id"]:
+                oauth = OAuthDB(**item)
+
+        return UserDB(
+            **{**value, "password": value.get("password")},
+            permissions=sorted(permissions),
+            oauth=oauth,
+        )
 
-        raise UserNotFoundError
+    def _find(self, field: str, value: str) -> Optional[UserDB]:
+        for item in self.db.values():
+            if item[field] == value:
+                return self._user(item)
 
-    async def get_by_email(self, email: str) -> UserDB:
-        for key, value in self.db.items():
-            if value.get("email") == email:
-                return await self.get(key)
+        return None
 
-        raise UserNotFoundError
+    async def get(self, id: int) -> Optional[UserDB]:
+        value = self.db.get(id)
+        if value is None:
+            return None
 
-    async def get_by_username(self, username: str) -> UserDB:
-        for key, value in self.db.items():
-            if value.get("username") == username:
-                return await self.get(key)
+        return self._user(value)
 
-        raise UserNotFoundError
+    async def get_password(self, id: int) -> Optional[str]:
+        value = self.db.get(id)
+        if value is None:
+            return None
 
-    async def get_by_social(self, provider: str, sid: str) -> UserDB:
-        for key, value in self.db.items():
-            oauth = value.get("oauth")
-            if oauth is not None:
-                if value.get("provider") == provider and value.get("sid") == sid:
-                    return await self.get(key)
+        return value.get("password")
 
-        raise UserNotFoundError
+    async def get_by_email(self, email: str) -> Optional[UserDB]:
+        return self._find("email", email)
 
-    async def get_by_oauth(self, provider: str, sid: str) -> UserDB:
-        for item in self.oauth:
-            if item.get("provider") == provider and item.get("sid") == sid:
-                return await self.get(item.get("user_id"))
+    async def get_by_username(self, username: str) -> Optional[UserDB]:
+        return self._find("username", username)
+
+    async def get_many(self, ids: List[int]) -> List[UserDB]:
+        return [self._user(self.db[id]) for id in sorted(set(ids)) if id in self.db]
+
+    async def get_many_by_username(self, usernames: List[str]) -> List[UserDB]:
+        return [
+            self._user(value)
+            for value in self.db.values()
+            if value["username"] in usernames
+        ]
+
+    async def get_many_by_email(self, emails: List[str]) -> List[UserDB]:
+        return [
+            self._user(value) for value in self.db.values() if value["email"] in emails
+        ]
 
-        raise UserNotFoundError
+    async def list_users(
+        self,
+        filters: UserFilter,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50,
+    ) -> List[UserDB]:
+        users = sorted(
+            (self._user(value) for value in self.db.values()),
+            key=lambda user: (user.created_at, user.id),
+            reverse=True,
+        )
+        if after is not None:
+            users = [user for user in users if (user.created_at, user.id) < after]
+        if filters.active is not None:
+            users = [user for user in users if user.active == filters.active]
+        if filters.verified is not None:
+            users = [user for user in users if user.verified == filters.verified]
+        if filters.role is not None:
+            users = [user for user in users if filters.role in user.roles]
+        if filters.provider is not None:
+            users = [
+                user
+                for user in users
+                if user.oauth is not None and user.oauth.provider == filters.provider
+            ]
+        if filters.created_from is not None:
+            users = [user for user in users if user.created_at >= filters.created_from]
+        if filters.created_to is not None:
+            users = [user for user in users if user.created_at < filters.created_to]
+        if filters.search:
+            users = [
+                user
+                for user in users
+                if user.username.startswith(filters.search)
+                or user.email.startswith(filters.search)
+            ]
 
-    async def create(self, obj: dict) -> UID:
+        return users[:limit]
+
+    async def get_by_provider_and_sid(
+        self,
+        provider: str,
+        sid: str,
+    ) -> Optional[UserDB]:
+        for item in self.oauth.items:
+            if item["provider"] == provider and item["sid"] == sid:
+                return await self.get(item["user_id"])
+
+        return None
+
+    async def get_usernames_by_prefix(self, prefix: str) -> List[str]:
+        return [
+            value["username"]
+            for value in self.db.values()
+            if value["username"].startswith(prefix)
+            and value["username"][len(prefix) :].isdigit()
+            or value["username"] == prefix
+        ]
+
+    async def create(self, obj: UserCreate) -> int:
         self.i += 1
-        obj.update({"id": self.i})
-        self.db[self.i] = obj
+        self.db[self.i] = {**obj.dict(), "id": self.i, "roles": []}
         return self.i
 
-    async def update(self, id: UID, obj: dict) -> bool:
-        try:
-            await self.get(id)
-        except UserNotFoundError:
+    async def create_returning(self, obj: UserCreate) -> Optional[UserDB]:
+        if any(await self.email_and_username_exist(obj.email, obj.username)):
+            return None
+
+        return await self.get(await self.create(obj))
+
+    async def email_and_username_exist(
+        self,
+        email: str,
+        username: str,
+    ) -> Tuple[bool, bool]:
+        return (
+            any(value["email"] == email for value in self.db.values()),
+            any(value["username"] == username for value in self.db.values()),
+        )
+
+    async def update(self, id: int, obj: dict) -> bool:
+        if id not in self.db:
             return False
 
         self.db[id].update(obj)
         return True
 
-    async def delete(self, id: UID) -> bool:
-        try:
-            await self.get(id)
-        except UserNotFoundError:
-            return False
+    async def update_last_login(self, items: List[Tuple[int, datetime]]) -> None:
+        for id, last_login in items:
+            await self.update(id, {"last_login": last_login})
 
-        self.db.pop(id, None)
-        return True
+    async def delete(self, id: int) -> bool:
+        return self.db.pop(id, None) is not None
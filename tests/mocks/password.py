@@ -2,8 +2,8 @@ from fastapi_auth.backend.abc.password import AbstractPasswordBackend
 
 
 class MockPasswordBackend(AbstractPasswordBackend):
-    def verify(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
         return plain_password == hashed_password
 
-    def hash(self, password: str) -> str:
+    async def hash(self, password: str) -> str:
         return password
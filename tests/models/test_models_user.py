@@ -0,0 +1,52 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.encoders import jsonable_encoder
+from httpx import AsyncClient
+
+from fastapi_auth.dependencies import get_authenticated_user
+from fastapi_auth.models.user import User, UserPrincipal
+
+pytestmark = pytest.mark.asyncio
+
+USER = UserPrincipal(
+    2,
+    "user",
+    frozenset(["moderator", "editor"]),
+    frozenset(["posts:delete"]),
+    1,
+    2,
+    "access",
+)
+
+EXPECTED = {
+    "id": 2,
+    "username": "user",
+    "roles": ["editor", "moderator"],
+    "permissions": ["posts:delete"],
+    "iat": 1,
+    "exp": 2,
+    "type": "access",
+}
+
+
+async def test_user_principal_dict():
+    assert USER.dict() == EXPECTED
+    assert dict(USER) == EXPECTED
+    assert jsonable_encoder(USER) == EXPECTED
+
+
+async def test_return_user_principal():
+    app = FastAPI()
+    app.dependency_overrides[get_authenticated_user] = lambda: USER
+
+    @app.get("/user")
+    async def user(user: UserPrincipal = Depends(get_authenticated_user)):
+        return user
+
+    @app.get("/user_model", response_model=User)
+    async def user_model(user: UserPrincipal = Depends(get_authenticated_user)):
+        return user
+
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        assert (await client.get("/user")).json() == EXPECTED
+        assert (await client.get("/user_model")).json() == EXPECTED
@@ -1,8 +1,11 @@
+from datetime import datetime, timezone
+
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
 
-from fastapi_auth import User
+from fastapi_auth import UserPrincipal
+from fastapi_auth.routers.admin import _decode_cursor, _encode_cursor
 
 pytestmark = pytest.mark.asyncio
 
@@ -10,7 +13,7 @@ pytestmark = pytest.mark.asyncio
 async def test_get_mass_logout_status(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:get_mass_logout_status")
     res = await test_client.get(url)
@@ -21,7 +24,7 @@ async def test_get_mass_logout_status(
 async def test_activate_mass_logout(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:activate_mass_logout")
     res = await test_client.post(url)
@@ -32,7 +35,7 @@ async def test_activate_mass_logout(
 async def test_deactivate_mass_logout(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:deactivate_mass_logout")
     res = await test_client.delete(url)
@@ -43,7 +46,7 @@ async def test_deactivate_mass_logout(
 async def test_ban(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:ban", id="2")
     res = await test_client.post(url)
@@ -54,7 +57,7 @@ async def test_ban(
 async def test_unban(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:unban", id="2")
     res = await test_client.post(url)
@@ -65,7 +68,7 @@ async def test_unban(
 async def test_kick(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:kick", id="2")
     res = await test_client.post(url)
@@ -76,9 +79,94 @@ async def test_kick(
 async def test_unkick(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_admin: User,
+    mock_admin: UserPrincipal,
 ):
     url = app.url_path_for("admin:unkick", id="2")
     res = await test_client.post(url)
 
     assert res.status_code == 200
+
+
+async def test_list_users(
+    app: FastAPI,
+    test_client: AsyncClient,
+    mock_admin: UserPrincipal,
+):
+    url = app.url_path_for("admin:list_users")
+    res = await test_client.get(url, params={"verified": True, "limit": 2})
+
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data.get("items")) == 2
+    assert data.get("next_cursor") is not None
+
+    res = await test_client.get(url, params={"cursor": data.get("next_cursor")})
+
+    assert res.status_code == 200
+
+
+async def test_list_users_invalid_cursor(
+    app: FastAPI,
+    test_client: AsyncClient,
+    mock_admin: UserPrincipal,
+):
+    url = app.url_path_for("admin:list_users")
+    res = await test_client.get(url, params={"cursor": "invalid"})
+
+    assert res.status_code == 400
+
+
+async def test_list_users_pages(
+    app: FastAPI,
+    test_client: AsyncClient,
+    mock_admin: UserPrincipal,
+):
+    url = app.url_path_for("admin:list_users")
+    params: dict = {"verified": True, "limit": 2}
+    ids = []
+    while True:
+        res = await test_client.get(url, params=params)
+        assert res.status_code == 200
+        data = res.json()
+        ids.extend(item["id"] for item in data["items"])
+        if data["next_cursor"] is None:
+            break
+
+        params["cursor"] = data["next_cursor"]
+
+    # newest first, every verified user exactly once
+    assert ids == [6, 3, 2, 1]
+
+
+@pytest.mark.parametrize(
+    "params, ids",
+    [
+        ({"role": "admin"}, [1]),
+        ({"provider": "mock"}, [6, 5, 3]),
+        ({"provider": "mock", "active": True}, [6, 3]),
+        ({"active": True, "verified": False}, [4]),
+        ({"search": "example1"}, [1]),
+        ({"search": "social", "provider": "mock"}, [6, 3]),
+    ],
+)
+async def test_list_users_filters(
+    app: FastAPI,
+    test_client: AsyncClient,
+    mock_admin: UserPrincipal,
+    params: dict,
+    ids: list,
+):
+    url = app.url_path_for("admin:list_users")
+    res = await test_client.get(url, params=params)
+
+    assert res.status_code == 200
+    assert [item["id"] for item in res.json()["items"]] == ids
+    assert "password" not in res.json()["items"][0]
+
+
+async def test_cursor_round_trip():
+    after = (datetime(2021, 1, 1, 12, 30, tzinfo=timezone.utc), 42)
+    cursor = _encode_cursor(after)
+
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == after
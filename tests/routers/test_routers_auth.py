@@ -44,3 +44,22 @@ async def test_logout(
     res = await test_client.post(url)
 
     assert res.status_code == 200
+
+
+async def test_login_rate_limit(
+    app: FastAPI,
+    test_client: AsyncClient,
+):
+    url = app.url_path_for("auth:login")
+    data_in = {
+        "login": "admin",
+        "password": "wrongpassword",
+    }
+    for _ in range(29):
+        res = await test_client.post(url, json=data_in)
+        assert res.status_code == 401
+
+    res = await test_client.post(url, json=data_in)
+
+    assert res.status_code == 429
+    assert res.headers.get("Retry-After") == "120"
@@ -2,7 +2,7 @@ import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
 
-from fastapi_auth import User
+from fastapi_auth import UserPrincipal
 
 pytestmark = pytest.mark.asyncio
 
@@ -10,7 +10,7 @@ pytestmark = pytest.mark.asyncio
 async def test_request_verification(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_unverified_user: User,
+    mock_unverified_user: UserPrincipal,
 ):
     url = app.url_path_for("email:request_verification")
     res = await test_client.post(url)
@@ -21,7 +21,7 @@ async def test_request_verification(
 async def test_verify(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_unverified_user: User,
+    mock_unverified_user: UserPrincipal,
 ):
     url = app.url_path_for("email:verify", token="verify")
     res = await test_client.post(url)
@@ -32,7 +32,7 @@ async def test_verify(
 async def test_request_email_change(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("email:request_email_change")
     data_in = {"email": "newemail@gmail.com"}
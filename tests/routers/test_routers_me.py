@@ -2,7 +2,7 @@ import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
 
-from fastapi_auth import User
+from fastapi_auth import UserPrincipal
 
 pytestmark = pytest.mark.asyncio
 
@@ -10,7 +10,7 @@ pytestmark = pytest.mark.asyncio
 async def test_get(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("me:get")
     res = await test_client.get(url)
@@ -21,7 +21,7 @@ async def test_get(
 async def test_change_username(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("me:change_username")
     data_in = {"username": "newusername"}
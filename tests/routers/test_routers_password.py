@@ -2,7 +2,7 @@ import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
 
-from fastapi_auth import User
+from fastapi_auth import UserPrincipal
 
 pytestmark = pytest.mark.asyncio
 
@@ -10,7 +10,7 @@ pytestmark = pytest.mark.asyncio
 async def test_forgot(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("password:forgot")
     data_in = {"email": "example1@gmail.com", "captcha": "value"}
@@ -22,7 +22,7 @@ async def test_forgot(
 async def test_get_status(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("password:get_status")
     res = await test_client.get(url)
@@ -33,7 +33,7 @@ async def test_get_status(
 async def test_set(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_social_user: User,
+    mock_social_user: UserPrincipal,
 ):
     url = app.url_path_for("password:set")
     data_in = {
@@ -48,7 +48,7 @@ async def test_set(
 async def test_change(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("password:change")
     data_in = {
@@ -1,8 +1,21 @@
+from typing import Iterable
+
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
 
-from fastapi_auth.models.user import User
+from fastapi_auth import FastAPIAuthApp
+from fastapi_auth.backend.abc.captcha import AbstractCaptchaClient
+from fastapi_auth.backend.abc.email import AbstractEmailClient
+from fastapi_auth.backend.abc.oauth import AbstractOAuthProvider
+from fastapi_auth.backend.abc.password import AbstractPasswordBackend
+from fastapi_auth.backend.authorization.default import DefaultAuthorization
+from fastapi_auth.backend.jwt.default import JWTBackend
+from fastapi_auth.backend.transport.bearer import BearerTransport
+from fastapi_auth.backend.transport.composite import HeaderCookieTransport
+from fastapi_auth.jwt import TokenParams
+from fastapi_auth.models.user import UserPrincipal
+from fastapi_auth.repo import Repo
 
 pytestmark = pytest.mark.asyncio
 
@@ -10,7 +23,7 @@ pytestmark = pytest.mark.asyncio
 async def test_token(
     app: FastAPI,
     test_client: AsyncClient,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     url = app.url_path_for("token:payload")
     res = await test_client.post(url)
@@ -26,3 +39,61 @@ async def test_refresh_access_token(
     res = await test_client.post(url)
 
     assert res.status_code == 200
+
+
+@pytest.fixture(
+    params=[
+        BearerTransport(),
+        HeaderCookieTransport("access_c", "refresh_c", False),
+    ]
+)
+async def transport_app(
+    request,
+    mock_repo: Repo,
+    mock_oauth_providers: Iterable[AbstractOAuthProvider],
+    mock_password_backend: AbstractPasswordBackend,
+    mock_email_client: AbstractEmailClient,
+    mock_captcha_client: AbstractCaptchaClient,
+):
+    app = FastAPI()
+    auth_app = FastAPIAuthApp(
+        app,
+        lambda: mock_repo,
+        JWTBackend("HS256", "secret" * 6, "secret" * 6),
+        TokenParams(),
+        request.param,
+        DefaultAuthorization(),
+        mock_oauth_providers,
+        mock_password_backend,
+        mock_email_client,
+        mock_captcha_client,
+    )
+    auth_app.include_routers("/api/users")
+    user = await mock_repo.get(2)
+    yield app, auth_app._jwt.create_tokens(user.payload())
+
+
+async def test_refresh_token_as_access_token(transport_app):
+    app, (access_token, refresh_token) = transport_app
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        url = app.url_path_for("token:payload")
+        headers = {"Authorization": f"Bearer {access_token}"}
+        res = await client.post(url, headers=headers)
+        assert res.status_code == 200
+
+        headers = {"Authorization": f"Bearer {refresh_token}"}
+        res = await client.post(url, headers=headers)
+        assert res.status_code == 401
+
+
+async def test_access_token_as_refresh_token(transport_app):
+    app, (access_token, refresh_token) = transport_app
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        url = app.url_path_for("token:refresh_access_token")
+        headers = {"Authorization": f"Bearer {refresh_token}"}
+        res = await client.post(url, headers=headers)
+        assert res.status_code == 200
+
+        headers = {"Authorization": f"Bearer {access_token}"}
+        res = await client.post(url, headers=headers)
+        assert res.status_code == 401
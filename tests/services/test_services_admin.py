@@ -1,48 +1,53 @@
 import pytest
 
-from fastapi_auth.repo import Repo
-from fastapi_auth.services.admin import AdminService
+from fastapi_auth.repo import AdminRepo, Repo
 
 pytestmark = pytest.mark.asyncio
 
 
 @pytest.fixture
-def mock_service(mock_repo: Repo):
-    yield AdminService(mock_repo)
+def mock_admin_repo(mock_repo: Repo):
+    yield mock_repo.admin
 
 
-async def test_ban(mock_service: AdminService):
-    await mock_service.ban(1)
+async def test_ban(mock_repo: Repo, mock_admin_repo: AdminRepo):
+    await mock_admin_repo.ban(1)
+    assert await mock_repo.user_was_recently_banned(1)
+    assert not (await mock_repo.get(1)).active
 
 
-async def test_unban(mock_service: AdminService):
-    await mock_service.unban(1)
+async def test_unban(mock_repo: Repo, mock_admin_repo: AdminRepo):
+    await mock_admin_repo.ban(1)
+    await mock_admin_repo.unban(1)
+    assert not await mock_repo.user_was_recently_banned(1)
+    assert (await mock_repo.get(1)).active
 
 
-async def test_kick(mock_service: AdminService):
-    await mock_service.kick(1)
+async def test_kick(mock_repo: Repo, mock_admin_repo: AdminRepo):
+    await mock_admin_repo.kick(1)
+    assert await mock_repo.get_kick_ts(1) is not None
 
 
-async def test_unkick(mock_service: AdminService):
-    await mock_service.unkick(1)
+async def test_unkick(mock_repo: Repo, mock_admin_repo: AdminRepo):
+    await mock_admin_repo.kick(1)
+    await mock_admin_repo.unkick(1)
+    assert await mock_repo.get_kick_ts(1) is None
 
 
-async def test_get_mass_logout_status_not_active(mock_service: AdminService):
-    status = await mock_service.get_mass_logout_status()
-    assert status.active is False
-    assert status.date is None
+async def test_get_mass_logout_status_not_active(mock_admin_repo: AdminRepo):
+    assert await mock_admin_repo.get_mass_logout_ts() is None
 
 
-async def test_get_mass_logout_status_active(mock_service: AdminService):
-    await mock_service.activate_mass_logout()
-    status = await mock_service.get_mass_logout_status()
-    assert status.active is True
-    assert status.date is not None
+async def test_get_mass_logout_status_active(mock_admin_repo: AdminRepo):
+    await mock_admin_repo.activate_mass_logout()
+    assert await mock_admin_repo.get_mass_logout_ts() is not None
 
 
-async def test_activate_mass_logout(mock_service: AdminService):
-    await mock_service.activate_mass_logout()
+async def test_activate_mass_logout(mock_admin_repo: AdminRepo):
+    await mock_admin_repo.activate_mass_logout()
 
 
-async def test_deactivate_mass_logout(mock_service: AdminService):
-    await mock_service.deactivate_mass_logout()
+async def test_deactivate_mass_logout(mock_admin_repo: AdminRepo):
+    await mock_admin_repo.activate_mass_logout()
+    await mock_admin_repo.deactivate_mass_logout()
+    assert await mock_admin_repo.get_mass_logout_ts() is None
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from fastapi_auth.backend.abc.authorization import AbstractAuthorization
@@ -25,7 +27,6 @@ pytestmark = pytest.mark.asyncio
 
 @pytest.fixture
 def mock_service(
-    mock_repo: Repo,
     mock_jwt: JWT,
     mock_authorization: AbstractAuthorization,
     mock_password_backend: AbstractPasswordBackend,
@@ -33,7 +34,6 @@ def mock_service(
     mock_captcha_client: AbstractCaptchaClient,
 ):
     yield AuthService(
-        mock_repo,
         mock_jwt,
         TokenParams(),
         mock_authorization,
@@ -44,7 +44,9 @@ def mock_service(
     )
 
 
-async def test_register_error_invalid_captcha(mock_service: AuthService):
+async def test_register_error_invalid_captcha(
+    mock_repo: Repo, mock_service: AuthService
+):
     data_in = RegisterRequest(
         email="newemail@gmail.com",
         username="newusername",
@@ -54,10 +56,12 @@ async def test_register_error_invalid_captcha(mock_service: AuthService):
     )
 
     with pytest.raises(InvalidCaptchaError):
-        await mock_service.register(data_in, "ip")
+        await mock_service.register(mock_repo, data_in, "ip")
 
 
-async def test_register_error_email_already_exists(mock_service: AuthService):
+async def test_register_error_email_already_exists(
+    mock_repo: Repo, mock_service: AuthService
+):
     data_in = RegisterRequest(
         email="example1@gmail.com",
         username="newusername",
@@ -67,10 +71,12 @@ async def test_register_error_email_already_exists(mock_service: AuthService):
     )
 
     with pytest.raises(EmailAlreadyExistsError):
-        await mock_service.register(data_in, "ip")
+        await mock_service.register(mock_repo, data_in, "ip")
 
 
-async def test_register_error_username_already_exists(mock_service: AuthService):
+async def test_register_error_username_already_exists(
+    mock_repo: Repo, mock_service: AuthService
+):
     data_in = RegisterRequest(
         email="newemail@gmail.com",
         username="admin",
@@ -80,10 +86,43 @@ async def test_register_error_username_already_exists(mock_service: AuthService)
     )
 
     with pytest.raises(UsernameAlreadyExistsError):
-        await mock_service.register(data_in, "ip")
+        await mock_service.register(mock_repo, data_in, "ip")
+
+
+async def test_register_conflict_does_not_hash(
+    mock_repo: Repo,
+    mock_service: AuthService,
+    mock_password_backend: AbstractPasswordBackend,
+):
+    hashed = []
+
+    async def hash(password: str) -> str:
+        hashed.append(password)
+        return password
+
+    email_and_username_exist = mock_repo.email_and_username_exist
+
+    async def slow_email_and_username_exist(email: str, username: str):
+        await asyncio.sleep(0.01)
+        return await email_and_username_exist(email, username)
+
+    mock_password_backend.hash = hash  # type: ignore
+    mock_repo.email_and_username_exist = slow_email_and_username_exist  # type: ignore
+    data_in = RegisterRequest(
+        email="example1@gmail.com",
+        username="newusername",
+        password1="123456",
+        password2="123456",
+        captcha="value",
+    )
+
+    with pytest.raises(EmailAlreadyExistsError):
+        await mock_service.register(mock_repo, data_in, "ip")
+
+    assert hashed == []
 
 
-async def test_register(mock_service: AuthService):
+async def test_register(mock_repo: Repo, mock_service: AuthService):
     data_in = RegisterRequest(
         email="newemail@gmail.com",
         username="newusername",
@@ -91,42 +130,42 @@ async def test_register(mock_service: AuthService):
         password2="123456",
         captcha="value",
     )
-    user = await mock_service.register(data_in, "ip")
+    user = await mock_service.register(mock_repo, data_in, "ip")
     assert isinstance(user, UserDB)
 
 
-async def test_login_error_timeout(mock_service: AuthService):
+async def test_login_error_timeout(mock_repo: Repo, mock_service: AuthService):
     data_in = LoginRequest(login="admin", password="123456")
     with pytest.raises(TimeoutError):
         for _ in range(100):
-            await mock_service.login(data_in, "ip")
+            await mock_service.login(mock_repo, data_in, "ip")
 
 
-async def test_login_error_invalid_password(mock_service: AuthService):
+async def test_login_error_invalid_password(mock_repo: Repo, mock_service: AuthService):
     data_in = LoginRequest(login="admin", password="wrongpassword")
     with pytest.raises(InvalidPasswordError):
-        await mock_service.login(data_in, "ip")
+        await mock_service.login(mock_repo, data_in, "ip")
 
 
-async def test_login_error_user_not_found(mock_service: AuthService):
+async def test_login_error_user_not_found(mock_repo: Repo, mock_service: AuthService):
     data_in = LoginRequest(login="notfound", password="wrongpassword")
     with pytest.raises(UserNotFoundError):
-        await mock_service.login(data_in, "ip")
+        await mock_service.login(mock_repo, data_in, "ip")
 
 
-async def test_login_error_ban(mock_service: AuthService):
+async def test_login_error_ban(mock_repo: Repo, mock_service: AuthService):
     data_in = LoginRequest(login="banned", password="123456")
     with pytest.raises(UserNotActiveError):
-        await mock_service.login(data_in, "ip")
+        await mock_service.login(mock_repo, data_in, "ip")
 
 
-async def test_login_error_password_not_set(mock_service: AuthService):
+async def test_login_error_password_not_set(mock_repo: Repo, mock_service: AuthService):
     data_in = LoginRequest(login="social", password="wrongpassword")
     with pytest.raises(PasswordNotSetError):
-        await mock_service.login(data_in, "ip")
+        await mock_service.login(mock_repo, data_in, "ip")
 
 
-async def test_login(mock_service: AuthService):
+async def test_login(mock_repo: Repo, mock_service: AuthService):
     data_in = LoginRequest(login="admin", password="123456")
-    user = await mock_service.login(data_in, "ip")
+    user = await mock_service.login(mock_repo, data_in, "ip")
     assert isinstance(user, UserDB)
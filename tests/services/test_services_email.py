@@ -10,7 +10,7 @@ from fastapi_auth.errors import (
 )
 from fastapi_auth.jwt import JWT, TokenParams
 from fastapi_auth.models.email import ChangeEmailRequest
-from fastapi_auth.models.user import User
+from fastapi_auth.models.user import UserPrincipal
 from fastapi_auth.repo import Repo
 from fastapi_auth.services.email import EmailService
 
@@ -19,12 +19,10 @@ pytestmark = pytest.mark.asyncio
 
 @pytest.fixture
 def mock_service(
-    mock_repo: Repo,
     mock_jwt: JWT,
     mock_email_client: AbstractEmailClient,
 ):
     yield EmailService(
-        mock_repo,
         mock_jwt,
         TokenParams(),
         mock_email_client,
@@ -32,70 +30,77 @@ def mock_service(
 
 
 async def test_request_error_email_already_verified(
+    mock_repo: Repo,
     mock_service: EmailService,
-    mock_user: User,
+    mock_user: UserPrincipal,
 ):
     with pytest.raises(EmailAlreadyVerifiedError):
-        await mock_service.request_verification(mock_user)
+        await mock_service.request_verification(mock_repo, mock_user)
 
 
 async def test_request(
+    mock_repo: Repo,
     mock_service: EmailService,
-    mock_unverified_user: User,
+    mock_unverified_user: UserPrincipal,
 ):
-    await mock_service.request_verification(mock_unverified_user)
+    await mock_service.request_verification(mock_repo, mock_unverified_user)
 
 
 async def test_request_error_timeout(
+    mock_repo: Repo,
     mock_service: EmailService,
-    mock_unverified_user: User,
+    mock_unverified_user: UserPrincipal,
 ):
     with pytest.raises(TimeoutError):
-        await mock_service.request_verification(mock_unverified_user)
-        await mock_service.request_verification(mock_unverified_user)
-        await mock_service.request_verification(mock_unverified_user)
-        await mock_service.request_verification(mock_unverified_user)
+        await mock_service.request_verification(mock_repo, mock_unverified_user)
+        await mock_service.request_verification(mock_repo, mock_unverified_user)
+        await mock_service.request_verification(mock_repo, mock_unverified_user)
+        await mock_service.request_verification(mock_repo, mock_unverified_user)
 
 
 async def test_verify_error_wrong_token_type(
+    mock_repo: Repo,
     mock_service: EmailService,
 ):
     with pytest.raises(WrongTokenTypeError):
-        await mock_service.verify("verify_wrong_type")
+        await mock_service.verify(mock_repo, "verify_wrong_type")
 
 
 async def test_verify_error_email_already_verified(
+    mock_repo: Repo,
     mock_service: EmailService,
 ):
     with pytest.raises(EmailAlreadyVerifiedError):
-        await mock_service.verify("verify_email_already_verified")
+        await mock_service.verify(mock_repo, "verify_email_already_verified")
 
 
 async def test_verify_error_email_mismatch(
+    mock_repo: Repo,
     mock_service: EmailService,
 ):
     with pytest.raises(EmailMismatchError):
-        await mock_service.verify("verify_email_mismatch")
+        await mock_service.verify(mock_repo, "verify_email_mismatch")
 
 
 async def test_verify(
+    mock_repo: Repo,
     mock_service: EmailService,
 ):
-    await mock_service.verify("verify")
+    await mock_service.verify(mock_repo, "verify")
 
 
 async def test_request_email_change_error_same_email(
-    mock_service: EmailService, mock_user: User
+    mock_repo: Repo, mock_service: EmailService, mock_user: UserPrincipal
 ):
     data_in = ChangeEmailRequest(email="example2@gmail.com")
     with pytest.raises(SameEmailError):
-        await mock_service.request_email_change(data_in, mock_user)
+        await mock_service.request_email_change(mock_repo, data_in, mock_user)
 
 
 async def test_request_email_change_error_timeout(
-    mock_service: EmailService, mock_user: User
+    mock_repo: Repo, mock_service: EmailService, mock_user: UserPrincipal
 ):
     data_in = ChangeEmailRequest(email="newemail@gmail.com")
     with pytest.raises(TimeoutError):
         for _ in range(10):
-            await mock_service.request_email_change(data_in, mock_user)
+            await mock_service.request_email_change(mock_repo, data_in, mock_user)
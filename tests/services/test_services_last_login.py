@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import pytest
+
+from fastapi_auth.backend.abc.authorization import AbstractAuthorization
+from fastapi_auth.backend.abc.password import AbstractPasswordBackend
+from fastapi_auth.jwt import JWT, TokenParams
+from fastapi_auth.last_login import LastLoginRecorder
+from fastapi_auth.models.auth import LoginRequest
+from fastapi_auth.repo import Repo
+from fastapi_auth.services.auth import AuthService
+from tests.mocks import MockDatabaseClient
+
+pytestmark = pytest.mark.asyncio
+
+LAST_LOGIN = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+class RecordingDatabaseClient(MockDatabaseClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: List[List[Tuple[int, datetime]]] = []
+        self.fail = 0
+
+    async def update_last_login(self, items: List[Tuple[int, datetime]]) -> None:
+        await asyncio.sleep(0)
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError
+
+        self.batches.append(items)
+        await super().update_last_login(items)
+
+
+@pytest.fixture
+def db():
+    yield RecordingDatabaseClient()
+
+
+@pytest.fixture
+async def recorder(db: RecordingDatabaseClient):
+    recorder = LastLoginRecorder(db, flush_interval=60, maxsize=3)
+    yield recorder
+    await recorder.shutdown()
+
+
+async def test_record_buffers(db: RecordingDatabaseClient, recorder: LastLoginRecorder):
+    recorder.record(1, LAST_LOGIN)
+    recorder.record(2, LAST_LOGIN)
+    recorder.record(1, LAST_LOGIN + timedelta(seconds=1))
+    await asyncio.sleep(0)
+
+    assert db.batches == []
+
+    await recorder.flush()
+
+    assert db.batches == [[(1, LAST_LOGIN + timedelta(seconds=1)), (2, LAST_LOGIN)]]
+    assert db.db[2]["last_login"] == LAST_LOGIN
+
+
+async def test_flush_interval(db: RecordingDatabaseClient):
+    recorder = LastLoginRecorder(db, flush_interval=0.01)
+    recorder.record(1, LAST_LOGIN)
+    await asyncio.sleep(0.05)
+
+    assert db.batches == [[(1, LAST_LOGIN)]]
+
+    await recorder.shutdown()
+
+
+async def test_maxsize(db: RecordingDatabaseClient, recorder: LastLoginRecorder):
+    for id in range(1, 5):
+        recorder.record(id, LAST_LOGIN)
+
+    assert recorder.dropped == 1
+
+    # a full buffer wakes the flusher up before the interval
+    await asyncio.sleep(0.01)
+
+    assert db.batches == [[(1, LAST_LOGIN), (2, LAST_LOGIN), (3, LAST_LOGIN)]]
+
+
+async def test_flush_failure_requeues(
+    db: RecordingDatabaseClient,
+    recorder: LastLoginRecorder,
+):
+    db.fail = 1
+    recorder.record(1, LAST_LOGIN)
+    await recorder.flush()
+
+    assert db.batches == []
+
+    await recorder.flush()
+
+    assert db.batches == [[(1, LAST_LOGIN)]]
+
+
+async def test_flush_failure_keeps_newer_record(
+    db: RecordingDatabaseClient,
+    recorder: LastLoginRecorder,
+):
+    db.fail = 1
+    recorder.record(1, LAST_LOGIN)
+    flush = asyncio.ensure_future(recorder.flush())
+    await asyncio.sleep(0)
+    # recorded while the failing batch is in flight
+    recorder.record(1, LAST_LOGIN + timedelta(seconds=1))
+    await flush
+    await recorder.flush()
+
+    assert db.batches == [[(1, LAST_LOGIN + timedelta(seconds=1))]]
+
+
+async def test_shutdown_flushes(db: RecordingDatabaseClient):
+    recorder = LastLoginRecorder(db, flush_interval=60)
+    recorder.record(1, LAST_LOGIN)
+    await recorder.shutdown()
+
+    assert db.batches == [[(1, LAST_LOGIN)]]
+
+    recorder.record(2, LAST_LOGIN)
+    assert recorder._task is None
+
+
+async def test_login_records(
+    db: RecordingDatabaseClient,
+    recorder: LastLoginRecorder,
+    mock_cache,
+    mock_jwt: JWT,
+    mock_authorization: AbstractAuthorization,
+    mock_password_backend: AbstractPasswordBackend,
+):
+    repo = Repo(db, mock_cache, TokenParams())
+    service = AuthService(
+        mock_jwt,
+        TokenParams(),
+        mock_authorization,
+        mock_password_backend,
+        None,
+        None,
+        False,
+        last_login_recorder=recorder,
+    )
+    last_login = db.db[1]["last_login"]
+    await service.login(repo, LoginRequest(login="admin", password="123456"), "ip")
+
+    assert db.db[1]["last_login"] == last_login
+
+    await recorder.flush()
+
+    assert db.db[1]["last_login"] > last_login
+
+
+async def test_flush_invalidates_user_cache(db: RecordingDatabaseClient, mock_cache):
+    repo = Repo(db, mock_cache, TokenParams(), user_cache_ttl=60)
+    recorder = LastLoginRecorder(db, flush_interval=60, user_cache=repo.user_cache)
+    last_login = (await repo.get(1)).last_login
+
+    recorder.record(1, LAST_LOGIN)
+    await recorder.flush()
+
+    assert (await repo.get(1)).last_login == LAST_LOGIN != last_login
+
+    await recorder.shutdown()
+
+
+async def test_login_with_user_cache(
+    db: RecordingDatabaseClient,
+    mock_cache,
+    mock_jwt: JWT,
+    mock_authorization: AbstractAuthorization,
+    mock_password_backend: AbstractPasswordBackend,
+):
+    repo = Repo(db, mock_cache, TokenParams(), user_cache_ttl=60)
+    service = AuthService(
+        mock_jwt,
+        TokenParams(),
+        mock_authorization,
+        mock_password_backend,
+        None,
+        None,
+        False,
+    )
+    await repo.get_by_username("admin")
+    user = await service.login(
+        repo, LoginRequest(login="admin", password="123456"), "ip"
+    )
+
+    assert user.id == 1
@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Iterable, List
 
 import pytest
 
@@ -9,7 +9,7 @@ from fastapi_auth.errors import (
     UserNotActiveError,
 )
 from fastapi_auth.jwt import JWT, TokenParams
-from fastapi_auth.models.user import UserDB
+from fastapi_auth.models.user import UserCreate, UserDB
 from fastapi_auth.repo import Repo
 from fastapi_auth.services.oauth import OAuthService
 
@@ -21,15 +21,13 @@ REDIRECT = "/redirect"
 
 @pytest.fixture
 def mock_service(
-    mock_repo: Repo,
     mock_jwt: JWT,
     mock_oauth_providers: Iterable[AbstractOAuthProvider],
 ):
     yield OAuthService(
-        mock_repo,
         mock_jwt,
         TokenParams(),
-        mock_oauth_providers,
+        {provider.name: provider for provider in mock_oauth_providers},
         ORIGIN,
         REDIRECT,
     )
@@ -57,45 +55,78 @@ def test_create_redirect_uri(
 
 
 async def test_get_user_error_ban(
+    mock_repo: Repo,
     mock_service: OAuthService,
     mock_oauth_providers: Iterable[AbstractOAuthProvider],
 ):
     provider = mock_oauth_providers[0]  # type: ignore
     with pytest.raises(UserNotActiveError):
-        await mock_service.get_user(provider, "5")
+        await mock_service.get_user(mock_repo, provider, "5")
 
 
 async def test_create_user_error_email_already_exists(
+    mock_repo: Repo,
     mock_service: OAuthService,
     mock_oauth_providers: Iterable[AbstractOAuthProvider],
 ):
     provider = mock_oauth_providers[0]  # type: ignore
     with pytest.raises(EmailAlreadyExistsError):
-        await mock_service.create_user(provider, "100", "example5@gmail.com")
+        await mock_service.create_user(mock_repo, provider, "100", "example5@gmail.com")
 
 
 async def test_create_user_error_login_only(
+    mock_repo: Repo,
     mock_service: OAuthService,
     mock_oauth_providers: Iterable[AbstractOAuthProvider],
 ):
     provider = mock_oauth_providers[1]  # type: ignore
     with pytest.raises(OAuthLoginOnlyError):
-        await mock_service.create_user(provider, "100", "example100@gmail.com")
+        await mock_service.create_user(
+            mock_repo, provider, "100", "example100@gmail.com"
+        )
 
 
 async def get_user(
+    mock_repo: Repo,
     mock_service: OAuthService,
     mock_oauth_providers: Iterable[AbstractOAuthProvider],
 ):
     provider = mock_oauth_providers[0]  # type: ignore
-    user = await mock_service.get_user(provider, "3")
+    user = await mock_service.get_user(mock_repo, provider, "3")
     assert isinstance(user, UserDB)
 
 
 async def test_create_user(
+    mock_repo: Repo,
     mock_service: OAuthService,
     mock_oauth_providers: Iterable[AbstractOAuthProvider],
 ):
     provider = mock_oauth_providers[0]  # type: ignore
-    user = await mock_service.create_user(provider, "100", "example100@gmail.com")
+    user = await mock_service.create_user(
+        mock_repo, provider, "100", "example100@gmail.com"
+    )
     assert isinstance(user, UserDB)
+
+
+@pytest.mark.parametrize(
+    "taken, email, username",
+    [
+        ([], "newname@gmail.com", "newname"),
+        ([], "user@gmail.com", "user1"),
+        (["user1", "user2", "user4"], "user@gmail.com", "user3"),
+        (["userx", "user_1"], "user@gmail.com", "user1"),
+        (["user1", "user11"], "user1@gmail.com", "user12"),
+        (["user2"], "user2@gmail.com", "user21"),
+    ],
+)
+async def test_resolve_username(
+    mock_repo: Repo,
+    mock_service: OAuthService,
+    taken: List[str],
+    email: str,
+    username: str,
+):
+    for name in taken:
+        await mock_repo.create(UserCreate(email=f"{name}@example.com", username=name))
+
+    assert await mock_service._resolve_username(mock_repo, email) == username
@@ -0,0 +1,60 @@
+import pytest
+
+from fastapi_auth.backend.jwt.default import JWTBackend
+from fastapi_auth.errors import TokenDecodingError
+from fastapi_auth.jwt import (
+    JWT,
+    PERMISSION_MASK_CLAIM,
+    PERMISSION_VERSION_CLAIM,
+    TokenParams,
+)
+from fastapi_auth.permissions import PermissionRegistry
+
+pytestmark = pytest.mark.asyncio
+
+SECRET = "secret" * 6
+
+PAYLOAD = {
+    "id": 1,
+    "username": "admin",
+    "roles": ["moderator"],
+    "permissions": ["posts:delete", "users:ban"],
+}
+
+
+def create_jwt(registry: PermissionRegistry) -> JWT:
+    return JWT(JWTBackend("HS256", SECRET, SECRET), TokenParams(), registry)
+
+
+async def test_permissions_are_compressed():
+    registry = PermissionRegistry(["posts:delete", "posts:read", "users:ban"])
+    jwt = create_jwt(registry)
+    access_token, refresh_token = jwt.create_tokens(PAYLOAD)
+
+    raw = JWTBackend("HS256", SECRET, SECRET).decode_token(access_token)
+    assert "permissions" not in raw
+    assert raw[PERMISSION_VERSION_CLAIM] == registry.version
+
+    for token in (access_token, refresh_token):
+        payload = jwt.decode_token(token)
+        assert payload["permissions"] == {"posts:delete", "users:ban"}
+        assert PERMISSION_MASK_CLAIM not in payload
+
+
+async def test_unregistered_permission_is_not_compressed():
+    jwt = create_jwt(PermissionRegistry(["posts:delete"]))
+    payload = jwt.decode_token(jwt.create_access_token(PAYLOAD))
+
+    assert payload["permissions"] == ["posts:delete", "users:ban"]
+
+
+async def test_version_mismatch():
+    jwt = create_jwt(PermissionRegistry(["posts:delete", "users:ban"]))
+    access_token, refresh_token = jwt.create_tokens(PAYLOAD)
+
+    other = create_jwt(PermissionRegistry(["posts:delete", "users:ban", "x"]))
+    with pytest.raises(TokenDecodingError):
+        other.decode_token(access_token)
+
+    # refresh reloads permissions from the database
+    assert other.decode_token(refresh_token)["permissions"] == frozenset()
@@ -0,0 +1,147 @@
+from typing import Optional
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from httpx import AsyncClient
+
+from fastapi_auth import FastAPIAuth
+from fastapi_auth.backend.authorization.default import DefaultAuthorization
+from fastapi_auth.backend.jwt.default import JWTBackend
+from fastapi_auth.backend.transport.bearer import BearerTransport
+from fastapi_auth.dependencies import get_authenticated_user, get_user
+from fastapi_auth.jwt import JWT, TokenParams
+from fastapi_auth.middleware import SCOPE_USER_KEY, AuthenticationMiddleware
+from fastapi_auth.models.user import UserPrincipal
+from fastapi_auth.permissions import PermissionRegistry
+from fastapi_auth.repo import Repo
+
+pytestmark = pytest.mark.asyncio
+
+SECRET = "secret" * 6
+
+
+def create_app(
+    mock_repo: Repo,
+    opened: list,
+    permission_registry: Optional[PermissionRegistry] = None,
+) -> FastAPI:
+    def get_repo(request: Request):
+        raise AssertionError("routes must not build the repo")
+
+    async def get_middleware_repo(request: Request):
+        opened.append(request.url.path)
+        yield mock_repo
+
+    app = FastAPI()
+    FastAPIAuth(
+        app,
+        get_repo,
+        JWTBackend("HS256", SECRET, SECRET),
+        TokenParams(),
+        BearerTransport(),
+        DefaultAuthorization(),
+        middleware=True,
+        public_paths=["/public"],
+        get_middleware_repo=get_middleware_repo,
+        permission_registry=permission_registry,
+    )
+
+    @app.get("/private")
+    async def private(user: UserPrincipal = Depends(get_authenticated_user)):
+        return user.id
+
+    @app.get("/public")
+    async def public(user: Optional[UserPrincipal] = Depends(get_user)):
+        return user.id if user is not None else None
+
+    return app
+
+
+@pytest.fixture
+async def access_token(mock_repo: Repo):
+    jwt = JWT(JWTBackend("HS256", SECRET, SECRET), TokenParams())
+    user = await mock_repo.get(2)
+    yield jwt.create_access_token(user.payload())
+
+
+async def test_middleware(mock_repo: Repo, access_token: str):
+    opened: list = []
+    app = create_app(mock_repo, opened)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        res = await client.get("/private")
+        assert res.status_code == 401
+        assert opened == []
+
+        res = await client.get("/private", headers=headers)
+        assert res.status_code == 200
+        assert res.json() == 2
+        assert opened == ["/private"]
+
+        # public paths skip the middleware, the dependency opens the repo
+        res = await client.get("/public", headers=headers)
+        assert res.status_code == 200
+        assert res.json() == 2
+        assert opened == ["/private", "/public"]
+
+
+@pytest.mark.parametrize("permission_registry", [None, PermissionRegistry()])
+async def test_malformed_token_opens_no_repo(
+    mock_repo: Repo, permission_registry: Optional[PermissionRegistry]
+):
+    opened: list = []
+    app = create_app(mock_repo, opened, permission_registry)
+    headers = {"Authorization": "Bearer garbage"}
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        res = await client.get("/private", headers=headers)
+        assert res.status_code == 401
+
+        res = await client.get("/public", headers=headers)
+        assert res.status_code == 200
+        assert res.json() is None
+
+    assert opened == []
+
+
+async def test_middleware_requires_repo_factory():
+    def get_repo(request: Request):
+        pass  # pragma: no cover
+
+    with pytest.raises(ValueError):
+        FastAPIAuth(
+            FastAPI(),
+            get_repo,
+            JWTBackend(),
+            TokenParams(),
+            BearerTransport(),
+            DefaultAuthorization(),
+            middleware=True,
+        )
+
+
+@pytest.mark.parametrize(
+    "public_paths, path, public",
+    [
+        (["/public"], "/public", True),
+        (["/public"], "/public/docs", True),
+        (["/public/"], "/public", True),
+        (["/public/"], "/public/docs", True),
+        (["/public"], "/publication", False),
+        (["/public"], "/private", False),
+        (["/"], "/private", True),
+        ([], "/public", False),
+    ],
+)
+async def test_public_paths_match_segments(public_paths: list, path: str, public: bool):
+    class Auth:
+        async def authenticate(self, request: Request) -> str:
+            return "user"
+
+    async def app(scope, receive, send):
+        pass
+
+    middleware = AuthenticationMiddleware(app, Auth(), public_paths)  # type: ignore
+    scope = {"type": "http", "path": path}
+    await middleware(scope, None, None)  # type: ignore
+
+    assert (SCOPE_USER_KEY not in scope) is public
@@ -0,0 +1,88 @@
+import pytest
+from fastapi import FastAPI
+
+from fastapi_auth import FastAPIAuth
+from fastapi_auth.backend.authorization.default import DefaultAuthorization
+from fastapi_auth.backend.jwt.default import JWTBackend
+from fastapi_auth.backend.transport.bearer import BearerTransport
+from fastapi_auth.jwt import TokenParams
+from fastapi_auth.permissions import PermissionRegistry
+from fastapi_auth.repo import Repo
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_encode_decode():
+    registry = PermissionRegistry(["posts:read", "posts:delete", "users:ban"])
+
+    mask = registry.encode(["users:ban", "posts:delete"])
+    assert mask == "5"
+    assert registry.decode(mask) == frozenset(["users:ban", "posts:delete"])
+    assert registry.decode(registry.encode([])) == frozenset()  # type: ignore
+    assert registry.encode(["posts:read", "unknown"]) is None
+
+
+async def test_version():
+    registry = PermissionRegistry(["b", "a"])
+    assert registry.version == PermissionRegistry(["a", "b", "a"]).version
+    assert registry.version != PermissionRegistry(["a", "b", "c"]).version
+
+
+async def test_load(mock_repo: Repo):
+    await mock_repo.roles.create("moderator")
+    await mock_repo.roles.add_permission("moderator", "users:ban")
+
+    registry = PermissionRegistry()
+    await registry.load(mock_repo.roles)
+
+    assert registry.roles_version == await mock_repo.roles.version()
+    assert registry.decode(registry.encode(["users:ban"])) == {  # type: ignore
+        "users:ban"
+    }
+
+
+async def test_refresh_follows_roles_version(mock_repo: Repo):
+    registry = PermissionRegistry(check_interval=0)
+    await registry.refresh(mock_repo.roles)
+    version = registry.version
+
+    await registry.refresh(mock_repo.roles)
+    assert registry.version == version
+
+    await mock_repo.roles.create("moderator")
+    await mock_repo.roles.add_permission("moderator", "users:ban")
+    await registry.refresh(mock_repo.roles)
+
+    assert registry.version != version
+    assert registry.encode(["users:ban"]) is not None
+
+
+async def test_refresh_interval(mock_repo: Repo):
+    registry = PermissionRegistry(check_interval=60)
+    await registry.refresh(mock_repo.roles)
+
+    await mock_repo.roles.create("moderator")
+    await mock_repo.roles.add_permission("moderator", "users:ban")
+    await registry.refresh(mock_repo.roles)
+
+    assert registry.encode(["users:ban"]) is None
+
+
+async def test_loaded_on_startup(mock_repo: Repo):
+    await mock_repo.roles.create("moderator")
+    await mock_repo.roles.add_permission("moderator", "users:ban")
+
+    registry = PermissionRegistry()
+    app = FastAPI()
+    FastAPIAuth(
+        app,
+        lambda: mock_repo,
+        JWTBackend(),
+        TokenParams(),
+        BearerTransport(),
+        DefaultAuthorization(),
+        permission_registry=registry,
+    )
+    await app.router.startup()
+
+    assert registry.encode(["users:ban"]) is not None
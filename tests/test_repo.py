@@ -0,0 +1,143 @@
+import pytest
+
+from fastapi_auth.jwt import TokenParams
+from fastapi_auth.repo import AuthorizationState, Repo
+from fastapi_auth.roles import RoleGraphCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_authorization_state_empty(mock_repo: Repo):
+    state = await mock_repo.get_authorization_state(2)
+    assert state == AuthorizationState(False, None, None)
+    assert not state.is_revoked(1)
+
+
+async def test_get_authorization_state(mock_repo: Repo):
+    await mock_repo.admin.ban(2)
+    await mock_repo.admin.kick(2)
+    await mock_repo.admin.activate_mass_logout()
+
+    calls = []
+    mget = mock_repo.cache.mget
+
+    async def counting_mget(keys):
+        calls.append(keys)
+        return await mget(keys)
+
+    mock_repo.cache.mget = counting_mget  # type: ignore
+    state = await mock_repo.get_authorization_state(2)
+
+    assert len(calls) == 1
+    assert state.banned
+    assert state.kick_ts is not None
+    assert state.mass_logout_ts is not None
+
+
+def test_authorization_state_is_revoked():
+    assert AuthorizationState(True, None, None).is_revoked(100)
+    assert AuthorizationState(False, 100, None).is_revoked(100)
+    assert not AuthorizationState(False, 99, None).is_revoked(100)
+    assert AuthorizationState(False, None, 100).is_revoked(100)
+    assert not AuthorizationState(False, 99, 99).is_revoked(100)
+
+
+async def test_rate_limit(mock_repo: Repo):
+    limit = await mock_repo.rate_limit("login", 3, 60, 120, "ip")
+    assert not limit.reached
+    assert limit.remaining == 1
+
+    key = f"{mock_repo.rate_key_prefix}:login:ip"
+    assert mock_repo.cache.ttl(key) is not None  # type: ignore
+
+    limit = await mock_repo.rate_limit("login", 3, 60, 120, "ip")
+    assert not limit.reached
+    assert limit.remaining == 0
+
+    limit = await mock_repo.rate_limit("login", 3, 60, 120, "ip")
+    assert limit.reached
+    assert limit.retry_after == 120
+
+    limit = await mock_repo.rate_limit("login", 3, 60, 120, "ip")
+    assert limit.reached
+    assert 0 < limit.retry_after <= 120
+
+
+async def test_rate_limit_counter_expires(mock_repo: Repo):
+    await mock_repo.rate_limit("login", 3, 60, 0, "ip")
+    await mock_repo.rate_limit("login", 3, 60, 0, "ip")
+
+    mock_repo.cache.offset += 61  # type: ignore
+    limit = await mock_repo.rate_limit("login", 3, 60, 0, "ip")
+    assert not limit.reached
+    assert limit.remaining == 1
+
+
+async def test_rate_limit_timeout_expires(mock_repo: Repo):
+    for _ in range(3):
+        await mock_repo.rate_limit("login", 3, 60, 120, "ip")
+
+    assert await mock_repo.rate_limit_reached("login", 3, 60, 120, "ip")
+
+    mock_repo.cache.offset += 121  # type: ignore
+    assert not await mock_repo.rate_limit_reached("login", 3, 60, 120, "ip")
+
+
+async def test_user_cache_excludes_password(mock_db, mock_cache):
+    repo = Repo(mock_db, mock_cache, TokenParams(), user_cache_ttl=60)
+    user = await repo.get(1)
+    assert user.password is not None
+
+    raw = await mock_cache.get(f"{repo.user_key_prefix}:1")
+    assert b"password" not in raw
+
+    cached = await repo.get(1)
+    assert cached.password is None
+
+    # only the hash is read, not the whole user
+    mock_db.get = None  # type: ignore
+    assert await repo.get_password(cached) == user.password
+
+
+async def test_user_cache_follows_role_changes(mock_db, mock_cache):
+    repo = Repo(mock_db, mock_cache, TokenParams(), user_cache_ttl=60)
+    assert (await repo.get(1)).permissions == []
+    assert (await repo.get_by_username("admin")).permissions == []
+
+    await repo.roles.add_permission("admin", "users:ban")
+    assert (await repo.get(1)).permissions == ["users:ban"]
+    assert (await repo.get_by_username("admin")).permissions == ["users:ban"]
+
+    await repo.roles.remove_permission("admin", "users:ban")
+    assert (await repo.get(1)).permissions == []
+
+    await repo.roles.delete_by_name("admin")
+    assert (await repo.get(1)).roles == []
+    assert (await repo.get_by_username("admin")).roles == []
+
+
+async def test_get_password_without_user_cache(mock_repo: Repo):
+    user = await mock_repo.get(1)
+    mock_repo.db = None  # type: ignore
+    assert await mock_repo.get_password(user) == user.password
+
+
+async def test_get_many(mock_repo: Repo):
+    users = await mock_repo.get_many([2, 1, 2, 100])
+    assert [user.id for user in users] == [1, 2]
+
+    users = await mock_repo.get_many_by_username(["admin", "social", "unknown"])
+    assert sorted(user.id for user in users) == [1, 3]
+
+    users = await mock_repo.get_many_by_email(["example2@gmail.com"])
+    assert [user.id for user in users] == [2]
+
+    assert await mock_repo.get_many([]) == []
+
+
+async def test_get_many_expands_roles(mock_db, mock_cache):
+    repo = Repo(mock_db, mock_cache, TokenParams(), role_graph=RoleGraphCache())
+    await repo.roles.add_permission("admin", "users:ban")
+
+    users = await repo.get_many([1, 2])
+    assert [user.permissions for user in users] == [["users:ban"], []]
@@ -0,0 +1,100 @@
+import pytest
+
+from fastapi_auth.jwt import TokenParams
+from fastapi_auth.models.user import RoleDB
+from fastapi_auth.repo import Repo
+from fastapi_auth.roles import RoleGraph, RoleGraphCache
+from tests.mocks import MockCacheClient, MockDatabaseClient
+
+pytestmark = pytest.mark.asyncio
+
+
+class CountingDatabaseClient(MockDatabaseClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+        all = self.roles.all
+
+        async def counting_all():
+            self.loads += 1
+            return await all()
+
+        self.roles.all = counting_all  # type: ignore
+
+
+@pytest.fixture
+def db():
+    yield CountingDatabaseClient()
+
+
+@pytest.fixture
+def repo(db: CountingDatabaseClient):
+    yield Repo(db, MockCacheClient(), TokenParams(), role_graph=RoleGraphCache(60))
+
+
+async def test_role_graph():
+    graph = RoleGraph(
+        [
+            RoleDB(id=1, name="admin", permissions=["users:ban"]),
+            RoleDB(id=2, name="moderator", permissions=["posts:delete", "users:ban"]),
+        ],
+        "1",
+    )
+
+    assert graph.expand(["admin", "moderator", "unknown"]) == [
+        "posts:delete",
+        "users:ban",
+    ]
+    assert graph.get("unknown") is None
+
+    role = graph.get("admin")
+    role.permissions.append("x")  # type: ignore
+    graph.all()[0].permissions.append("x")
+    assert graph.get("admin").permissions == ["users:ban"]  # type: ignore
+
+
+async def test_graph_is_cached(db: CountingDatabaseClient, repo: Repo):
+    await repo.roles.all()
+    await repo.roles.get_by_name("admin")
+    await repo.get(1)
+
+    assert db.loads == 1
+
+
+async def test_change_reloads_graph(db: CountingDatabaseClient, repo: Repo):
+    await repo.roles.create("moderator")
+    await repo.roles.add_permission("moderator", "posts:delete")
+    await repo.roles.grant(2, "moderator")
+
+    assert (await repo.get(2)).permissions == ["posts:delete"]
+
+    await repo.roles.remove_permission("moderator", "posts:delete")
+    assert (await repo.get(2)).permissions == []
+
+
+async def test_version_bump_reloads_graph(db: CountingDatabaseClient):
+    cache = MockCacheClient()
+    role_graph = RoleGraphCache(0)
+    repo = Repo(db, cache, TokenParams(), role_graph=role_graph)
+    # another worker, sharing the cache and the database
+    other = Repo(db, cache, TokenParams(), role_graph=RoleGraphCache(0))
+
+    assert await repo.roles.get_by_name("moderator") is None
+
+    await other.roles.create("moderator")
+    assert await repo.roles.get_by_name("moderator") is not None
+
+    loads = db.loads
+    await repo.roles.all()
+    assert db.loads == loads
+
+
+async def test_version_check_interval(db: CountingDatabaseClient):
+    cache = MockCacheClient()
+    repo = Repo(db, cache, TokenParams(), role_graph=RoleGraphCache(60))
+    other = Repo(db, cache, TokenParams(), role_graph=RoleGraphCache(60))
+
+    await repo.roles.all()
+    await other.roles.create("moderator")
+
+    assert await repo.roles.get_by_name("moderator") is None